@@ -0,0 +1,262 @@
+"""
+Built-in autopilot for demos, soak tests and as a baseline bot.
+Each tick it follows a cached path to the food. Paths come from a BFS grown
+outwards from the food, so the search stays valid while the head moves and is
+resumed on the next tick when it runs out of time. A path is used only if the
+snake's tail is still reachable once it reaches the food. When no safe path
+exists it falls back to the board's Hamiltonian cycle (when the board has one)
+or to the move that keeps the most room. All work shares a hard per-tick time
+budget so the bot stays real-time at the fastest GAME_SPEED on large boards.
+"""
+import time
+from collections import deque
+from itertools import islice
+
+from board import hamiltonian_successor
+from snake import Snake
+
+
+class Autopilot:
+    # Check the clock every this many search expansions
+    CLOCK_CHECK_INTERVAL = 64
+    # The search tree is one byte per cell, like the board: 0 for unreached,
+    # FOOD_MARK for the root, otherwise 1 + the index of the step to the parent
+    # (the reverse of the _neighbors() order it was reached in)
+    PARENT_STEPS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+    FOOD_MARK = 255
+
+    def __init__(self, engine, time_budget=0.005, clock=time.perf_counter):
+        self.engine = engine
+        self.time_budget = time_budget
+        self.clock = clock
+        self.deadline = 0.0
+
+        self.path = deque()     # Planned cells from the head to the food
+        self.path_food = None   # Food cell the path was planned for
+        self.search = None      # (food, parents bytearray, frontier) of an unfinished BFS from the food
+        self.traced = None      # Path traced so far through the finished BFS tree, from the head's next cell
+        self.plans = 0
+        self.budget_overruns = 0
+        self.step_directions = {step: name for name, step in Snake.DIRECTION_STEPS.items()}
+
+    def _cycle_successor(self, cell):
+        """Return the next cell on the board's Hamiltonian cycle, or None if it has none"""
+        width, height = self.engine.width, self.engine.height
+        if height % 2 == 0 and width >= 2:
+            return hamiltonian_successor(width, height, cell)
+        if width % 2 == 0 and height >= 2:
+            y, x = hamiltonian_successor(height, width, (cell[1], cell[0]))
+            return x, y
+        return None  # Boards with an odd number of cells have no Hamiltonian cycle
+
+    def reset(self):
+        """Forget cached paths and searches (e.g. for a new game)"""
+        self.path.clear()
+        self.path_food = None
+        self.search = None
+        self.traced = None
+
+    def choose_direction(self):
+        """Return the direction to take this tick"""
+        self.deadline = self.clock() + self.time_budget
+        head = self.engine.snake.head
+        food = self.engine.food.get_position()
+
+        if (self.path_food != food or not self.path or not self._is_free(self.path[0])
+                or self.path[0] not in self._neighbors(head)):
+            self.path.clear()
+            self.path_food = None
+            path = self._plan(head, food)
+            if path is None:
+                if self.traced and self._is_free(self.traced[0]):
+                    # Found but not fully traced: follow the part traced so far
+                    return self._direction_to(head, self.traced.popleft())
+                # Still searching: head for the food greedily in the meantime
+                return self._fallback(head, prefer_cycle=False)
+            if not path:
+                return self._fallback(head, prefer_cycle=True)
+            self.path.extend(path)
+            self.path_food = food
+
+        return self._direction_to(head, self.path.popleft())
+
+    def _direction_to(self, head, cell):
+        return self.step_directions[(cell[0] - head[0], cell[1] - head[1])]
+
+    def _out_of_time(self):
+        return self.clock() > self.deadline
+
+    def _is_free(self, cell):
+        """Check that the head can enter a cell next tick"""
+        board = self.engine.board
+        if not board.in_bounds(cell):
+            return False
+        if not board.is_occupied(cell):
+            return True
+        # The tail moves out of the way this tick unless the snake is growing
+        snake = self.engine.snake
+        return cell == snake.body[-1] and not snake.grow_pending and len(snake) > 1
+
+    def _neighbors(self, cell):
+        x, y = cell
+        return ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+
+    def _first_steps(self, head):
+        """Cells the head may move into; it can never reverse, even when a single cell long"""
+        dx, dy = Snake.DIRECTION_STEPS[Snake.OPPOSITE_DIRECTIONS[self.engine.snake.direction]]
+        behind = (head[0] + dx, head[1] + dy)
+        return [cell for cell in self._neighbors(head) if cell != behind and self._is_free(cell)]
+
+    def _plan(self, head, food):
+        """Find a safe path to the food.
+
+        Returns the path, [] when there is no safe path, or None when the
+        search ran out of time and will resume next tick. Tracing a long path
+        back through the search tree is also resumable; meanwhile the head
+        follows self.traced.
+        """
+        board = self.engine.board
+        occupied = board.occupied
+        width = board.width
+        if self.search is None or self.search[0] != food:
+            self.plans += 1
+            # A flat array rather than a dict: no rehashing pauses as the tree grows
+            parents = bytearray(width * board.height)
+            parents[board.index(food)] = self.FOOD_MARK
+            self.search = (food, parents, deque([food]))
+            self.traced = None
+        _, parents, frontier = self.search
+        traced = self.traced
+        if traced and traced[0] not in self._neighbors(head):
+            traced = None  # The head left the traced path
+
+        expansions = 0
+        if not traced:
+            first_steps = self._first_steps(head)
+            while not any(parents[board.index(cell)] for cell in first_steps):
+                if not frontier:
+                    self.search = None
+                    return []
+                cell = frontier.popleft()
+                for code, neighbor in enumerate(self._neighbors(cell), 1):
+                    if board.in_bounds(neighbor):
+                        index = neighbor[1] * width + neighbor[0]
+                        if not parents[index] and not occupied[index]:
+                            parents[index] = code
+                            frontier.append(neighbor)
+                expansions += 1
+                if expansions % self.CLOCK_CHECK_INTERVAL == 0 and self._out_of_time():
+                    self.budget_overruns += 1
+                    return None
+            traced = deque([next(cell for cell in first_steps if parents[board.index(cell)])])
+
+        while traced[-1] != food:
+            x, y = traced[-1]
+            dx, dy = self.PARENT_STEPS[parents[y * width + x] - 1]
+            cell = (x + dx, y + dy)
+            if board.is_occupied(cell):
+                # The body moved onto the tree while it was growing; search again
+                self.search = self.traced = None
+                return None
+            traced.append(cell)
+            expansions += 1
+            if expansions % self.CLOCK_CHECK_INTERVAL == 0 and self._out_of_time():
+                self.budget_overruns += 1
+                self.traced = traced
+                return None
+
+        self.search = self.traced = None
+        path = list(traced)
+        return path if self._tail_reachable_after(path) else []
+
+    def _tail_reachable_after(self, path):
+        """Check that after following path and eating, the head can still reach the tail.
+
+        Works from the board's occupancy plus the path and the tail cells it
+        frees, so the cost follows the path's length, not the snake's.
+        """
+        snake = self.engine.snake
+        body = snake.body
+        length = len(snake) + snake.grow_pending + 1
+        kept = min(length - len(path), len(body))  # Old body cells still part of the snake at the food
+        if kept > 0:
+            target = body[kept - 1]
+            vacated = set(islice(reversed(body), len(body) - kept))
+        else:
+            target = path[-length]
+            vacated = set(body)
+        path_cells = set(path[-length:])  # Earlier path cells are behind the tail again
+        board = self.engine.board
+
+        def blocked(cell):
+            return cell in path_cells or (board.is_occupied(cell) and cell not in vacated)
+        return self._reachable(path[-1], target, blocked)
+
+    def _reachable(self, start, target, blocked):
+        """BFS from start to target avoiding blocked cells, within the time budget"""
+        seen = {start}
+        frontier = deque([start])
+        board = self.engine.board
+        expansions = 0
+        while frontier:
+            cell = frontier.popleft()
+            for neighbor in self._neighbors(cell):
+                if neighbor == target:
+                    return True
+                if neighbor not in seen and board.in_bounds(neighbor) and not blocked(neighbor):
+                    seen.add(neighbor)
+                    frontier.append(neighbor)
+            expansions += 1
+            if expansions % self.CLOCK_CHECK_INTERVAL == 0 and self._out_of_time():
+                self.budget_overruns += 1
+                return False
+        return False
+
+    def _fallback(self, head, prefer_cycle):
+        """Pick the safest single move when there is no path to follow.
+
+        Moves that keep the tail reachable win, then (with prefer_cycle) the
+        Hamiltonian cycle successor, then the most room, then getting closer
+        to the food.
+        """
+        snake = self.engine.snake
+        food_x, food_y = self.engine.food.get_position()
+        successor = self._cycle_successor(head) if prefer_cycle else None
+        board = self.engine.board
+        body = snake.body
+        # After one step the tail cell is free unless the snake grows, and the
+        # new tail is the segment before it
+        vacated = None if snake.grow_pending else body[-1]
+        new_tail = body[-1] if snake.grow_pending else (body[-2] if len(body) > 1 else None)
+        best_direction = snake.direction
+        best_score = None
+        for cell in self._first_steps(head):
+            closeness = -abs(cell[0] - food_x) - abs(cell[1] - food_y)
+            if self._out_of_time():
+                score = (False, cell == successor, 0, closeness)
+            else:
+                def blocked(other, cell=cell):
+                    return other == cell or (board.is_occupied(other) and other != vacated)
+                tail_safe = new_tail is None or self._reachable(cell, new_tail, blocked)
+                score = (tail_safe, cell == successor, self._free_area(cell), closeness)
+            if best_score is None or score > best_score:
+                best_direction, best_score = self._direction_to(head, cell), score
+        return best_direction
+
+    def _free_area(self, start):
+        """Count free cells reachable from start, up to one more than the snake's length"""
+        limit = len(self.engine.snake) + 1
+        board = self.engine.board
+        seen = {start}
+        frontier = deque([start])
+        expansions = 0
+        while frontier and len(seen) < limit:
+            cell = frontier.popleft()
+            for neighbor in self._neighbors(cell):
+                if neighbor not in seen and board.in_bounds(neighbor) and not board.is_occupied(neighbor):
+                    seen.add(neighbor)
+                    frontier.append(neighbor)
+            expansions += 1
+            if expansions % self.CLOCK_CHECK_INTERVAL == 0 and self._out_of_time():
+                break
+        return len(seen)
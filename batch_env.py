@@ -0,0 +1,153 @@
+"""
+Vectorized batch of independent Snake games.
+Every game's state lives in NumPy arrays (head cell, direction, body ring
+buffer, occupancy, food) and one step(actions) call advances all of them in
+lockstep with the same rules as GameEngine / SnakeGame.check_collisions.
+Finished games reset automatically so the batch never shrinks.
+"""
+import numpy as np
+
+
+class BatchSnakeEnv:
+    # Action / direction codes
+    NORTH, EAST, SOUTH, WEST = 0, 1, 2, 3
+    DIRECTION_NAMES = ("north", "east", "south", "west")
+    STEP_X = np.array([0, 1, 0, -1], dtype=np.int32)
+    STEP_Y = np.array([1, 0, -1, 0], dtype=np.int32)
+
+    # Rejection-sampling rounds for food before falling back to an exact scan
+    FOOD_SAMPLE_ROUNDS = 4
+
+    def __init__(self, num_games, width=29, height=29, points_per_food=1, seed=None):
+        self.num_games = num_games
+        self.width = width
+        self.height = height
+        self.cells = width * height
+        self.points_per_food = points_per_food
+        self.rng = np.random.default_rng(seed)
+
+        n = num_games
+        self.games = np.arange(n)
+        self.head = np.zeros(n, dtype=np.int32)
+        self.direction = np.zeros(n, dtype=np.int8)
+        # body[g, head_ptr[g]] is the head; older segments sit at lower ring slots
+        self.body = np.zeros((n, self.cells), dtype=np.int32)
+        self.head_ptr = np.zeros(n, dtype=np.int32)
+        self.length = np.zeros(n, dtype=np.int32)
+        self.grow_pending = np.zeros(n, dtype=np.int32)
+        self.occupied = np.zeros((n, self.cells), dtype=bool)
+        self.food = np.zeros(n, dtype=np.int32)
+        self.score = np.zeros(n, dtype=np.int32)
+        self.ticks = np.zeros(n, dtype=np.int32)
+
+        self.episodes_finished = 0
+        self.reset()
+
+    def reset(self, games=None):
+        """Reset the given games (all by default) to the GameEngine start state"""
+        if games is None:
+            games = self.games
+        center_x = self.width // 2
+        center_y = self.height // 2
+        start = center_y * self.width + center_x
+
+        self.occupied[games] = False
+        self.occupied[games, start] = True
+        self.head[games] = start
+        self.direction[games] = self.EAST
+        self.head_ptr[games] = 0
+        self.body[games, 0] = start
+        self.length[games] = 1
+        self.grow_pending[games] = 0
+        food_x = min(center_x + 5, self.width - 1)
+        food_y = min(center_y + 5, self.height - 1)
+        self.food[games] = food_y * self.width + food_x
+        self.score[games] = 0
+        self.ticks[games] = 0
+
+    def step(self, actions):
+        """Advance every game by one tick.
+
+        actions holds a direction code per game (-1 keeps the current one);
+        reversals are ignored like Snake.change_direction does.
+        Returns (rewards, dones, final_scores): reward is +points on eating and
+        -1 on death; final_scores holds the score of games that just ended
+        (0 elsewhere) since those games have already been reset.
+        """
+        games = self.games
+        actions = np.asarray(actions)
+        turn = (actions >= 0) & (actions != (self.direction + 2) % 4)
+        self.direction = np.where(turn, actions, self.direction).astype(np.int8)
+        self.ticks += 1
+
+        x = self.head % self.width + self.STEP_X[self.direction]
+        y = self.head // self.width + self.STEP_Y[self.direction]
+        hit_wall = (x < 0) | (x >= self.width) | (y < 0) | (y >= self.height)
+        new_head = np.where(hit_wall, self.head, y * self.width + x)
+        moving = ~hit_wall
+
+        # The tail moves out before the head moves in, unless the snake is growing
+        retract = moving & (self.grow_pending == 0)
+        tail_slot = (self.head_ptr - self.length + 1) % self.cells
+        tail_cell = self.body[games, tail_slot]
+        retracting = games[retract]
+        self.occupied[retracting, tail_cell[retract]] = False
+
+        hit_self = moving & self.occupied[games, new_head]
+        alive = moving & ~hit_self
+
+        growing = alive & ~retract
+        self.grow_pending -= growing
+        self.length += growing
+        self.head_ptr = np.where(alive, (self.head_ptr + 1) % self.cells, self.head_ptr)
+        alive_games = games[alive]
+        self.body[alive_games, self.head_ptr[alive]] = new_head[alive]
+        self.occupied[alive_games, new_head[alive]] = True
+        self.head = np.where(alive, new_head, self.head)
+
+        ate = alive & (new_head == self.food)
+        rewards = np.where(ate, self.points_per_food, 0).astype(np.float32)
+        board_full = np.zeros(self.num_games, dtype=bool)
+        if ate.any():
+            self.score += ate * self.points_per_food
+            self.grow_pending += ate
+            board_full[ate] = ~self._place_food(games[ate])
+
+        dones = hit_wall | hit_self | board_full
+        rewards[hit_wall | hit_self] = -1.0
+        final_scores = np.where(dones, self.score, 0)
+        if dones.any():
+            self.episodes_finished += int(dones.sum())
+            self.reset(games[dones])
+        return rewards, dones, final_scores
+
+    def _place_food(self, games):
+        """Move food to a random free cell; returns False for games with a full board"""
+        placed = np.zeros(len(games), dtype=bool)
+        pending = np.arange(len(games))
+        for _ in range(self.FOOD_SAMPLE_ROUNDS):
+            candidates = self.rng.integers(0, self.cells, size=len(pending))
+            free = ~self.occupied[games[pending], candidates]
+            self.food[games[pending[free]]] = candidates[free]
+            placed[pending[free]] = True
+            pending = pending[~free]
+            if not len(pending):
+                return placed
+
+        # Nearly full boards: choose uniformly among the remaining free cells
+        for index in pending:
+            free_cells = np.flatnonzero(~self.occupied[games[index]])
+            if len(free_cells):
+                self.food[games[index]] = free_cells[self.rng.integers(len(free_cells))]
+                placed[index] = True
+        return placed
+
+    def snake_cells(self, game):
+        """Return one game's snake cells as (x, y) tuples, head first"""
+        slots = (self.head_ptr[game] - np.arange(self.length[game])) % self.cells
+        return [(int(cell % self.width), int(cell // self.width)) for cell in self.body[game, slots]]
+
+    def food_cell(self, game):
+        """Return one game's food cell as an (x, y) tuple"""
+        cell = int(self.food[game])
+        return cell % self.width, cell // self.width
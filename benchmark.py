@@ -0,0 +1,326 @@
+"""
+Benchmark suite for the game tick and rendering hot paths.
+Measures ticks/sec and per-tick latency percentiles for each phase of a tick
+(move + body shift, collision checks, food relocation, rendering) across snake
+lengths from 1 to the whole board, headless and with the on-screen renderers.
+
+Run directly: python benchmark.py [--output bench_output.json] [--renderers headless,canvas,turtle]
+       python benchmark.py --stress   (500x500 board, snakes up to 100k cells, bitmap renderer)
+       python benchmark.py --startup  (process start to menu, menu to first frame; fails on regressions)
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tkinter as tk
+
+from board import Board, hamiltonian_cycle
+from food import Food
+from game_engine import GameEngine, TickResult
+from version_info import read_version
+
+DIRECTION_NAMES = {(1, 0): "east", (-1, 0): "west", (0, 1): "north", (0, -1): "south"}
+
+# Large-board settings used by --stress
+STRESS_BOARD = (500, 500)
+STRESS_LENGTHS = (1, 1000, 100000)
+STRESS_RENDERERS = ("headless", "bitmap")
+
+# Startup budgets in milliseconds (medians); --startup exits non-zero above them
+STARTUP_THRESHOLDS_MS = {"import": 150, "menu_visible": 1500, "first_frame": 1500}
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def build_cycling_engine(length, width=30, height=30):
+    """Create an engine whose snake has the given length and follows a Hamiltonian cycle"""
+    engine = GameEngine(width, height)
+    cycle = hamiltonian_cycle(width, height)
+    next_cell = {cycle[i]: cycle[(i + 1) % len(cycle)] for i in range(len(cycle))}
+
+    # Restart the snake at the start of the cycle so it never leaves it
+    engine.board.clear()
+    engine.snake.body.clear()
+    engine.snake.body.append(cycle[0])
+    engine.board.occupy(cycle[0])
+    # Park the food off the board so the length stays fixed while timing
+    engine.food.position = (-1, -1)
+
+    engine.snake.grow_pending = length - 1
+    for _ in range(length - 1):
+        steer_along(engine, next_cell)
+        engine.step()
+    return engine, next_cell
+
+
+def steer_along(engine, next_cell):
+    """Point the snake at the next cell of its cycle"""
+    head_x, head_y = engine.snake.head
+    target_x, target_y = next_cell[(head_x, head_y)]
+    engine.snake.direction = DIRECTION_NAMES[(target_x - head_x, target_y - head_y)]
+
+
+def summarize(samples):
+    """Return latency percentiles in microseconds for a list of durations in seconds"""
+    ordered = sorted(samples)
+    count = len(ordered)
+
+    def percentile(fraction):
+        return ordered[min(count - 1, int(count * fraction))] * 1e6
+
+    return {
+        "mean_us": sum(ordered) / count * 1e6,
+        "p50_us": percentile(0.50),
+        "p95_us": percentile(0.95),
+        "p99_us": percentile(0.99),
+        "max_us": ordered[-1] * 1e6,
+    }
+
+
+def run_ticks(engine, next_cell, ticks, display=None):
+    """Run ticks phase by phase, timing each phase separately"""
+    clock = time.perf_counter
+    snake = engine.snake
+    board = engine.board
+    food = Food()
+    phases = {"move": [], "collision": [], "food": [], "tick": []}
+    if display:
+        phases["render"] = []
+
+    for _ in range(ticks):
+        steer_along(engine, next_cell)
+        start = clock()
+        old_head = snake.head
+        vacated = snake.move()
+        moved = clock()
+        if not board.in_bounds(snake.head) or snake.check_self_collision():
+            raise RuntimeError(f"Benchmark snake crashed at length {len(snake)}")
+        checked = clock()
+        # Placement only; the food is never on the snake's path in this loop
+        food.relocate(board)
+        placed = clock()
+        if display:
+            display.render_tick(TickResult(old_head, snake.head, vacated))
+            display.update()
+        end = clock()
+
+        phases["move"].append(moved - start)
+        phases["collision"].append(checked - moved)
+        phases["food"].append(placed - checked)
+        if display:
+            phases["render"].append(end - placed)
+        phases["tick"].append(end - start)
+    return phases
+
+
+def bench_length(length, ticks, width=30, height=30, display=None):
+    """Benchmark one snake length, optionally rendering every tick"""
+    engine, next_cell = build_cycling_engine(length, width, height)
+    if display:
+        # Shrink cells on big boards the way the game does, so the board fits the window
+        display.setup_board(width, height, max(1, min(20, 1000 // max(width, height))))
+        display.render(engine.snapshot())
+    phases = run_ticks(engine, next_cell, ticks, display)
+    total = sum(phases["tick"])
+    return {
+        "length": length,
+        "board": f"{width}x{height}",
+        "ticks": ticks,
+        "ticks_per_sec": ticks / total,
+        "tick": summarize(phases.pop("tick")),
+        "phases": {name: summarize(samples) for name, samples in phases.items()},
+    }
+
+
+def bench_food_relocation(size=500, fill_ratios=(0.0, 0.5, 0.99, 0.9999), relocations=20000):
+    """Measure food placement cost on a large board at several fill levels"""
+    results = {}
+    cells = [(x, y) for y in range(size) for x in range(size)]
+    random.shuffle(cells)
+    for ratio in fill_ratios:
+        board = Board(size, size)
+        for cell in cells[:int(len(cells) * ratio)]:
+            board.occupy(cell)
+        food = Food()
+        start = time.perf_counter()
+        for _ in range(relocations):
+            food.relocate(board)
+        elapsed = time.perf_counter() - start
+        results[str(ratio)] = elapsed / relocations * 1e6
+    return results
+
+
+def bench_batch_env(num_games=8192, steps=200, seed=0):
+    """Measure vectorized BatchSnakeEnv throughput with random actions"""
+    import numpy as np
+    from batch_env import BatchSnakeEnv
+
+    env = BatchSnakeEnv(num_games, seed=seed)
+    actions = np.random.default_rng(seed).integers(-1, 4, size=(steps, num_games))
+    start = time.perf_counter()
+    for step_actions in actions:
+        env.step(step_actions)
+    elapsed = time.perf_counter() - start
+    return {
+        "games": num_games,
+        "steps": steps,
+        "game_ticks_per_sec": num_games * steps / elapsed,
+        "episodes_finished": env.episodes_finished,
+    }
+
+
+def open_display(render_mode):
+    """Create a game screen for rendered benchmarks, or None without a display"""
+    from game_display import GameDisplay
+    try:
+        display = GameDisplay(render_mode=render_mode)
+        display.setup_screen()
+        return display
+    except tk.TclError:
+        return None
+
+
+def run_suite(renderers=("headless", "canvas", "turtle"), lengths=(1, 10, 100, 450, 899), ticks=2000,
+              board=(30, 30)):
+    """Run every benchmark and return a JSON-serialisable report"""
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "results": {},
+        "skipped": [],  # Renderers that need a display
+        "missing_dependencies": {},  # Benchmark: module it could not import
+    }
+    for renderer in renderers:
+        display = None
+        if renderer != "headless":
+            display = open_display(renderer)
+            if display is None:
+                report["skipped"].append(renderer)
+                continue
+        print(f"=== {renderer} on {board[0]}x{board[1]} ===")
+        runs = []
+        for length in lengths:
+            run = bench_length(length, ticks, *board, display=display)
+            runs.append(run)
+            print(f"  length {length:4d}: {run['ticks_per_sec']:10.0f} ticks/s  "
+                  f"p50 {run['tick']['p50_us']:7.2f}us  p99 {run['tick']['p99_us']:7.2f}us")
+            if display:
+                # Start the next length on an empty screen
+                display.window.clear()
+                display = open_display(renderer)
+        report["results"][renderer] = runs
+
+    print("=== Food relocation on a 500x500 board ===")
+    report["food_relocation_us"] = bench_food_relocation()
+    for ratio, micros in report["food_relocation_us"].items():
+        print(f"  {float(ratio):7.2%} full: {micros:6.2f} us/relocation")
+
+    try:
+        report["batch_env"] = bench_batch_env()
+        print(f"=== Batch environment: {report['batch_env']['game_ticks_per_sec'] / 1e6:.2f}M game-ticks/s ===")
+    except ImportError as e:
+        report["missing_dependencies"]["batch_env"] = e.name or str(e)
+    return report
+
+
+def has_display():
+    try:
+        tk.Tk().destroy()
+        return True
+    except tk.TclError:
+        return False
+
+
+def time_import(module):
+    """Seconds to import a module in a fresh interpreter"""
+    code = f"import time; start = time.perf_counter(); import {module}; print(time.perf_counter() - start)"
+    output = subprocess.run([sys.executable, "-c", code], cwd=GAME_DIR, capture_output=True,
+                            text=True, check=True).stdout
+    return float(output.split()[-1])
+
+
+def time_game_startup():
+    """Launch the game in startup-benchmark mode; returns (menu_visible, first_frame) seconds.
+
+    menu_visible is measured from process launch, first_frame from the menu
+    appearing.
+    """
+    launched = time.time()
+    output = subprocess.run([sys.executable, "snake_game.py", "--startup-benchmark"], cwd=GAME_DIR,
+                            capture_output=True, text=True, timeout=60).stdout
+    milestones = {}
+    for line in output.splitlines():
+        if line.startswith("[STARTUP]"):
+            _, name, stamp = line.split()
+            milestones[name] = float(stamp)
+    return milestones["menu_visible"] - launched, milestones["first_frame"] - milestones["menu_visible"]
+
+
+def bench_startup(runs=5, thresholds=STARTUP_THRESHOLDS_MS):
+    """Median startup times over several fresh processes, checked against thresholds"""
+    samples = {"import": [time_import("snake_game") for _ in range(runs)]}
+    skipped = []
+    if has_display():
+        menu, frame = zip(*(time_game_startup() for _ in range(runs)))
+        samples["menu_visible"] = list(menu)
+        samples["first_frame"] = list(frame)
+    else:
+        skipped = ["menu_visible", "first_frame"]
+
+    medians_ms = {name: statistics.median(values) * 1000 for name, values in samples.items()}
+    return {
+        "runs": runs,
+        "median_ms": medians_ms,
+        "thresholds_ms": dict(thresholds),
+        "regressions": [name for name, value in medians_ms.items() if value > thresholds[name]],
+        "skipped": skipped,
+    }
+
+
+def load_version():
+    """Read the game version so results can be tracked release to release"""
+    return read_version(default="unknown")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the Snake game hot paths")
+    parser.add_argument("--output", default="bench_output.json", help="JSON file to write results to")
+    parser.add_argument("--renderers", default="headless,canvas,turtle",
+                        help="Comma-separated list of headless, canvas, turtle and bitmap")
+    parser.add_argument("--ticks", type=int, default=2000, help="Ticks per snake length")
+    parser.add_argument("--stress", action="store_true",
+                        help="Benchmark a 500x500 board with snakes up to 100k cells")
+    parser.add_argument("--startup", action="store_true",
+                        help="Benchmark startup time and fail if it exceeds STARTUP_THRESHOLDS_MS")
+    args = parser.parse_args()
+
+    if args.startup:
+        startup = bench_startup()
+        print("=== Startup (median of fresh processes) ===")
+        for name, millis in startup["median_ms"].items():
+            status = "REGRESSION" if name in startup["regressions"] else "ok"
+            print(f"  {name:12s} {millis:7.1f}ms  (limit {startup['thresholds_ms'][name]}ms)  {status}")
+        if startup["skipped"]:
+            print(f"Skipped (no display): {', '.join(startup['skipped'])}")
+        with open(args.output, "w") as f:
+            json.dump({"game_version": load_version(), "startup": startup}, f, indent=2)
+        print(f"Results written to {args.output}")
+        sys.exit(1 if startup["regressions"] else 0)
+
+    if args.stress:
+        report = run_suite(STRESS_RENDERERS, STRESS_LENGTHS, args.ticks, STRESS_BOARD)
+    else:
+        report = run_suite(args.renderers.split(","), ticks=args.ticks)
+    report["game_version"] = load_version()
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    if report["skipped"]:
+        print(f"Skipped (no display): {', '.join(report['skipped'])}")
+    for name, module in report["missing_dependencies"].items():
+        print(f"Skipped (no {module} installed): {name}")
+    print(f"Results written to {args.output}")
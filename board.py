@@ -0,0 +1,104 @@
+"""
+Grid occupancy index shared by the game engine and the snake.
+Keeps one byte per cell so collision and food-on-snake checks are O(1)
+lookups that are updated incrementally as the snake moves, plus a free-cell
+index for O(1) uniform sampling of empty cells.
+"""
+from array import array
+
+
+class Board:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.clear()
+
+    def in_bounds(self, cell):
+        """Check whether a cell lies on the board"""
+        x, y = cell
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def index(self, cell):
+        """Return the flat index of an in-bounds cell"""
+        return cell[1] * self.width + cell[0]
+
+    def occupy(self, cell):
+        """Mark a cell as covered by the snake"""
+        index = cell[1] * self.width + cell[0]
+        if self.occupied[index]:
+            return
+        self.occupied[index] = 1
+
+        # Swap-remove the cell from the dense free list
+        slot = self.free_slots[index]
+        last = self.free_cells[self.free_count - 1]
+        self.free_cells[slot] = last
+        self.free_slots[last] = slot
+        self.free_count -= 1
+        self.free_cells[self.free_count] = index
+        self.free_slots[index] = self.free_count
+
+    def vacate(self, cell):
+        """Mark a cell as free"""
+        index = cell[1] * self.width + cell[0]
+        if not self.occupied[index]:
+            return
+        self.occupied[index] = 0
+
+        # Swap the cell back to the end of the free region
+        slot = self.free_slots[index]
+        first_taken = self.free_cells[self.free_count]
+        self.free_cells[slot] = first_taken
+        self.free_slots[first_taken] = slot
+        self.free_cells[self.free_count] = index
+        self.free_slots[index] = self.free_count
+        self.free_count += 1
+
+    def is_occupied(self, cell):
+        """Check whether the snake covers a cell"""
+        return self.occupied[cell[1] * self.width + cell[0]] == 1
+
+    def random_free_cell(self, rng):
+        """Pick a uniformly random free cell, or None if the board is full"""
+        if not self.free_count:
+            return None
+        y, x = divmod(self.free_cells[rng.randrange(self.free_count)], self.width)
+        return x, y
+
+    def clear(self):
+        """Free every cell"""
+        size = self.width * self.height
+        self.occupied = bytearray(size)
+        # free_cells[:free_count] holds the free cell indices in no particular
+        # order; free_slots maps a cell index to its position in free_cells
+        self.free_cells = array("i", range(size))
+        self.free_slots = array("i", range(size))
+        self.free_count = size
+
+
+def hamiltonian_cycle(width, height):
+    """Return a closed path visiting every cell once (height must be even)"""
+    if width < 2 or height % 2:
+        raise ValueError("A Hamiltonian cycle needs at least two columns and an even number of rows")
+    cycle = [(x, 0) for x in range(width)]
+    for y in range(1, height):
+        columns = range(width - 1, 0, -1) if y % 2 else range(1, width)
+        cycle.extend((x, y) for x in columns)
+    cycle.extend((0, y) for y in range(height - 1, 0, -1))
+    return cycle
+
+
+def hamiltonian_successor(width, height, cell):
+    """Return the cell after cell on hamiltonian_cycle(width, height), in O(1)"""
+    x, y = cell
+    if x == 0:
+        return (1, 0) if y == 0 else (0, y - 1)
+    if y == 0:
+        return (x + 1, 0) if x < width - 1 else (x, 1)
+    if y % 2:
+        # Odd rows run right to left, ending at column 1
+        if x > 1:
+            return x - 1, y
+        return (1, y + 1) if y < height - 1 else (0, y)
+    # Even rows run left to right, ending at the last column
+    return (x + 1, y) if x < width - 1 else (x, y + 1)
@@ -0,0 +1,141 @@
+"""
+Dirty-region renderer that draws straight onto the turtle screen's Tk canvas.
+Each tick only the cells that changed (new head, old head, vacated tail and
+food) are touched, and every canvas item is created once and then moved with
+coords() instead of being redrawn, so frame cost is O(changes) rather than
+O(objects on screen).
+
+BitmapRenderer paints cells into a single PhotoImage instead, for boards and
+snakes too big to keep one canvas item per segment.
+"""
+import tkinter as tk
+from collections import deque
+
+
+class CanvasRenderer:
+    HEAD_COLOR = "green"
+    BODY_COLOR = "lightgreen"
+    FOOD_COLOR = "red"
+
+    def __init__(self, canvas, cell_to_pixel, cell_size):
+        self.canvas = canvas
+        self.cell_to_pixel = cell_to_pixel
+        self.half = cell_size / 2
+
+        self.head_item = None
+        self.segment_items = deque()  # Ring buffer ordered from the neck to the tail
+        self.food_item = None
+        # Cells redrawn by the last call, for instrumentation
+        self.dirty_cells = []
+
+    def _bounds(self, cell):
+        # Turtle coordinates have y pointing up; the canvas has y pointing down
+        x, y = self.cell_to_pixel(cell)
+        return x - self.half, -y - self.half, x + self.half, -y + self.half
+
+    def _create_cell(self, cell, color, oval=False):
+        create = self.canvas.create_oval if oval else self.canvas.create_rectangle
+        return create(*self._bounds(cell), fill=color, outline=color)
+
+    def _move(self, item, cell):
+        self.canvas.coords(item, *self._bounds(cell))
+
+    def draw(self, snapshot):
+        """Draw a full snapshot, reusing any items that already exist"""
+        cells = snapshot["snake"]
+        if self.head_item is None:
+            self.head_item = self._create_cell(cells[0], self.HEAD_COLOR)
+        else:
+            self._move(self.head_item, cells[0])
+
+        while len(self.segment_items) < len(cells) - 1:
+            self.segment_items.append(self._create_cell(cells[0], self.BODY_COLOR))
+        for item, cell in zip(self.segment_items, cells[1:]):
+            self._move(item, cell)
+
+        if self.food_item is None:
+            self.food_item = self._create_cell(snapshot["food"], self.FOOD_COLOR, oval=True)
+        else:
+            self._move(self.food_item, snapshot["food"])
+        self.dirty_cells = list(cells) + [snapshot["food"]]
+
+    def apply(self, result):
+        """Redraw only the cells changed by one engine TickResult"""
+        if result.new_head is None:
+            self.dirty_cells = []
+            return
+        dirty = [result.new_head, result.old_head]
+        self._move(self.head_item, result.new_head)
+
+        if result.vacated is None:
+            self.segment_items.appendleft(self._create_cell(result.old_head, self.BODY_COLOR))
+        elif self.segment_items:
+            self.segment_items.rotate(1)
+            self._move(self.segment_items[0], result.old_head)
+            dirty.append(result.vacated)
+
+        if result.food is not None:
+            self._move(self.food_item, result.food)
+            dirty.append(result.food)
+        self.dirty_cells = dirty
+
+
+class BitmapRenderer:
+    """Draws the board into one image, touching only the changed cells' pixels.
+
+    Tk repaints a canvas by walking every item, so a snake with tens of
+    thousands of segment items slows each frame down. Here the canvas holds a
+    single image item whatever the snake's length, and memory is one pixel
+    block per cell.
+    """
+    HEAD_COLOR = CanvasRenderer.HEAD_COLOR
+    BODY_COLOR = CanvasRenderer.BODY_COLOR
+    FOOD_COLOR = CanvasRenderer.FOOD_COLOR
+    BACKGROUND_COLOR = "white"
+
+    def __init__(self, canvas, cell_to_pixel, cell_size, board_width, board_height):
+        self.canvas = canvas
+        self.cell_size = cell_size
+        self.board_height = board_height
+        self.image = tk.PhotoImage(master=canvas, width=board_width * cell_size,
+                                   height=board_height * cell_size)
+        # Pin the image's top-left corner to the top-left cell's corner
+        left, top = cell_to_pixel((0, board_height - 1))
+        half = cell_size / 2
+        self.image_item = canvas.create_image(left - half, -top - half, image=self.image, anchor="nw")
+        self.food = None
+        # Cells redrawn by the last call, for instrumentation
+        self.dirty_cells = []
+
+    def _fill(self, cell, color):
+        size = self.cell_size
+        x = cell[0] * size
+        y = (self.board_height - 1 - cell[1]) * size
+        self.image.put(color, to=(x, y, x + size, y + size))
+
+    def draw(self, snapshot):
+        """Repaint the whole board from a snapshot"""
+        self.image.put(self.BACKGROUND_COLOR, to=(0, 0, self.image.width(), self.image.height()))
+        cells = snapshot["snake"]
+        for cell in cells[1:]:
+            self._fill(cell, self.BODY_COLOR)
+        self._fill(cells[0], self.HEAD_COLOR)
+        self._fill(snapshot["food"], self.FOOD_COLOR)
+        self.dirty_cells = list(cells) + [snapshot["food"]]
+
+    def apply(self, result):
+        """Repaint only the cells changed by one engine TickResult"""
+        if result.new_head is None:
+            self.dirty_cells = []
+            return
+        dirty = [result.old_head, result.new_head]
+        self._fill(result.old_head, self.BODY_COLOR)
+        if result.vacated is not None:
+            # Painted before the new head, which may move straight into it
+            self._fill(result.vacated, self.BACKGROUND_COLOR)
+            dirty.append(result.vacated)
+        self._fill(result.new_head, self.HEAD_COLOR)
+        if result.food is not None:
+            self._fill(result.food, self.FOOD_COLOR)
+            dirty.append(result.food)
+        self.dirty_cells = dirty
@@ -1,24 +1,20 @@
-import turtle
 import random
 
 class Food:
-    def __init__(self):
-        self.food = turtle.Turtle()
-        self.food.shape("circle")
-        self.food.color("red")
-        self.food.penup()
-        self.food.goto(100, 100)  # Start position
+    def __init__(self, x=0, y=0):
+        # Grid cell the food currently occupies
+        self.position = (x, y)
+
+    def relocate(self, board, rng=random):
+        """Relocate food to a random cell of the board not covered by the snake.
+
+        Returns the new cell, or None when the snake fills the whole board.
+        """
+        cell = board.random_free_cell(rng)
+        if cell is not None:
+            self.position = cell
+        return cell
 
-    def get_food(self):
-        """Return the food turtle object"""
-        return self.food
-    
-    def relocate(self, boundary):
-        """Relocate food to a random position within the boundary"""
-        x = random.randint(-boundary, boundary)
-        y = random.randint(-boundary, boundary)
-        self.food.goto(x, y)
-    
     def get_position(self):
-        """Get the current position of the food"""
-        return self.food.xcor(), self.food.ycor()
\ No newline at end of file
+        """Get the current grid cell of the food"""
+        return self.position
@@ -1,13 +1,80 @@
 import turtle
 import os
+from collections import deque
+from canvas_renderer import BitmapRenderer, CanvasRenderer
+
+class TextLayer:
+    """Fixed pool of reusable canvas text items for scores and overlays.
+
+    Every slot's item is created once and then retexted or hidden, so showing
+    and hiding messages never adds canvas items.
+    """
+    # name: (position, color, font, align)
+    SLOTS = {
+        "score": ((-280, 260), "black", ("Arial", 14, "normal"), "left"),
+        "high_score": ((-280, 230), "gray", ("Arial", 12, "normal"), "left"),
+        "hud": ((-280, 150), "dim gray", ("Courier", 9, "normal"), "left"),
+        "pause": ((0, 0), "blue", ("Arial", 24, "bold"), "center"),
+        "pause_hint": ((0, -40), "gray", ("Arial", 14, "normal"), "center"),
+        "game_over": ((0, 100), "red", ("Arial", 24, "bold"), "center"),
+        "record_banner": ((0, 60), "gold", ("Arial", 16, "bold"), "center"),
+        "record_score": ((0, 20), "black", ("Arial", 18, "bold"), "center"),
+        "final_score": ((0, 40), "black", ("Arial", 16, "normal"), "center"),
+        "final_high_score": ((0, 10), "blue", ("Arial", 14, "normal"), "center"),
+        "exit_hint": ((0, -40), "gray", ("Arial", 12, "normal"), "center"),
+    }
+
+    # Slots that stay in the top-left corner when the window is bigger than 600x600
+    CORNER_SLOTS = ("score", "high_score", "hud")
+
+    # Same anchors turtle.write uses for each alignment
+    ANCHORS = {"left": "sw", "center": "s", "right": "se"}
+
+    def __init__(self, canvas, width=600, height=600):
+        self.canvas = canvas
+        self.items = {}
+        for name, ((x, y), color, font, align) in self.SLOTS.items():
+            if name in self.CORNER_SLOTS:
+                x -= (width - 600) / 2
+                y += (height - 600) / 2
+            # Turtle coordinates have y pointing up; the canvas has y pointing down
+            self.items[name] = canvas.create_text(x - 1, -y, text="", fill=color, font=font,
+                                                  anchor=self.ANCHORS[align], state="hidden")
+
+    def show(self, name, text):
+        """Show text in a slot, above anything drawn since"""
+        item = self.items[name]
+        self.canvas.itemconfigure(item, text=text, state="normal")
+        self.canvas.tag_raise(item)
+
+    def hide(self, name):
+        """Hide a slot without deleting its item"""
+        self.canvas.itemconfigure(self.items[name], state="hidden")
+
 
 class GameDisplay:
-    def __init__(self, width=600, height=600):
+    def __init__(self, width=600, height=600, render_mode="turtle"):
         self.WINDOW_WIDTH = width
         self.WINDOW_HEIGHT = height
         self.window = None
-        self.score_display = None
-        self.pause_display = None
+
+        # Board geometry used to map grid cells to screen pixels
+        self.board_width = 29
+        self.board_height = 29
+        self.cell_size = 20
+
+        # Drawables for the snake and the food. Body segments form a ring
+        # buffer ordered from the neck to the tail.
+        self.head_turtle = None
+        self.segment_turtles = deque()
+        self.food_turtle = None
+
+        # "turtle" draws with turtle shapes; "canvas" uses CanvasRenderer's
+        # dirty-region updates on raw canvas items; "bitmap" paints cells into
+        # a single image for very large boards
+        self.render_mode = render_mode
+        self.canvas_renderer = None
+        self.text_layer = None
         
     def setup_screen(self):
         """Create and configure the game window"""
@@ -24,6 +91,7 @@ class GameDisplay:
         self.window.bgcolor("white")
         self.window.setup(width=self.WINDOW_WIDTH, height=self.WINDOW_HEIGHT)
         self.window.tracer(0)
+        self.text_layer = TextLayer(self.window.getcanvas(), self.WINDOW_WIDTH, self.WINDOW_HEIGHT)
 
         # Set custom icon for the window
         try:
@@ -40,6 +108,74 @@ class GameDisplay:
 
         return self.window
     
+    def setup_board(self, board_width, board_height, cell_size=20):
+        """Set the grid dimensions used when rendering engine snapshots"""
+        self.board_width = board_width
+        self.board_height = board_height
+        self.cell_size = cell_size
+        if self.render_mode == "canvas":
+            self.canvas_renderer = CanvasRenderer(self.window.getcanvas(), self.cell_to_pixel, cell_size)
+        elif self.render_mode == "bitmap":
+            self.canvas_renderer = BitmapRenderer(self.window.getcanvas(), self.cell_to_pixel, cell_size,
+                                                  board_width, board_height)
+
+    def cell_to_pixel(self, cell):
+        """Convert a grid cell to screen coordinates (board centred on the origin)"""
+        x, y = cell
+        return ((x - self.board_width // 2) * self.cell_size,
+                (y - self.board_height // 2) * self.cell_size)
+
+    def create_cell_turtle(self, shape, color):
+        """Create a turtle used to draw one grid cell"""
+        cell_turtle = turtle.Turtle()
+        cell_turtle.shape(shape)
+        # Turtle shapes are 20 pixels across at the default size
+        cell_turtle.shapesize(self.cell_size / 20)
+        cell_turtle.color(color)
+        cell_turtle.penup()
+        return cell_turtle
+
+    def render(self, snapshot):
+        """Draw a full snapshot produced by GameEngine.snapshot()"""
+        if self.canvas_renderer:
+            self.canvas_renderer.draw(snapshot)
+            return
+        cells = snapshot["snake"]
+        if self.head_turtle is None:
+            self.head_turtle = self.create_cell_turtle("square", "green")
+        self.head_turtle.goto(self.cell_to_pixel(cells[0]))
+
+        while len(self.segment_turtles) < len(cells) - 1:
+            self.segment_turtles.append(self.create_cell_turtle("square", "lightgreen"))
+        for segment, cell in zip(self.segment_turtles, cells[1:]):
+            segment.goto(self.cell_to_pixel(cell))
+
+        if self.food_turtle is None:
+            self.food_turtle = self.create_cell_turtle("circle", "red")
+        self.food_turtle.goto(self.cell_to_pixel(snapshot["food"]))
+
+    def render_tick(self, result):
+        """Apply one engine TickResult, moving a constant number of drawables"""
+        if self.canvas_renderer:
+            self.canvas_renderer.apply(result)
+            return
+        if result.new_head is None:
+            return
+        self.head_turtle.goto(self.cell_to_pixel(result.new_head))
+
+        if result.vacated is None:
+            # The snake grew: a new segment appears where the head was
+            segment = self.create_cell_turtle("square", "lightgreen")
+            segment.goto(self.cell_to_pixel(result.old_head))
+            self.segment_turtles.appendleft(segment)
+        elif self.segment_turtles:
+            # Recycle the tail segment into the gap behind the head
+            self.segment_turtles.rotate(1)
+            self.segment_turtles[0].goto(self.cell_to_pixel(result.old_head))
+
+        if result.food is not None:
+            self.food_turtle.goto(self.cell_to_pixel(result.food))
+
     def get_height(self):
         """Return the window height"""
         return self.WINDOW_HEIGHT
@@ -49,119 +185,71 @@ class GameDisplay:
         return self.WINDOW_WIDTH
     
     def create_score_display(self):
-        """Create a score display turtle"""
-        self.score_display = turtle.Turtle()
-        self.score_display.hideturtle()
-        self.score_display.penup()
-        self.score_display.color("black")
-        self.score_display.goto(-280, 260)
+        """Prepare the score text slot"""
+        self.text_layer.show("score", "Score: 0")
         
     def update_score(self, score):
         """Update the score display"""
-        if self.score_display:
-            self.score_display.clear()
-            self.score_display.write(f"Score: {score}", font=("Arial", 14, "normal"))
+        self.text_layer.show("score", f"Score: {score}")
     
     def create_high_score_display(self):
-        """Create a high score display turtle"""
-        self.high_score_display = turtle.Turtle()
-        self.high_score_display.hideturtle()
-        self.high_score_display.penup()
-        self.high_score_display.color("gray")
-        self.high_score_display.goto(-280, 230)
+        """Prepare the high score text slot"""
+        self.text_layer.show("high_score", "High Score: 0")
 
     def update_high_score_display(self, high_score):
         """Update the high score display"""
-        if hasattr(self, 'high_score_display'):
-            self.high_score_display.clear()
-            self.high_score_display.write(f"High Score: {high_score}", font=("Arial", 12, "normal"))
+        self.text_layer.show("high_score", f"High Score: {high_score}")
+
+    def show_hud(self, text):
+        """Show the performance HUD below the scores"""
+        self.text_layer.show("hud", text)
+
+    def hide_hud(self):
+        """Hide the performance HUD"""
+        self.text_layer.hide("hud")
+
+    def canvas_item_count(self):
+        """Count every item on the game canvas (O(items); call sparingly)"""
+        return len(self.window.getcanvas().find_all())
 
     def show_pause_message(self):
         """Display pause message on screen"""
-        if not self.pause_display:
-            self.pause_display = turtle.Turtle()
-            self.pause_display.hideturtle()
-            self.pause_display.penup()
-            self.pause_display.color("blue")
-        
-        self.pause_display.goto(0, 0)
-        self.pause_display.clear()
-        self.pause_display.write("GAME PAUSED", align="center", font=("Arial", 24, "bold"))
-        
-        # Add instructions
-        instruction_turtle = turtle.Turtle()
-        instruction_turtle.hideturtle()
-        instruction_turtle.penup()
-        instruction_turtle.color("gray")
-        instruction_turtle.goto(0, -40)
-        instruction_turtle.write("Press SPACE to resume", align="center", font=("Arial", 14, "normal"))
-        
-        # Store instruction turtle for cleanup
-        self.pause_instruction = instruction_turtle
+        self.text_layer.show("pause", "GAME PAUSED")
+        self.text_layer.show("pause_hint", "Press SPACE to resume")
     
     def hide_pause_message(self):
         """Hide pause message from screen"""
-        if self.pause_display:
-            self.pause_display.clear()
-        if hasattr(self, 'pause_instruction') and self.pause_instruction:
-            self.pause_instruction.clear()
+        self.text_layer.hide("pause")
+        self.text_layer.hide("pause_hint")
 
-    def show_game_over(self, final_score, high_score, is_new_record):
+    def show_game_over(self, final_score, high_score, is_new_record, wait_for_click=True):
         """Display game over message on the game screen"""
-        # Game over title
-        game_over_display = turtle.Turtle()
-        game_over_display.hideturtle()
-        game_over_display.penup()
-        game_over_display.color("red")
-        game_over_display.goto(0, 100)  # Higher position
-        game_over_display.write("GAME OVER!", align="center", font=("Arial", 24, "bold"))
+        self.hide_pause_message()
+        self.text_layer.show("game_over", "GAME OVER!")
 
         # New high score celebration (if applicable)
         if is_new_record:
-            new_record_display = turtle.Turtle()
-            new_record_display.hideturtle()
-            new_record_display.penup()
-            new_record_display.color("gold")
-            new_record_display.goto(0, 60)  # Below game over title
-            new_record_display.write("🏆 NEW HIGH SCORE! 🏆", align="center", font=("Arial", 16, "bold"))
-            
-            # Final score (for new record)
-            score_display = turtle.Turtle()
-            score_display.hideturtle()
-            score_display.penup()
-            score_display.color("black")
-            score_display.goto(0, 20)  # Below celebration
-            score_display.write(f"New Record: {final_score}", align="center", font=("Arial", 18, "bold"))
-            
+            self.text_layer.show("record_banner", "🏆 NEW HIGH SCORE! 🏆")
+            self.text_layer.show("record_score", f"New Record: {final_score}")
         else:
-            # Final score (normal)
-            score_display = turtle.Turtle()
-            score_display.hideturtle()
-            score_display.penup()
-            score_display.color("black")
-            score_display.goto(0, 40)  # Below game over
-            score_display.write(f"Final Score: {final_score}", align="center", font=("Arial", 16, "normal"))
-            
+            self.text_layer.show("final_score", f"Final Score: {final_score}")
             # High score display (only if not new record)
-            high_score_display = turtle.Turtle()
-            high_score_display.hideturtle()
-            high_score_display.penup()
-            high_score_display.color("blue")
-            high_score_display.goto(0, 10)  # Below final score
-            high_score_display.write(f"High Score: {high_score}", align="center", font=("Arial", 14, "normal"))
+            self.text_layer.show("final_high_score", f"High Score: {high_score}")
         
-        # Instructions
-        instruction_display = turtle.Turtle()
-        instruction_display.hideturtle()
-        instruction_display.penup()
-        instruction_display.color("gray")
-        instruction_display.goto(0, -40)  # Bottom
-        instruction_display.write("Click anywhere to exit", align="center", font=("Arial", 12, "normal"))
+        self.text_layer.show("exit_hint", "Click anywhere to exit")
         
         self.window.update()
-        self.window.exitonclick()
+        if wait_for_click:
+            self.window.exitonclick()
+
+    def hide_game_over(self):
+        """Remove the game over overlay so the screen can host another game"""
+        for name in ("game_over", "record_banner", "record_score", "final_score",
+                     "final_high_score", "exit_hint"):
+            self.text_layer.hide(name)
     
-    def setup_controls(self, up_func, down_func, left_func, right_func, pause_func=None):
+    def setup_controls(self, up_func, down_func, left_func, right_func, pause_func=None, autopilot_func=None,
+                       hud_func=None):
         """Set up keyboard controls"""
         self.window.listen()
         self.window.onkey(up_func, "Up")
@@ -172,7 +260,27 @@ class GameDisplay:
         # Add pause control if provided
         if pause_func:
             self.window.onkey(pause_func, "space")
+
+        # Add autopilot toggle if provided
+        if autopilot_func:
+            self.window.onkey(autopilot_func, "a")
+
+        # Add performance HUD toggle if provided
+        if hud_func:
+            self.window.onkey(hud_func, "h")
     
     def update(self):
         """Update the display"""
-        self.window.update()
\ No newline at end of file
+        if self.canvas_renderer:
+            # Canvas items redraw their own damaged regions; just flush them
+            self.window.getcanvas().update_idletasks()
+        else:
+            self.window.update()
+
+    def run_main_loop(self):
+        """Process Tk events (timers, keys) until stop_main_loop is called"""
+        self.window.mainloop()
+
+    def stop_main_loop(self):
+        """Return from run_main_loop, leaving the window open"""
+        self.window.getcanvas().quit()
\ No newline at end of file
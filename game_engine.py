@@ -0,0 +1,114 @@
+"""
+Headless Snake simulation core.
+Holds all game state as plain data on an integer grid so the rules can run
+without turtle or a Tk display. SnakeGame drives it; GameDisplay renders it.
+"""
+import random
+
+from board import Board
+from snake import Snake
+from food import Food
+
+
+class TickResult:
+    """What changed during a single engine tick"""
+    __slots__ = ("old_head", "new_head", "vacated", "ate", "food", "collision")
+
+    def __init__(self, old_head, new_head=None, vacated=None, ate=False, food=None, collision=None):
+        self.old_head = old_head
+        self.new_head = new_head
+        self.vacated = vacated      # Tail cell freed this tick (None if the snake grew)
+        self.ate = ate
+        self.food = food            # New food cell if the food moved this tick
+        self.collision = collision  # None, "wall" or "self"
+
+
+class GameEngine:
+    # Board sides the rules are defined for: the snake and the first food
+    # need distinct cells, and larger boards are beyond what the game supports
+    MIN_SIDE = 3
+    MAX_SIDE = 1000
+
+    def __init__(self, width=29, height=29, points_per_food=1, seed=None):
+        if not all(self.MIN_SIDE <= side <= self.MAX_SIDE for side in (width, height)):
+            raise ValueError(f"Board sides must be between {self.MIN_SIDE} and {self.MAX_SIDE} cells")
+        self.width = width
+        self.height = height
+        self.points_per_food = points_per_food
+        self.rng = random.Random()
+        self.reset(seed)
+
+    @staticmethod
+    def points_for_player(player_name):
+        """Points each food is worth for a player (special scoring for Pramita)"""
+        return 2 if player_name.lower() == "pramita" else 1
+
+    def reset(self, seed=None):
+        """Start a fresh game with the snake in the middle of the board.
+
+        Every game runs on its own seeded RNG; a seed is drawn if none is given.
+        """
+        if seed is None:
+            seed = random.randrange(2 ** 63)
+        self.seed = seed
+        self.rng.seed(seed)
+        # (tick, direction) for every direction change, applied before that tick
+        self.inputs = []
+        center_x = self.width // 2
+        center_y = self.height // 2
+        self.board = Board(self.width, self.height)
+        self.snake = Snake(center_x, center_y, self.board)
+        self.food = Food(min(center_x + 5, self.width - 1), min(center_y + 5, self.height - 1))
+        self.score = 0
+        self.tick = 0
+        self.game_over = False
+        self.game_over_reason = None
+
+    def change_direction(self, new_direction):
+        """Forward a direction change to the snake and record it for replays"""
+        previous = self.snake.direction
+        self.snake.change_direction(new_direction)
+        if self.snake.direction != previous:
+            self.inputs.append((self.tick + 1, self.snake.direction))
+
+    def step(self):
+        """Advance the simulation by one tick"""
+        snake = self.snake
+        old_head = snake.head
+        if self.game_over:
+            return TickResult(old_head, collision=self.game_over_reason)
+
+        self.tick += 1
+        new_head = snake.next_head()
+        if not self.board.in_bounds(new_head):
+            return self._end(TickResult(old_head, collision="wall"))
+
+        vacated = snake.move()
+        result = TickResult(old_head, new_head, vacated)
+        if snake.check_self_collision():
+            result.collision = "self"
+            return self._end(result)
+
+        if new_head == self.food.get_position():
+            result.ate = True
+            self.score += self.points_per_food
+            snake.add_segment()
+            result.food = self.food.relocate(self.board, self.rng)
+            if result.food is None:
+                # Nowhere left to put food: the snake has filled the board
+                self.game_over = True
+                self.game_over_reason = "board_full"
+        return result
+
+    def _end(self, result):
+        self.game_over = True
+        self.game_over_reason = result.collision
+        return result
+
+    def snapshot(self):
+        """Return the data a renderer needs to draw the current state"""
+        return {
+            "snake": list(self.snake.body),
+            "food": self.food.get_position(),
+            "score": self.score,
+        }
@@ -0,0 +1,58 @@
+"""
+Buffered direction input.
+Key presses are timestamped and queued from Tk callbacks, then consumed one
+per game tick so quick double presses are neither lost nor able to reverse
+the snake within a single tick.
+"""
+import time
+from collections import deque
+
+from snake import Snake
+
+
+class InputQueue:
+    def __init__(self, max_size=3, latency_samples=256, clock=time.perf_counter):
+        self.max_size = max_size
+        self.clock = clock
+        self.events = deque()
+        # Most recent input-to-tick latencies, in seconds
+        self.latencies = deque(maxlen=latency_samples)
+        self.dropped = 0
+
+    def push(self, direction, current_direction):
+        """Queue a direction change; returns False if it was rejected"""
+        last = self.events[-1][0] if self.events else current_direction
+        # Validate against the last queued direction, not the snake's current one
+        if direction == last or direction == Snake.OPPOSITE_DIRECTIONS.get(last):
+            return False
+        if len(self.events) >= self.max_size:
+            self.dropped += 1
+            return False
+        self.events.append((direction, self.clock()))
+        return True
+
+    def pop(self):
+        """Return the direction to apply this tick, or None if no input is waiting"""
+        if not self.events:
+            return None
+        direction, pressed_at = self.events.popleft()
+        self.latencies.append(self.clock() - pressed_at)
+        return direction
+
+    def clear(self):
+        """Discard queued input (e.g. when pausing)"""
+        self.events.clear()
+
+    def latency_stats(self):
+        """Summarise recent input-to-tick latency in milliseconds"""
+        if not self.latencies:
+            return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+        samples = sorted(self.latencies)
+        count = len(samples)
+        return {
+            "count": count,
+            "mean_ms": sum(samples) / count * 1000,
+            "p50_ms": samples[count // 2] * 1000,
+            "p95_ms": samples[min(count - 1, int(count * 0.95))] * 1000,
+            "max_ms": samples[-1] * 1000,
+        }
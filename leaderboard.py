@@ -0,0 +1,245 @@
+"""
+Persistent leaderboard of every finished game.
+Games are appended to a tab-separated log (one line per game, never
+rewritten in place) through the write-behind writer, so recording a game
+never waits for the disk. At load time the log is parsed into columns kept in
+rank order, which answer top-K, per-player best and rank-of-score queries,
+the latter in O(log n) with bisect. The log is compacted every so often:
+rewritten atomically in rank order, dropping malformed lines. Every game is
+kept unless max_entries is set, in which case games ranked below it that are
+not some player's best are dropped (and no longer count towards rank() or
+len()). Compacted logs load without any real sorting work, so hundreds of
+thousands of games load in well under a second.
+
+Run directly: python leaderboard.py [leaderboard.log] [--top N] [--player NAME]
+"""
+import argparse
+import atexit
+import bisect
+import gc
+import operator
+import threading
+import time
+from collections import namedtuple
+from itertools import islice
+
+from write_behind import write_behind
+
+LeaderboardEntry = namedtuple("LeaderboardEntry", "score length duration timestamp player")
+
+
+class Leaderboard:
+    def __init__(self, path="leaderboard.log", max_entries=None, compact_every=1000, writer=None,
+                 background=False):
+        self.path = path
+        self.writer = write_behind if writer is None else writer
+        self.max_entries = max_entries
+        self.compact_every = compact_every
+        # Parallel columns in rank order: best first, earlier games win ties
+        self.neg_scores = []
+        self.lengths = []
+        self.durations = []
+        self.timestamps = []
+        self.players = []
+        self.bests = {}  # Player name: their best entry
+        self.appends_since_compaction = 0
+        self.lock = threading.RLock()
+        self.loaded = threading.Event()
+        self.queued = []  # Games added before the log finished loading
+        if background:
+            # Queries see an empty leaderboard until the load finishes; games
+            # added before then are applied afterwards, even at exit
+            threading.Thread(target=self.load, daemon=True).start()
+            atexit.register(self.loaded.wait, self.writer.FLUSH_TIMEOUT)
+        else:
+            self.load()
+
+    @staticmethod
+    def clean_player(player):
+        """Return a name as the log stores it: no tabs or line breaks, and
+        valid UTF-8 (Tk can hand over lone surrogates for emoji)"""
+        player = player.replace("\t", " ").replace("\n", " ").replace("\r", " ")
+        return player.encode("utf-8", errors="replace").decode("utf-8")
+
+    @staticmethod
+    def format_entry(score, length, duration, timestamp, player):
+        # The player goes last so a name may contain anything but line breaks
+        player = Leaderboard.clean_player(player)
+        return f"{score}\t{length}\t{duration:.3f}\t{timestamp:.3f}\t{player}\n"
+
+    @staticmethod
+    def _parse_columns(fields):
+        """Convert a flat list of log fields into typed columns; raises ValueError on bad fields"""
+        if len(fields) % 5:
+            raise ValueError("Missing leaderboard fields")
+        return ([-score for score in map(int, fields[0::5])], list(map(int, fields[1::5])),
+                list(map(float, fields[2::5])), list(map(float, fields[3::5])), fields[4::5])
+
+    def load(self):
+        """Read the log and rebuild the in-memory index"""
+        # Building the index allocates objects by the million but frees none,
+        # so cyclic GC passes during the load are pure overhead
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._load()
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        with self.lock:
+            self.loaded.set()
+            queued, self.queued = self.queued, []
+            for game in queued:
+                self.add(*game)
+
+    def _load(self):
+        self.writer.flush()  # Read back games that are still on their way to disk
+        self.neg_scores, self.lengths, self.durations, self.timestamps, self.players = [], [], [], [], []
+        self.bests = {}
+        self.appends_since_compaction = 0
+        try:
+            with open(self.path, 'r', encoding="utf-8") as f:
+                data = f.read()
+        except OSError:
+            return
+        if not data:
+            return
+
+        # Fields never contain tabs or line breaks, so one split of the whole
+        # file yields every column as a stride, with no per-line work
+        data = data.rstrip("\n")
+        try:
+            fields = data.replace("\n", "\t").split("\t")
+            if len(fields) != 5 * (data.count("\n") + 1):
+                raise ValueError("Missing leaderboard fields")
+            columns = self._parse_columns(fields)
+            malformed = False
+        except ValueError:
+            # Slow path: drop lines cut short by a crash mid-append or edited by hand
+            good_fields = []
+            lines = data.split("\n")
+            for line in lines:
+                fields = line.split("\t", 4)
+                try:
+                    self._parse_columns(fields)
+                except ValueError:
+                    continue
+                good_fields.extend(fields)
+            print(f"Skipped {len(lines) - len(good_fields) // 5} malformed leaderboard lines")
+            columns = self._parse_columns(good_fields)
+            malformed = True
+
+        # Compacted logs are already in rank order and need no sorting; otherwise
+        # a stable sort keeps tied scores in the order they were played
+        neg_scores = columns[0]
+        in_order = list(map(operator.le, neg_scores, islice(neg_scores, 1, None)))
+        if not all(in_order):
+            # Games appended since the last compaction follow the sorted prefix
+            self.appends_since_compaction = len(neg_scores) - in_order.index(False) - 1
+            order = sorted(range(len(neg_scores)), key=neg_scores.__getitem__)
+            columns = [list(map(column.__getitem__, order)) for column in columns]
+        self.neg_scores, self.lengths, self.durations, self.timestamps, self.players = columns
+
+        # Walking from the worst game up leaves each player's best rank in the dict
+        best_ranks = dict(zip(reversed(self.players), range(len(self.players) - 1, -1, -1)))
+        self.bests = {player: self.entry(index) for player, index in best_ranks.items()}
+        if malformed or self.appends_since_compaction >= self.compact_every:
+            self.compact()
+
+    def entry(self, index):
+        """Return the game at a 0-based rank"""
+        return LeaderboardEntry(-self.neg_scores[index], self.lengths[index], self.durations[index],
+                                self.timestamps[index], self.players[index])
+
+    def add(self, player, score, length, duration, timestamp=None):
+        """Record a finished game; returns its entry, or None if it was
+        queued until the log finishes loading"""
+        timestamp = time.time() if timestamp is None else timestamp
+        with self.lock:
+            if not self.loaded.is_set():
+                self.queued.append((player, score, length, duration, timestamp))
+                return None
+            return self._add(player, score, length, duration, timestamp)
+
+    def _add(self, player, score, length, duration, timestamp):
+        player = self.clean_player(player)  # So the index matches the log once reloaded
+        self.writer.append(self.path, self.format_entry(score, length, duration, timestamp, player))
+
+        index = bisect.bisect_right(self.neg_scores, -score)
+        self.neg_scores.insert(index, -score)
+        self.lengths.insert(index, length)
+        self.durations.insert(index, duration)
+        self.timestamps.insert(index, timestamp)
+        self.players.insert(index, player)
+        entry = self.entry(index)
+        best = self.bests.get(player)
+        if best is None or score > best.score:
+            self.bests[player] = entry
+
+        self.appends_since_compaction += 1
+        if self.appends_since_compaction >= self.compact_every:
+            self.compact()
+        return entry
+
+    def compact(self):
+        """Rewrite the log in rank order; with max_entries set, only the top
+        max_entries games and every player's best are kept"""
+        keep = range(len(self.neg_scores))
+        if self.max_entries is not None and len(keep) > self.max_entries:
+            best_ranks = dict(zip(reversed(self.players), range(len(self.players) - 1, -1, -1)))
+            extra = sorted(index for index in best_ranks.values() if index >= self.max_entries)
+            keep = list(range(self.max_entries)) + extra
+        if len(keep) < len(self.neg_scores):
+            for name in ("neg_scores", "lengths", "durations", "timestamps", "players"):
+                setattr(self, name, list(map(getattr(self, name).__getitem__, keep)))
+        # Formatting a long history takes a while; snapshot the columns and
+        # let the writer thread do it
+        columns = (self.neg_scores[:], self.lengths[:], self.durations[:], self.timestamps[:], self.players[:])
+        self.writer.replace(self.path, lambda: "".join(
+            self.format_entry(-neg_score, length, duration, timestamp, player)
+            for neg_score, length, duration, timestamp, player in zip(*columns)))
+        self.appends_since_compaction = 0
+
+    def __len__(self):
+        return len(self.neg_scores)
+
+    def top(self, k=10):
+        """Return the k best games"""
+        return [self.entry(index) for index in range(min(k, len(self.neg_scores)))]
+
+    def rank(self, score):
+        """Return the rank a score has (or would have); ties share the best rank"""
+        return bisect.bisect_left(self.neg_scores, -score) + 1
+
+    def best_score(self):
+        """Return the highest score ever recorded, or 0"""
+        return -self.neg_scores[0] if self.neg_scores else 0
+
+    def player_best(self, player):
+        """Return a player's best game, or None"""
+        return self.bests.get(self.clean_player(player))
+
+    def top_players(self, k=10):
+        """Return the k players with the best personal bests"""
+        return sorted(self.bests.values(), key=lambda entry: (-entry.score, entry.timestamp))[:k]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Show the best games on the leaderboard")
+    parser.add_argument("path", nargs="?", default="leaderboard.log", help="Leaderboard log file")
+    parser.add_argument("--top", type=int, default=10, help="Number of games to list")
+    parser.add_argument("--player", help="Also show this player's best game and rank")
+    args = parser.parse_args()
+
+    leaderboard = Leaderboard(args.path)
+    print(f"=== Leaderboard ({len(leaderboard)} games) ===")
+    for position, entry in enumerate(leaderboard.top(args.top), 1):
+        played = time.strftime("%Y-%m-%d %H:%M", time.localtime(entry.timestamp))
+        print(f"{position:>4}. {entry.player:<20} {entry.score:>6}  length {entry.length:<5} "
+              f"{entry.duration:>6.0f}s  {played}")
+    if args.player:
+        best = leaderboard.player_best(args.player)
+        if best is None:
+            print(f"{args.player} has no games on the leaderboard")
+        else:
+            print(f"{args.player}'s best: {best.score} (rank #{leaderboard.rank(best.score)})")
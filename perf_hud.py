@@ -0,0 +1,73 @@
+"""
+Aggregated counters for the on-screen performance HUD.
+Per-tick hooks only add to running totals; the HUD text is rebuilt from them
+at most a few times a second and shown in a single reused text item, so
+turning the HUD on barely changes what it measures.
+"""
+import time
+
+
+class PerfHud:
+    REFRESH_INTERVAL = 0.5  # Seconds between HUD text updates
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.enabled = False
+        self.frame_render = 0.0
+        self._start_window(clock())
+
+    def _start_window(self, now):
+        self.window_start = now
+        self.ticks = 0
+        self.lateness_total = 0.0
+        self.lateness_max = 0.0
+        self.frames = 0
+        self.render_total = 0.0
+        self.render_max = 0.0
+
+    def toggle(self):
+        """Turn the HUD on or off; returns the new state"""
+        self.enabled = not self.enabled
+        self.frame_render = 0.0
+        self._start_window(self.clock())
+        return self.enabled
+
+    def add_tick(self, lateness):
+        """Count a tick that started lateness seconds after its deadline"""
+        self.ticks += 1
+        self.lateness_total += lateness
+        if lateness > self.lateness_max:
+            self.lateness_max = lateness
+
+    def add_render_time(self, seconds):
+        """Charge drawing time to the current frame"""
+        self.frame_render += seconds
+
+    def end_frame(self):
+        """Close the current frame's render time"""
+        self.frames += 1
+        self.render_total += self.frame_render
+        if self.frame_render > self.render_max:
+            self.render_max = self.frame_render
+        self.frame_render = 0.0
+
+    def refresh(self, tick_interval, count_items, snake_length):
+        """Return fresh HUD text once per REFRESH_INTERVAL, otherwise None.
+
+        count_items is only called when the text is due, since counting
+        canvas items is the one non-constant-time step.
+        """
+        now = self.clock()
+        elapsed = now - self.window_start
+        if elapsed < self.REFRESH_INTERVAL:
+            return None
+        ticks = max(self.ticks, 1)
+        frames = max(self.frames, 1)
+        text = "\n".join((
+            f"TPS {self.ticks / elapsed:5.1f} / {1 / tick_interval:.1f}",
+            f"Jitter avg {self.lateness_total / ticks * 1000:4.1f}ms max {self.lateness_max * 1000:4.1f}ms",
+            f"Render avg {self.render_total / frames * 1000:5.2f}ms max {self.render_max * 1000:5.2f}ms",
+            f"Items {count_items()}  Length {snake_length}",
+        ))
+        self._start_window(now)
+        return text
@@ -0,0 +1,117 @@
+"""
+Per-phase frame timing for finding stutters.
+The game marks the end of each phase of a frame (input, engine step, replay,
+events, sound, render, display update) and the timer keeps the last few
+thousand frames per phase in fixed-size ring buffers. Rolling p50/p95/p99 are
+computed only when asked for. Frames the game discards (e.g. while paused)
+are counted but leave no samples, so they do not drag the percentiles down.
+While disabled every hook is a no-op function, so leaving the calls in the
+game loop costs next to nothing.
+"""
+import json
+import time
+from array import array
+
+
+def _noop(*args):
+    pass
+
+
+class PhaseTimer:
+    HOOKS = ("begin", "lap", "record", "end", "discard")
+
+    def __init__(self, phases, capacity=2048, enabled=True, clock=time.perf_counter):
+        self.phases = tuple(phases)
+        self.capacity = capacity
+        self.clock = clock
+        # One ring buffer of per-frame seconds for each phase
+        self.samples = {phase: array("d", bytes(8 * capacity)) for phase in self.phases}
+        self.current = dict.fromkeys(self.phases, 0.0)
+        self.frames = 0
+        self.discarded = 0
+        self.last = 0.0
+        self.set_enabled(enabled)
+
+    def set_enabled(self, enabled):
+        """Turn timing on or off; while off the hooks are no-ops"""
+        self.enabled = enabled
+        for name in self.HOOKS:
+            if enabled:
+                self.__dict__.pop(name, None)  # Fall back to the real methods
+            else:
+                setattr(self, name, _noop)
+
+    def begin(self):
+        """Start timing from now (the time since the last lap is not counted)"""
+        self.last = self.clock()
+
+    def lap(self, phase):
+        """Charge the time since the last begin() or lap() to a phase"""
+        now = self.clock()
+        self.current[phase] += now - self.last
+        self.last = now
+
+    def record(self, phase, seconds):
+        """Charge a duration measured elsewhere (e.g. timer lateness) to a phase"""
+        self.current[phase] += seconds
+
+    def end(self):
+        """Close the frame, storing one sample per phase"""
+        slot = self.frames % self.capacity
+        current = self.current
+        for phase in self.phases:
+            self.samples[phase][slot] = current[phase]
+            current[phase] = 0.0
+        self.frames += 1
+
+    def discard(self):
+        """Drop the current frame's timings without storing a sample"""
+        current = self.current
+        for phase in self.phases:
+            current[phase] = 0.0
+        self.discarded += 1
+
+    def recent(self, phase):
+        """Return a phase's stored samples, oldest first"""
+        buffer = self.samples[phase]
+        if self.frames <= self.capacity:
+            return list(buffer[:self.frames])
+        slot = self.frames % self.capacity
+        return list(buffer[slot:]) + list(buffer[:slot])
+
+    def stats(self):
+        """Summarise each phase over the stored frames, in milliseconds"""
+        summary = {}
+        for phase in self.phases:
+            samples = sorted(self.recent(phase))
+            count = len(samples)
+            if not count:
+                summary[phase] = {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0, "mean_ms": 0.0}
+                continue
+            summary[phase] = {
+                "p50_ms": samples[count // 2] * 1000,
+                "p95_ms": samples[min(count - 1, int(count * 0.95))] * 1000,
+                "p99_ms": samples[min(count - 1, int(count * 0.99))] * 1000,
+                "max_ms": samples[-1] * 1000,
+                "mean_ms": sum(samples) / count * 1000,
+            }
+        return summary
+
+    def dump(self, path):
+        """Write the stats and the raw per-frame samples (in ms) to a JSON file"""
+        report = {
+            "frames": self.frames,
+            "discarded_frames": self.discarded,
+            "stored_frames": min(self.frames, self.capacity),
+            "stats": self.stats(),
+            "samples_ms": {phase: [round(s * 1000, 4) for s in self.recent(phase)] for phase in self.phases},
+        }
+        with open(path, 'w') as f:
+            json.dump(report, f)
+
+    def print_summary(self):
+        print(f"=== Frame phases over the last {min(self.frames, self.capacity)} frames "
+              f"({self.discarded} paused frames skipped) ===")
+        for phase, stats in self.stats().items():
+            print(f"  {phase:9s} p50 {stats['p50_ms']:7.3f}ms  p95 {stats['p95_ms']:7.3f}ms  "
+                  f"p99 {stats['p99_ms']:7.3f}ms  max {stats['max_ms']:7.3f}ms")
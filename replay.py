@@ -0,0 +1,150 @@
+"""
+Game recordings and headless replays.
+A recording holds a game's seed, rules and the direction changes applied at
+each tick. Because food placement comes from the game's own seeded RNG,
+re-simulating those inputs reproduces the game exactly, without a display and
+as fast as the CPU allows.
+"""
+import json
+
+from game_engine import GameEngine
+from replay_file import MAGIC, ReplayFormatError, ReplayReader, ReplayWriter
+
+
+class GameRecording:
+    def __init__(self, seed, width, height, points_per_food=1, inputs=(),
+                 final_tick=0, final_score=0, final_length=1, player_name="", rules_version=None):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.points_per_food = points_per_food
+        self.inputs = list(inputs)  # (tick, direction) pairs in tick order
+        self.final_tick = final_tick
+        self.final_score = final_score
+        self.final_length = final_length
+        self.player_name = player_name
+        self.rules_version = rules_version  # Game version the rules came from; None if unknown
+
+    @classmethod
+    def from_engine(cls, engine, player_name=""):
+        """Capture a game from the engine that played it"""
+        return cls(engine.seed, engine.width, engine.height, engine.points_per_food,
+                   engine.inputs, engine.tick, engine.score, len(engine.snake), player_name)
+
+    def to_dict(self):
+        """Return a JSON-serialisable form of the recording"""
+        return {
+            "seed": self.seed,
+            "width": self.width,
+            "height": self.height,
+            "points_per_food": self.points_per_food,
+            "inputs": [list(entry) for entry in self.inputs],
+            "final_tick": self.final_tick,
+            "final_score": self.final_score,
+            "final_length": self.final_length,
+            "player_name": self.player_name,
+            "rules_version": self.rules_version,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a recording from to_dict() output"""
+        data = dict(data)
+        data["inputs"] = [tuple(entry) for entry in data.get("inputs", [])]
+        return cls(**data)
+
+    def save(self, path):
+        """Write the recording as JSON"""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    def save_replay_file(self, path, rules_version=None):
+        """Write the recording in the compact binary .snkr format"""
+        writer = ReplayWriter(path, self.seed, self.width, self.height, self.points_per_food,
+                              self.player_name, rules_version or self.rules_version)
+        for tick, direction in self.inputs:
+            writer.add_input(tick, direction)
+        writer.finish(self.final_tick, self.final_score, self.final_length)
+
+    @classmethod
+    def from_replay_file(cls, path):
+        """Read a .snkr replay, rejecting truncated or corrupted files"""
+        reader = ReplayReader(path)
+        if not reader.verify_checksum():
+            raise ReplayFormatError(f"Replay {path} is truncated or fails its checksum")
+        header = reader.header
+        recording = cls(header["seed"], header["width"], header["height"], header["points_per_food"],
+                        player_name=header["player_name"], rules_version=header["rules_version"])
+        for record in reader.records():
+            if record[0] == "input":
+                recording.inputs.append((record[1], record[2]))
+            elif record[0] == "end":
+                _, recording.final_tick, recording.final_score, recording.final_length = record
+        return recording
+
+    @classmethod
+    def load(cls, path):
+        """Read a recording written by save() or save_replay_file()"""
+        with open(path, 'rb') as f:
+            is_binary = f.read(len(MAGIC)) == MAGIC
+        if is_binary:
+            return cls.from_replay_file(path)
+        with open(path, 'r') as f:
+            return cls.from_dict(json.load(f))
+
+
+# Longest a verified game may run: this many ticks per board cell for each
+# food eaten (and for the stretch before the first), and never more than MAX_TICKS
+TICKS_PER_CELL = 16
+MAX_TICKS = 10_000_000
+
+
+def tick_limit(recording):
+    """Most ticks a game on this board with this score can plausibly last"""
+    area = recording.width * recording.height
+    foods = min(recording.final_score // max(1, recording.points_per_food), area)
+    return min(MAX_TICKS, (foods + 1) * area * TICKS_PER_CELL)
+
+
+def rules_error(recording):
+    """Describe why a recording cannot have been played under the game's rules, or return None"""
+    expected = GameEngine.points_for_player(recording.player_name)
+    if recording.points_per_food != expected:
+        return (f"Claims {recording.points_per_food} points per food, "
+                f"but {recording.player_name!r} earns {expected}")
+    limit = tick_limit(recording)
+    if recording.final_tick > limit:
+        return f"Claims {recording.final_tick} ticks, more than the {limit} its board and score allow"
+    return None
+
+
+def simulate(recording):
+    """Re-run a recording headlessly and return the finished engine.
+
+    Stops at tick_limit(recording) whatever the recording claims, so a
+    crafted replay cannot keep a verifier busy forever.
+    """
+    engine = GameEngine(recording.width, recording.height, recording.points_per_food, recording.seed)
+    inputs = recording.inputs
+    next_input = 0
+    last_tick = min(recording.final_tick, tick_limit(recording))
+    while not engine.game_over and engine.tick < last_tick:
+        tick = engine.tick + 1
+        while next_input < len(inputs) and inputs[next_input][0] <= tick:
+            engine.change_direction(inputs[next_input][1])
+            next_input += 1
+        engine.step()
+    return engine
+
+
+def verify(recording, engine=None):
+    """Check that a recording follows the rules and that its claimed score
+    and length match a re-simulation.
+
+    Pass the engine returned by simulate(recording) to avoid simulating twice.
+    """
+    if rules_error(recording):
+        return False
+    if engine is None:
+        engine = simulate(recording)
+    return engine.score == recording.final_score and len(engine.snake) == recording.final_length
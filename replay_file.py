@@ -0,0 +1,297 @@
+"""
+Compact binary replay format (.snkr) with a streaming writer and reader.
+
+Layout (little endian):
+    header   b"SNKR", format version (u8), rules version (u8 length + ASCII),
+             width (u16), height (u16), seed (u64), points per food (u8),
+             player name (u8 length + UTF-8)
+    records  one tag byte each, followed by varints:
+             0x00-0x03  input: direction code in the tag, tick delta since the previous record
+             0x10       keyframe: absolute tick, direction code, score, length
+             0x20       end: absolute final tick, score, length
+    index    varint count, then (tick, byte offset) for every keyframe
+    trailer  index offset (u32), CRC32 of every preceding byte (u32), b"SNKE"
+
+An input costs two bytes per direction change (nothing on ticks without one),
+so long, fast games stay small. Keyframes are checkpoints in the input stream,
+not snapshots of the board: they carry the game's progress (score and length)
+at a tick so a reader can jump to the inputs around that tick or check
+progress without decoding everything, but restoring the game at a tick still
+means re-simulating from the start. Readers load the whole file into memory;
+even long games are a few kilobytes.
+"""
+import bisect
+import queue
+import struct
+import threading
+import zlib
+
+from game_engine import GameEngine
+from version_info import read_version
+
+MAGIC = b"SNKR"
+TRAILER_MAGIC = b"SNKE"
+FORMAT_VERSION = 1
+
+DIRECTIONS = ("north", "east", "south", "west")
+DIRECTION_CODES = {name: code for code, name in enumerate(DIRECTIONS)}
+
+TAG_INPUT = 0x00
+TAG_KEYFRAME = 0x10
+TAG_END = 0x20
+
+TRAILER = struct.Struct("<II4s")
+
+
+class ReplayFormatError(Exception):
+    """Raised when a replay file is malformed or fails its checksum"""
+
+
+def read_rules_version():
+    """Return the game version that defines the rules a replay was played under"""
+    return read_version()
+
+
+def encode_varint(value, out):
+    """Append an unsigned LEB128 varint to a bytearray"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data, offset):
+    """Decode a varint at offset; returns (value, next offset)"""
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ReplayFormatError("Truncated varint")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def encode_header(seed, width, height, points_per_food, player_name="", rules_version=None):
+    """Build the header bytes for a replay"""
+    rules = (rules_version or read_rules_version()).encode("ascii")[:255]
+    name = player_name.encode("utf-8")[:255]
+    return (MAGIC + struct.pack("<BB", FORMAT_VERSION, len(rules)) + rules +
+            struct.pack("<HHQBB", width, height, seed & (2 ** 64 - 1), points_per_food, len(name)) + name)
+
+
+def decode_header(data):
+    """Parse a header; returns (header dict, offset of the first record)"""
+    if data[:4] != MAGIC:
+        raise ReplayFormatError("Not a replay file")
+    try:
+        version, rules_length = struct.unpack_from("<BB", data, 4)
+        if version != FORMAT_VERSION:
+            raise ReplayFormatError(f"Unsupported replay format version {version}")
+        offset = 6
+        rules = data[offset:offset + rules_length].decode("ascii")
+        offset += rules_length
+        width, height, seed, points, name_length = struct.unpack_from("<HHQBB", data, offset)
+    except (struct.error, UnicodeDecodeError):
+        raise ReplayFormatError("Truncated or malformed replay header")
+    if not all(GameEngine.MIN_SIDE <= side <= GameEngine.MAX_SIDE for side in (width, height)):
+        raise ReplayFormatError(f"Board size {width}x{height} is outside the game's limits")
+    offset += struct.calcsize("<HHQBB")
+    name = data[offset:offset + name_length].decode("utf-8", errors="replace")
+    offset += name_length
+    header = {
+        "rules_version": rules,
+        "width": width,
+        "height": height,
+        "seed": seed,
+        "points_per_food": points,
+        "player_name": name,
+    }
+    return header, offset
+
+
+class ReplayWriter:
+    """Streams a replay to disk from a background thread.
+
+    The game thread only enqueues small tuples, so recording never blocks a tick
+    on encoding or disk I/O.
+    """
+    KEYFRAME_INTERVAL = 256  # ticks
+
+    def __init__(self, path, seed, width, height, points_per_food=1, player_name="", rules_version=None):
+        self.path = path
+        self.events = queue.SimpleQueue()
+        self.inputs_sent = 0
+        self.closed = False
+
+        header = encode_header(seed, width, height, points_per_food, player_name, rules_version)
+        # Opened here so an unwritable path raises OSError to the caller
+        self.file = open(path, 'wb')
+        self.thread = threading.Thread(target=self._write_loop, args=(header,), daemon=True)
+        self.thread.start()
+
+    def add_input(self, tick, direction):
+        """Record a direction change applied before the given tick"""
+        self.events.put((TAG_INPUT, tick, DIRECTION_CODES[direction]))
+
+    def add_keyframe(self, tick, direction, score, length):
+        """Record an input-stream checkpoint with the game's progress at the given tick"""
+        self.events.put((TAG_KEYFRAME, tick, DIRECTION_CODES[direction], score, length))
+
+    def finish(self, tick, score, length):
+        """Write the end record, index and trailer, then wait for the writer thread"""
+        if self.closed:
+            return
+        self.closed = True
+        self.events.put((TAG_END, tick, score, length))
+        self.events.put(None)
+        self.thread.join()
+
+    def on_tick(self, engine):
+        """Record the engine's new inputs and a keyframe when one is due (O(1) per tick)"""
+        self._send_inputs(engine)
+        if engine.tick % self.KEYFRAME_INTERVAL == 0:
+            self.add_keyframe(engine.tick, engine.snake.direction, engine.score, len(engine.snake))
+
+    def close(self, engine):
+        """Finish the replay with the engine's final state"""
+        self._send_inputs(engine)
+        self.finish(engine.tick, engine.score, len(engine.snake))
+
+    def _send_inputs(self, engine):
+        inputs = engine.inputs
+        while self.inputs_sent < len(inputs):
+            self.add_input(*inputs[self.inputs_sent])
+            self.inputs_sent += 1
+
+    def _write_loop(self, header):
+        try:
+            self._write_stream(header)
+        except OSError as e:
+            print(f"Could not write replay {self.path}: {e}")
+
+    def _write_stream(self, header):
+        with self.file as f:
+            crc = zlib.crc32(header)
+            f.write(header)
+            offset = len(header)
+            last_tick = 0
+            keyframes = []
+
+            while True:
+                event = self.events.get()
+                if event is None:
+                    break
+                out = bytearray()
+                tag = event[0]
+                if tag == TAG_INPUT:
+                    _, tick, code = event
+                    out.append(TAG_INPUT | code)
+                    encode_varint(tick - last_tick, out)
+                    last_tick = tick
+                elif tag == TAG_KEYFRAME:
+                    _, tick, code, score, length = event
+                    keyframes.append((tick, offset))
+                    out.append(TAG_KEYFRAME)
+                    for value in (tick, code, score, length):
+                        encode_varint(value, out)
+                    last_tick = tick
+                else:
+                    _, tick, score, length = event
+                    out.append(TAG_END)
+                    for value in (tick, score, length):
+                        encode_varint(value, out)
+                crc = zlib.crc32(out, crc)
+                f.write(out)
+                offset += len(out)
+
+            index = bytearray()
+            encode_varint(len(keyframes), index)
+            for tick, position in keyframes:
+                encode_varint(tick, index)
+                encode_varint(position, index)
+            crc = zlib.crc32(index, crc)
+            f.write(index)
+            index_offset = struct.pack("<I", offset)
+            crc = zlib.crc32(index_offset, crc)
+            f.write(index_offset + struct.pack("<I", crc) + TRAILER_MAGIC)
+
+
+class ReplayReader:
+    """Reads a replay file: header, records as a generator, and seeking the
+    input stream by tick"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.data = f.read()
+        self.header, self.records_offset = decode_header(self.data)
+        self.complete = self.data[-4:] == TRAILER_MAGIC
+        self.keyframes = self._read_index() if self.complete else []
+        self.keyframe_ticks = [tick for tick, _ in self.keyframes]
+
+    def verify_checksum(self):
+        """Check the trailer CRC; returns False for truncated or corrupted files"""
+        if not self.complete:
+            return False
+        stored = struct.unpack_from("<I", self.data, len(self.data) - 8)[0]
+        return zlib.crc32(self.data[:-8]) == stored
+
+    def _read_index(self):
+        index_offset = struct.unpack_from("<I", self.data, len(self.data) - TRAILER.size)[0]
+        self.records_end = index_offset
+        count, offset = decode_varint(self.data, index_offset)
+        keyframes = []
+        for _ in range(count):
+            tick, offset = decode_varint(self.data, offset)
+            position, offset = decode_varint(self.data, offset)
+            if keyframes and tick < keyframes[-1][0]:
+                raise ReplayFormatError(f"Keyframe index is out of tick order at tick {tick}")
+            keyframes.append((tick, position))
+        return keyframes
+
+    def records(self, offset=None, last_tick=0):
+        """Yield ("input", tick, direction), ("keyframe", tick, direction, score, length)
+        and ("end", tick, score, length) records in file order"""
+        data = self.data
+        offset = self.records_offset if offset is None else offset
+        end = self.records_end if self.complete else len(data)
+        while offset < end:
+            start = offset
+            tag = data[offset]
+            offset += 1
+            if tag < len(DIRECTIONS):
+                delta, offset = decode_varint(data, offset)
+                last_tick += delta
+                yield ("input", last_tick, DIRECTIONS[tag])
+            elif tag == TAG_KEYFRAME:
+                values = []
+                for _ in range(4):
+                    value, offset = decode_varint(data, offset)
+                    values.append(value)
+                if values[1] >= len(DIRECTIONS):
+                    raise ReplayFormatError(f"Unknown direction code {values[1]} in keyframe at byte {start}")
+                last_tick = values[0]
+                yield ("keyframe", values[0], DIRECTIONS[values[1]], values[2], values[3])
+            elif tag == TAG_END:
+                values = []
+                for _ in range(3):
+                    value, offset = decode_varint(data, offset)
+                    values.append(value)
+                yield ("end", *values)
+                return
+            else:
+                raise ReplayFormatError(f"Unknown record tag {tag:#x} at byte {start}")
+
+    def seek(self, tick):
+        """Yield records from the last keyframe at or before tick onwards.
+
+        Only the input stream is positioned; the board state at that tick
+        comes from simulating every input from the first tick.
+        """
+        index = bisect.bisect_right(self.keyframe_ticks, tick)
+        if not index:
+            return self.records()
+        return self.records(self.keyframes[index - 1][1])
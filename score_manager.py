@@ -1,13 +1,23 @@
 import os
 
+from leaderboard import Leaderboard
+from write_behind import write_behind
+
 class ScoreManager:
-    def __init__(self, filename="high_score.txt"):
+    def __init__(self, filename="high_score.txt", leaderboard=None, leaderboard_file="leaderboard.log"):
         self.filename = filename
         self.high_score = self.load_high_score()
+        # Loaded on first use, so a long game history never delays the first frame
+        self.leaderboard = leaderboard
+        self.leaderboard_file = leaderboard_file
     
     def load_high_score(self):
         """Load the high score from file"""
         try:
+            # A record still on its way to disk is read from the write-behind queue
+            pending = write_behind.pending_text(self.filename)
+            if pending is not None:
+                return int(pending.strip())
             if os.path.exists(self.filename):
                 with open(self.filename, 'r') as file:
                     return int(file.read().strip())
@@ -15,19 +25,19 @@ class ScoreManager:
                 return 0
         except (FileNotFoundError, ValueError):
             # If file doesn't exist or contains invalid data, return 0
+            print(f"High score file {self.filename} is unreadable; starting from 0")
             return 0
     
     def save_high_score(self, score):
-        """Save the high score to file if it's a new record"""
+        """Save the high score if it's a new record.
+
+        The file is written atomically on the write-behind thread, so the
+        game-over screen never waits for the disk.
+        """
         if score > self.high_score:
             self.high_score = score
-            try:
-                with open(self.filename, 'w') as file:
-                    file.write(str(score))
-                return True  # New high score achieved
-            except IOError:
-                print("Could not save high score to file")
-                return False
+            write_behind.replace(self.filename, str(score))
+            return True  # New high score achieved
         return False  # Not a new high score
     
     def get_high_score(self):
@@ -36,4 +46,18 @@ class ScoreManager:
     
     def is_new_high_score(self, score):
         """Check if the given score is a new high score"""
-        return score > self.high_score
\ No newline at end of file
+        return score > self.high_score
+    
+    def get_leaderboard(self):
+        """Return the leaderboard of every finished game, loading it if needed"""
+        if self.leaderboard is None:
+            self.leaderboard = Leaderboard(self.leaderboard_file)
+        return self.leaderboard
+    
+    def record_game(self, player, score, length, duration):
+        """Add a finished game to the leaderboard and return its rank, or
+        None if the leaderboard is still loading in the background"""
+        leaderboard = self.get_leaderboard()
+        if leaderboard.add(player, score, length, duration) is None:
+            return None
+        return leaderboard.rank(score)
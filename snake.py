@@ -1,74 +1,79 @@
-import turtle
+from collections import deque
 
 class Snake:
-    def __init__(self, x=0, y=0):
-        self.MOVE_DISTANCE = 20
+    # Grid offset applied to the head for each direction (y grows northwards)
+    DIRECTION_STEPS = {
+        "north": (0, 1),
+        "south": (0, -1),
+        "east": (1, 0),
+        "west": (-1, 0)
+    }
+
+    OPPOSITE_DIRECTIONS = {
+        "north": "south",
+        "south": "north",
+        "east": "west",
+        "west": "east"
+    }
+
+    def __init__(self, x, y, board):
         self.direction = "east"
-        self.body = []
-        
-        # Create snake head
-        self.head = turtle.Turtle()
-        self.head.shape("square")
-        self.head.color("green")
-        self.head.penup()
-        self.head.goto(x, y)
-    
+        # Grid cells occupied by the snake, head first
+        self.body = deque([(x, y)])
+        self.grow_pending = 0
+        self.collided = False
+
+        # Occupancy index kept in sync with the body on every move
+        self.board = board
+        self.board.occupy((x, y))
+
+    @property
+    def head(self):
+        """Return the grid cell of the snake's head"""
+        return self.body[0]
+
+    def next_head(self):
+        """Return the cell the head will enter on the next move"""
+        x, y = self.body[0]
+        dx, dy = self.DIRECTION_STEPS[self.direction]
+        return x + dx, y + dy
+
     def move(self):
-        """Move the snake in the current direction"""
-        if self.direction == "east":
-            x = self.head.xcor()
-            self.head.setx(x + self.MOVE_DISTANCE)
-        elif self.direction == "west":
-            x = self.head.xcor()
-            self.head.setx(x - self.MOVE_DISTANCE)
-        elif self.direction == "north":
-            y = self.head.ycor()
-            self.head.sety(y + self.MOVE_DISTANCE)
-        elif self.direction == "south":
-            y = self.head.ycor()
-            self.head.sety(y - self.MOVE_DISTANCE)
+        """Move the snake one cell in the current direction.
+
+        The new head must be on the board. Returns the tail cell that was
+        vacated, or None if the snake grew.
+        """
+        new_head = self.next_head()
+        vacated = None
+        if self.grow_pending:
+            self.grow_pending -= 1
+        else:
+            # The tail moves out before the head moves in
+            vacated = self.body.pop()
+            self.board.vacate(vacated)
+
+        self.collided = self.board.is_occupied(new_head)
+        self.body.appendleft(new_head)
+        self.board.occupy(new_head)
+        return vacated
 
     def get_position(self):
-        """Get the current position of the snake's head"""
-        return self.head.xcor(), self.head.ycor()
+        """Get the current grid cell of the snake's head"""
+        return self.body[0]
 
     def change_direction(self, new_direction):
         """Change the snake's direction if not reversing"""
-        opposite_directions = {
-            "north": "south",
-            "south": "north",
-            "east": "west",
-            "west": "east"
-        }
-        if new_direction != opposite_directions.get(self.direction):
+        if new_direction != self.OPPOSITE_DIRECTIONS.get(self.direction):
             self.direction = new_direction
 
     def add_segment(self):
-        """Add a new segment to the snake's body"""
-        new_segment = turtle.Turtle()
-        new_segment.shape("square")
-        new_segment.color("lightgreen")
-        new_segment.penup()
-        if self.body:
-            last_segment = self.body[-1]
-            new_segment.goto(last_segment.xcor(), last_segment.ycor())
-        else:
-            new_segment.goto(self.head.xcor(), self.head.ycor())
-        self.body.append(new_segment)
-    
-    def move_body(self, head_x, head_y):
-        """Move the body segments to follow the head"""
-        for index in range(len(self.body)-1, 0, -1):
-            x = self.body[index-1].xcor()
-            y = self.body[index-1].ycor()
-            self.body[index].goto(x, y)
+        """Grow the snake by one segment on its next move"""
+        self.grow_pending += 1
 
-        if len(self.body) > 0:
-            self.body[0].goto(head_x, head_y)
+    def __len__(self):
+        return len(self.body)
 
     def check_self_collision(self):
-        """Check if snake head hits its own body"""
-        for segment in self.body:
-            if self.head.distance(segment) < 15:  # Slightly smaller than food collision
-                return True
-        return False
\ No newline at end of file
+        """Check if the last move ran the head into the body"""
+        return self.collided
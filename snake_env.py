@@ -0,0 +1,87 @@
+"""
+Gym-style reset/step interface over the headless game engine.
+The observation is a (height, width) uint8 grid that is preallocated once and
+patched in place from each TickResult, so stepping allocates nothing and the
+same read-only array is returned every time.
+"""
+import numpy as np
+
+from game_engine import GameEngine
+
+
+class SnakeEnv:
+    # Observation cell values
+    EMPTY, BODY, HEAD, FOOD = 0, 1, 2, 3
+
+    # Action codes, matching BatchSnakeEnv
+    ACTIONS = ("north", "east", "south", "west")
+
+    DEATH_REWARD = -1.0
+
+    def __init__(self, width=29, height=29, points_per_food=1):
+        self.engine = GameEngine(width, height, points_per_food)
+        # grid[y, x] with y = 0 at the bottom row, like the engine's cells
+        self._grid = np.zeros((height, width), dtype=np.uint8)
+        self.observation = self._grid.view()
+        self.observation.flags.writeable = False
+        self.done = False
+
+    def reset(self, seed=None):
+        """Start a new game; returns the observation buffer"""
+        engine = self.engine
+        engine.reset(seed)
+        self.done = False
+
+        grid = self._grid
+        grid.fill(self.EMPTY)
+        for x, y in engine.snake.body:
+            grid[y, x] = self.BODY
+        head_x, head_y = engine.snake.head
+        grid[head_y, head_x] = self.HEAD
+        food_x, food_y = engine.food.get_position()
+        grid[food_y, food_x] = self.FOOD
+        return self.observation
+
+    def step(self, action):
+        """Apply an action (index into ACTIONS, or None to keep going straight).
+
+        Returns (observation, reward, done, info). The observation is the same
+        buffer on every call and is updated in place.
+        """
+        engine = self.engine
+        if self.done:
+            return self.observation, 0.0, True, self._info()
+        if action is not None:
+            engine.change_direction(self.ACTIONS[action])
+
+        result = engine.step()
+        if result.collision:
+            self.done = True
+            return self.observation, self.DEATH_REWARD, True, self._info()
+
+        grid = self._grid
+        x, y = result.old_head
+        grid[y, x] = self.BODY
+        if result.vacated is not None:
+            x, y = result.vacated
+            grid[y, x] = self.EMPTY
+        x, y = result.new_head
+        grid[y, x] = self.HEAD
+
+        reward = 0.0
+        if result.ate:
+            reward = float(engine.points_per_food)
+            if result.food is not None:
+                x, y = result.food
+                grid[y, x] = self.FOOD
+        self.done = engine.game_over
+        return self.observation, reward, self.done, self._info()
+
+    def _info(self):
+        engine = self.engine
+        return {
+            "score": engine.score,
+            "length": len(engine.snake),
+            "tick": engine.tick,
+            "reason": engine.game_over_reason,
+        }
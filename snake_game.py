@@ -1,38 +1,91 @@
+import argparse
+import importlib
+import os
+import sys
+import threading
 import time
 import tkinter as tk
 from tkinter import messagebox, simpledialog
 from score_manager import ScoreManager
-from snake import Snake
-from food import Food
+from game_engine import GameEngine
+from autopilot import Autopilot
+from input_queue import InputQueue
+from leaderboard import Leaderboard
+from perf_hud import PerfHud
+from phase_timer import PhaseTimer
+from replay_file import ReplayWriter
 from game_display import GameDisplay
-from sound_manager import SoundManager
-from update_system import UpdateChecker
+from tick_scheduler import TickScheduler
 
 class SnakeGame:
     def __init__(self):
          # Initialize constants
         self.GAME_SPEED = 0.1
-        self.BOUNDARY = 290
+        self.START_SPEED = 0.1
+        self.MIN_SPEED = 0.03
+        # Board size in cells, and the size of one cell in pixels
+        self.BOARD_WIDTH = 29
+        self.BOARD_HEIGHT = 29
+        self.CELL_SIZE = 20
+        # Smallest and largest board side, in cells
+        self.MIN_BOARD_CELLS = 10
+        self.MAX_BOARD_CELLS = GameEngine.MAX_SIDE
+        # Boards too big for 20 pixel cells get smaller cells so the window,
+        # board plus margin, fits this many pixels
+        self.MAX_BOARD_PIXELS = 1000
+        self.WINDOW_MARGIN = 20
+        # "canvas" redraws only the cells that changed each tick; "turtle" redraws every shape
+        self.RENDER_MODE = "canvas"
+        # Boards with more cells than this paint into a single bitmap instead
+        self.BITMAP_THRESHOLD = 100 * 100
+        # name: (width, height, cell size or None to fit, start speed, autopilot on)
+        self.BOARD_PRESETS = {
+            "classic": (29, 29, 20, 0.1, False),
+            "large": (120, 120, None, 0.1, False),
+            "stress": (500, 500, None, self.MIN_SPEED, True),
+        }
+        self.board_preset = "classic"
+        # Every finished game is saved here so it can be replayed headlessly
+        self.REPLAY_DIR = "replays"
+        # Audio latency profile (see AudioDevice.LATENCY_PROFILES)
+        self.AUDIO_PROFILE = "low"
+        # Per-phase frame timings are dumped here at game over when profiling is on
+        self.PROFILE_DIR = "profiles"
+        self.PROFILE_PHASES = False
+        # Frame phases, in the order they run
+        self.PHASES = ("lateness", "input", "step", "replay", "events", "sound", "render", "update")
         
         # Initialize game state
         self.score = 0
         self.is_paused = False
+        self.autopilot_enabled = False
+        self.autopilot_used = False
         self.player_name = ""
         
         # Initialize game objects
-        self.snake = None
-        self.food = None
+        self.engine = None
         self.display = None
         self.score_manager = None
+        self.leaderboard = None  # Kept across games; loading a long history is not free
         self.sound_manager = None
+        self.scheduler = None
+        self.replay_writer = None
+        self.autopilot = None
+        self.input_queue = InputQueue()
+        self.phase_timer = PhaseTimer(self.PHASES, enabled=self.PROFILE_PHASES)
+        self.hud = PerfHud()
         
-        # Update system (separate from game)
-        self.update_checker = UpdateChecker()
+        # Update system (separate from game), created when first needed
+        self.update_checker = None
+        # Print startup milestones for benchmark.py --startup
+        self.STARTUP_BENCHMARK = False
     
     def reset_game_state(self):
         """Reset all game state for a fresh start"""
         self.score = 0
         self.is_paused = False
+        self.autopilot_enabled = False
+        self.autopilot_used = False
         
         # Clean up previous game objects more carefully
         if self.display and hasattr(self.display, 'window') and self.display.window:
@@ -56,8 +109,11 @@ class SnakeGame:
                 pass
         
         # Reset game objects to None
-        self.snake = None
-        self.food = None
+        self.engine = None
+        self.autopilot = None
+        self.input_queue = InputQueue()
+        self.phase_timer = PhaseTimer(self.PHASES, enabled=self.PROFILE_PHASES)
+        self.hud = PerfHud()
         self.display = None
         self.score_manager = None
         self.sound_manager = None
@@ -66,7 +122,7 @@ class SnakeGame:
         """Show main menu with Play Game and Check Updates options"""
         root = tk.Tk()
         root.title("Snake Game")
-        root.geometry("350x400")  # Made taller to fit instructions
+        root.geometry("350x480")  # Made taller to fit instructions
         root.resizable(False, False)
         
         # Center the window
@@ -82,6 +138,10 @@ class SnakeGame:
                                width=18, height=2, command=lambda: self.start_game(root))
         play_button.pack(pady=8)
         
+        stress_button = tk.Button(menu_frame, text="Stress Test (500x500)", font=("Arial", 12),
+                                 width=18, height=2, command=lambda: self.start_game(root, "stress"))
+        stress_button.pack(pady=8)
+        
         update_button = tk.Button(menu_frame, text="Check for Updates", font=("Arial", 12),
                                  width=18, height=2, command=self.check_updates)
         update_button.pack(pady=8)
@@ -110,6 +170,23 @@ class SnakeGame:
                                 font=("Arial", 8), fg="gray")
         feature3_label.pack()
         
+        feature4_label = tk.Label(instructions_frame, text="• Press A to toggle the autopilot", 
+                                font=("Arial", 8), fg="gray")
+        feature4_label.pack()
+        
+        feature5_label = tk.Label(instructions_frame, text="• Press H to show performance stats", 
+                                font=("Arial", 8), fg="gray")
+        feature5_label.pack()
+        
+        # pygame and NumPy take longer to import than everything else
+        # together; load them while the player is still in the menu
+        self.preload_sound_system()
+        self.preload_leaderboard()
+        if self.STARTUP_BENCHMARK:
+            root.update()
+            self.mark_startup("menu_visible")
+            root.after(0, lambda: self.start_game(root))
+        
         root.mainloop()
         
         # Safely destroy the window
@@ -119,16 +196,13 @@ class SnakeGame:
             # Window was already destroyed
             pass
     
-    def start_game(self, menu_window):
+    def start_game(self, menu_window, preset=None):
         """Start the actual game after getting player name"""
         menu_window.destroy()
         
         # Reset game state for a fresh start
         self.reset_game_state()
-        
-        # Add a small delay to ensure cleanup is complete
-        import time
-        time.sleep(0.1)
+        self.apply_board_preset(preset or self.board_preset)
         
         self.get_player_name()
         
@@ -144,6 +218,9 @@ class SnakeGame:
     
     def get_player_name(self):
         """Get player name before starting the game"""
+        if self.STARTUP_BENCHMARK:
+            self.player_name = "Benchmark"
+            return
         root = tk.Tk()
         root.withdraw()  # Hide the root window
         
@@ -161,88 +238,271 @@ class SnakeGame:
         root.destroy()
         print(f"Welcome, {self.player_name}!")
     
+    def select_board(self, spec, cell_size=None):
+        """Choose the board Play Game uses: a preset name or WIDTHxHEIGHT"""
+        if spec in self.BOARD_PRESETS:
+            if cell_size is None:
+                self.board_preset = spec
+                return
+            width, height, preset_cell_size, speed, autopilot = self.BOARD_PRESETS[spec]
+        else:
+            try:
+                width, height = (int(n) for n in spec.lower().split("x"))
+            except ValueError:
+                raise ValueError(f"Board must be one of {', '.join(self.BOARD_PRESETS)} or WIDTHxHEIGHT, not {spec!r}")
+            preset_cell_size, speed, autopilot = None, self.BOARD_PRESETS["classic"][3], False
+        if not all(self.MIN_BOARD_CELLS <= side <= self.MAX_BOARD_CELLS for side in (width, height)):
+            raise ValueError(f"Board sides must be between {self.MIN_BOARD_CELLS} and {self.MAX_BOARD_CELLS} cells")
+        if cell_size is not None:
+            largest = self.max_cell_size(width, height)
+            if not 1 <= cell_size <= largest:
+                raise ValueError(f"Cell size for a {width}x{height} board must be between 1 and {largest} pixels")
+        self.BOARD_PRESETS["custom"] = (width, height, cell_size or preset_cell_size, speed, autopilot)
+        self.board_preset = "custom"
+
+    def max_cell_size(self, width, height):
+        """Largest cell size whose window, margin included, fits MAX_BOARD_PIXELS"""
+        return max(1, (self.MAX_BOARD_PIXELS - self.WINDOW_MARGIN) // max(width, height))
+
+    def apply_board_preset(self, name):
+        """Size the board and pick the starting speed and controls for a preset"""
+        width, height, cell_size, speed, autopilot = self.BOARD_PRESETS[name]
+        self.BOARD_WIDTH = width
+        self.BOARD_HEIGHT = height
+        # Shrink the cells of big boards so the window stays on screen
+        self.CELL_SIZE = cell_size or min(20, self.max_cell_size(width, height))
+        self.START_SPEED = speed
+        self.GAME_SPEED = speed
+        self.autopilot_enabled = autopilot
+
     def check_updates(self):
         """Check for updates (separate from game logic)"""
+        if self.update_checker is None:
+            from update_system import UpdateChecker
+            self.update_checker = UpdateChecker()
         self.update_checker.check_and_prompt_for_updates()
 
+    def preload_sound_system(self):
+        """Import the sound system on a background thread"""
+        threading.Thread(target=importlib.import_module, args=("sound_manager",), daemon=True).start()
+
+    def preload_leaderboard(self):
+        """Load the leaderboard on a background thread, once per session"""
+        if self.leaderboard is None:
+            self.leaderboard = Leaderboard(background=True)
+
+    def mark_startup(self, milestone):
+        """Report a startup milestone with a wall-clock timestamp"""
+        print(f"[STARTUP] {milestone} {time.time():.6f}", flush=True)
+
+    def queue_direction(self, direction):
+        """Buffer a direction change until the next tick"""
+        self.input_queue.push(direction, self.engine.snake.direction)
+
     def go_up(self):
         """Change snake direction to up"""
-        self.snake.change_direction("north")
+        self.queue_direction("north")
     
     def go_down(self):
         """Change snake direction to down"""
-        self.snake.change_direction("south")
+        self.queue_direction("south")
     
     def go_left(self):
         """Change snake direction to left"""
-        self.snake.change_direction("west")
+        self.queue_direction("west")
     
     def go_right(self):
         """Change snake direction to right"""
-        self.snake.change_direction("east")
+        self.queue_direction("east")
     
     def toggle_pause(self):
         """Toggle game pause state"""
         self.is_paused = not self.is_paused
         if self.is_paused:
             print("Game Paused! Press SPACE to resume.")
+            self.input_queue.clear()
             self.display.show_pause_message()
         else:
             print("Game Resumed!")
             self.display.hide_pause_message()
 
-    def check_collisions(self):
-        """Check for collisions with boundaries and food"""
+    def toggle_autopilot(self):
+        """Hand the controls to the autopilot, or take them back"""
+        self.autopilot_enabled = not self.autopilot_enabled
+        self.input_queue.clear()
+        self.autopilot.reset()
+        print("Autopilot on!" if self.autopilot_enabled else "Autopilot off!")
+
+    def toggle_hud(self):
+        """Show or hide the performance HUD"""
+        if self.hud.toggle():
+            self.display.show_hud("Measuring...")
+        else:
+            self.display.hide_hud()
+
+    def on_tick_lateness(self, lateness):
+        """Feed how late a tick started to the profilers"""
+        self.phase_timer.record("lateness", lateness)
+        if self.hud.enabled:
+            self.hud.add_tick(lateness)
+
+    def play_sound(self, play, *args):
+        """Play a sound during a tick, timing it apart from the other events"""
+        self.phase_timer.lap("events")
+        play(*args)
+        self.phase_timer.lap("sound")
+
+    def check_collisions(self, result):
+        """React to the collisions and food events of an engine tick"""
         # Check boundary collision
-        if self.snake.get_position()[0] > self.BOUNDARY or self.snake.get_position()[0] < -self.BOUNDARY or self.snake.get_position()[1] > self.BOUNDARY or self.snake.get_position()[1] < -self.BOUNDARY:
+        if result.collision == "wall":
             print("Game Over!")
-            self.sound_manager.play_game_over_sound()
+            self.play_sound(self.sound_manager.play_game_over_sound)
             return True
         
         # Check self-collision
-        if self.snake.check_self_collision():
+        if result.collision == "self":
             print("Game Over! You ran into yourself.")
-            self.sound_manager.play_game_over_sound()
+            self.play_sound(self.sound_manager.play_game_over_sound)
             return True
 
         # Check food collision
-        if self.snake.head.distance(self.food.get_food()) < 20:
+        if result.ate:
             print("Yum! Food eaten.")
-            self.sound_manager.play_eat_sound()
+            # Pitch rises with the score; the sound shortens as ticks do
+            self.play_sound(self.sound_manager.play_eat_sound, self.engine.score, self.GAME_SPEED)
             
-            # Special scoring for Pramita (case insensitive)
-            if self.player_name.lower() == "pramita":
-                self.score += 2
-                print(f"Special scoring for {self.player_name}! +2 points")
-            else:
-                self.score += 1
+            # Special scoring for Pramita is applied by the engine's points_per_food
+            if self.engine.points_per_food > 1:
+                print(f"Special scoring for {self.player_name}! +{self.engine.points_per_food} points")
+            self.score = self.engine.score
                 
             self.display.update_score(self.score)
-            self.snake.add_segment()
-            self.food.relocate(self.BOUNDARY)
             self.update_game_speed()
 
+            if self.engine.game_over:
+                print("Incredible! The snake filled the whole board.")
+                return True
+
         return False
     
     def update_game_speed(self):
         """Increase speed based on score"""
-        # Start at 0.1, get 10% faster every 5 points
-        self.GAME_SPEED = max(0.03, 0.1 - (self.score // 5) * 0.01)
+        # Start at START_SPEED, get 0.01s faster every 5 points
+        self.GAME_SPEED = max(self.MIN_SPEED, self.START_SPEED - (self.score // 5) * 0.01)
+
+    def tick(self):
+        """Advance the game by one fixed timestep; returns True on game over"""
+        if self.is_paused:
+            return False
+
+        timer = self.phase_timer
+        timer.begin()
+        if self.autopilot_enabled:
+            self.autopilot_used = True
+            direction = self.autopilot.choose_direction()
+        else:
+            direction = self.input_queue.pop()
+        if direction:
+            self.engine.change_direction(direction)
+        timer.lap("input")
+        result = self.engine.step()
+        timer.lap("step")
+        if self.replay_writer:
+            self.replay_writer.on_tick(self.engine)
+        timer.lap("replay")
+        game_over = self.check_collisions(result)
+        timer.lap("events")
+        if game_over:
+            self.display.stop_main_loop()
+            return True
+        hud = self.hud
+        if hud.enabled:
+            start = hud.clock()
+            self.display.render_tick(result)
+            hud.add_render_time(hud.clock() - start)
+        else:
+            self.display.render_tick(result)
+        timer.lap("render")
+        return False
+
+    def render_frame(self):
+        """Flush the display after the frame's ticks and close the frame's timings"""
+        timer = self.phase_timer
+        hud = self.hud
+        # The HUD may be toggled by a key press handled inside update()
+        measuring = hud.enabled
+        if measuring:
+            start = hud.clock()
+        timer.begin()
+        self.display.update()
+        timer.lap("update")
+        if self.is_paused:
+            timer.discard()  # Nothing but redraws happens while paused
+        else:
+            timer.end()
+
+        if measuring and hud.enabled:
+            hud.add_render_time(hud.clock() - start)
+            hud.end_frame()
+            text = hud.refresh(self.GAME_SPEED, self.display.canvas_item_count, len(self.engine.snake))
+            if text:
+                self.display.show_hud(text)
 
     def game_loop(self):
-        """Main game loop"""
-        while True:
-            if not self.is_paused:
-                head_x, head_y = self.snake.get_position()
+        """Main game loop, driven by Tk timers until the game is over"""
+        self.scheduler = TickScheduler(self.display.window.ontimer, self.tick,
+                                       self.render_frame, lambda: self.GAME_SPEED,
+                                       on_lateness=self.on_tick_lateness)
+        self.scheduler.start()
+        self.display.run_main_loop()
+
+    def start_replay(self):
+        """Stream the game's seed and inputs to a replay file as it is played"""
+        filename = f"{time.strftime('%Y%m%d_%H%M%S')}_{self.engine.seed}.snkr"
+        try:
+            os.makedirs(self.REPLAY_DIR, exist_ok=True)
+            self.replay_writer = ReplayWriter(os.path.join(self.REPLAY_DIR, filename), self.engine.seed,
+                                              self.engine.width, self.engine.height,
+                                              self.engine.points_per_food, self.player_name)
+        except OSError as e:
+            print(f"Could not record a replay, playing without one: {e}")
+            self.replay_writer = None
 
-                self.snake.move()
-                self.snake.move_body(head_x, head_y)
+    def dump_phase_timings(self):
+        """Print the frame phase percentiles and save the raw timings for this game"""
+        self.phase_timer.print_summary()
+        path = os.path.join(self.PROFILE_DIR, f"{time.strftime('%Y%m%d_%H%M%S')}_{self.engine.seed}.json")
+        try:
+            os.makedirs(self.PROFILE_DIR, exist_ok=True)
+            self.phase_timer.dump(path)
+            print(f"Frame timings saved to {path}")
+        except OSError as e:
+            print(f"Could not save frame timings: {e}")
 
-                if self.check_collisions():
-                    break
+    def record_high_score(self):
+        """Save the score if it beats the high score; returns True for a new record"""
+        if self.autopilot_used:
+            print("Autopilot games do not count towards the high score")
+            return False
+        return self.score_manager.save_high_score(self.score)
 
-            time.sleep(self.GAME_SPEED)
-            self.display.update()
+    def record_leaderboard(self, duration):
+        """Add the finished game to the leaderboard and print where it ranks"""
+        if self.autopilot_used:
+            print("Autopilot games are not ranked on the leaderboard")
+            return
+        rank = self.score_manager.record_game(self.player_name, self.score, len(self.engine.snake), duration)
+        if rank is None:
+            # Never wait for the disk at game over; the game is ranked once the log has loaded
+            print("The leaderboard is still loading; this game will be ranked once it is ready")
+            return
+        leaderboard = self.score_manager.get_leaderboard()
+        best = leaderboard.player_best(self.player_name)
+        print(f"Leaderboard rank #{rank} of {len(leaderboard)} "
+              f"({self.player_name}'s best: {best.score}, rank #{leaderboard.rank(best.score)})")
+        for position, entry in enumerate(leaderboard.top(5), 1):
+            print(f"  {position}. {entry.player}: {entry.score} (length {entry.length}, {entry.duration:.0f}s)")
 
     def run_game(self):
         """Set up and run the game"""
@@ -250,17 +510,21 @@ class SnakeGame:
 
         # Set up display, snake, and food
         print("Creating display...")
-        self.display = GameDisplay()
+        render_mode = self.RENDER_MODE
+        if self.BOARD_WIDTH * self.BOARD_HEIGHT > self.BITMAP_THRESHOLD:
+            render_mode = "bitmap"
+        # Leave a 10 pixel margin around the board, as the classic 600x600 window does
+        self.display = GameDisplay(max(600, self.BOARD_WIDTH * self.CELL_SIZE + self.WINDOW_MARGIN),
+                                   max(600, self.BOARD_HEIGHT * self.CELL_SIZE + self.WINDOW_MARGIN), render_mode)
         self.display.setup_screen()
+        self.display.setup_board(self.BOARD_WIDTH, self.BOARD_HEIGHT, self.CELL_SIZE)
         
-        print("Creating snake...")
-        self.snake = Snake()
-        print("Creating food...")
-        self.food = Food()
+        print("Creating game engine...")
+        points_per_food = GameEngine.points_for_player(self.player_name)
+        self.engine = GameEngine(self.BOARD_WIDTH, self.BOARD_HEIGHT, points_per_food)
+        self.autopilot = Autopilot(self.engine)
         print("Creating score manager...")
-        self.score_manager = ScoreManager()
-        print("Creating sound manager...")
-        self.sound_manager = SoundManager()
+        self.score_manager = ScoreManager(leaderboard=self.leaderboard)
 
         # Create score display
         print("Setting up UI...")
@@ -268,16 +532,58 @@ class SnakeGame:
         self.display.create_high_score_display()
         self.display.update_score(self.score) # Initial score display
         self.display.update_high_score_display(self.score_manager.get_high_score()) # Initial high score display
+        self.display.render(self.engine.snapshot())
+        self.display.update()
+        if self.STARTUP_BENCHMARK:
+            self.mark_startup("first_frame")
+            sys.exit(0)
+
+        # Sound is imported once the first frame is on screen; the device
+        # opens in the background and sounds are skipped until it is ready
+        print("Creating sound manager...")
+        from sound_manager import SoundManager
+        self.sound_manager = SoundManager(profile=self.AUDIO_PROFILE)
+        self.sound_manager.prewarm_eat_variants(self.score, self.GAME_SPEED)
 
         # Set up controls
         print("Setting up controls...")
-        self.display.setup_controls(self.go_up, self.go_down, self.go_left, self.go_right, self.toggle_pause)
+        self.display.setup_controls(self.go_up, self.go_down, self.go_left, self.go_right, self.toggle_pause,
+                                    self.toggle_autopilot, self.toggle_hud)
         
+        self.start_replay()
+
         print("Starting game loop...")
         # Start the game loop
+        started = time.perf_counter()
         self.game_loop()
+        duration = time.perf_counter() - started
+        if self.replay_writer:
+            self.replay_writer.close(self.engine)
 
-        is_new_record = self.score_manager.save_high_score(self.score)
+        if self.phase_timer.enabled:
+            self.dump_phase_timings()
+
+        audio = self.sound_manager.status()
+        if audio["ready"]:
+            latency = audio["latency"]
+            print(f"Sound was ready {audio['ready_ms']:.0f}ms after game start "
+                  f"({audio['skipped_plays']} sounds skipped before then)")
+            print(f"Audio profile {latency['profile']!r}: ~{latency['output_p95_ms']:.1f}ms trigger-to-output "
+                  f"(p95), {audio['dropped_plays']} sounds dropped for higher-priority voices")
+            variants = audio["eat_variants"]
+            print(f"Eat sound variants: {variants['hits']} hits, {variants['misses']} misses")
+            if latency["output_p95_ms"] > self.MIN_SPEED * 1000:
+                print("Warning: sound lags by more than one tick at top speed; try a lower-latency profile")
+        else:
+            print(f"Sound never became ready ({audio['skipped_plays']} sounds skipped)")
+
+        latency = self.input_queue.latency_stats()
+        if latency["count"]:
+            print(f"Input latency over {latency['count']} moves: "
+                  f"mean {latency['mean_ms']:.1f}ms, p95 {latency['p95_ms']:.1f}ms, max {latency['max_ms']:.1f}ms")
+
+        is_new_record = self.record_high_score()
+        self.record_leaderboard(duration)
 
         # Add this celebration sound for new records!
         if is_new_record:
@@ -299,5 +605,21 @@ class SnakeGame:
                 pass
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Snake Game")
+    parser.add_argument("--board", default="classic",
+                        help="Board preset (classic, large, stress) or WIDTHxHEIGHT in cells")
+    parser.add_argument("--cell-size", type=int, default=None, help="Cell size in pixels (default: fit the window)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Time each frame phase and dump the timings at game over")
+    parser.add_argument("--startup-benchmark", action="store_true",
+                        help="Print startup milestones, start a game straight away and exit at its first frame")
+    args = parser.parse_args()
+
     game = SnakeGame()
+    game.PROFILE_PHASES = args.profile
+    game.STARTUP_BENCHMARK = args.startup_benchmark
+    try:
+        game.select_board(args.board, args.cell_size)
+    except ValueError as e:
+        parser.error(str(e))
     game.show_main_menu()
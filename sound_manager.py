@@ -1,22 +1,220 @@
 import pygame
 import os
-import numpy as np
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from sound_synth import pcm_cache
+
+
+class AudioDevice:
+    """The process's audio output, opened once on first use and kept open.
+
+    Slow or missing audio devices can take a long time to fail, so callers
+    open it from a background thread. Channels are split into reserved pools
+    per sound category so a burst of one kind of sound can never take the
+    channels another kind needs.
+    """
+    # name: (sample rate, buffer frames). A buffer is the device's minimum
+    # output delay: 256 frames at 44.1kHz is under 6ms, well inside a 30ms tick.
+    LATENCY_PROFILES = {
+        "low": (44100, 256),
+        "balanced": (22050, 512),
+        "safe": (22050, 2048),
+    }
+    FALLBACK_PROFILE = "safe"
+
+    # category: number of reserved channels
+    CHANNEL_POOLS = {"alerts": 2, "effects": 3}
+    TOTAL_CHANNELS = 8
 
-class SoundManager:
     def __init__(self):
-        """Initialize the sound system"""
+        self.lock = threading.Lock()
+        self.opened = False
+        self.available = False
+        self.open_seconds = None
+        self.profile = None
+        self.sample_rate = None
+        self.buffer_frames = None
+        self.pools = {}
+        self.voices = {}  # Channel index: (priority, start time) of its latest sound
+        self.trigger_seconds = deque(maxlen=256)
+
+    def open(self, profile="low"):
+        """Open the mixer if nothing has tried yet; returns True if audio works.
+
+        The first caller's latency profile wins; if the device rejects it the
+        safe profile is tried before giving up.
+        """
+        with self.lock:
+            if not self.opened:
+                start = time.perf_counter()
+                for name in dict.fromkeys((profile, self.FALLBACK_PROFILE)):
+                    sample_rate, buffer_frames = self.LATENCY_PROFILES[name]
+                    try:
+                        pygame.mixer.init(frequency=sample_rate, size=-16, channels=2, buffer=buffer_frames)
+                    except pygame.error as e:
+                        print(f"Audio profile {name!r} not available ({e})")
+                        continue
+                    self.profile, self.sample_rate, self.buffer_frames = name, sample_rate, buffer_frames
+                    self.available = True
+                    self._reserve_channels()
+                    break
+                else:
+                    print("Sound system not available - running without audio")
+                self.open_seconds = time.perf_counter() - start
+                self.opened = True
+        return self.available
+
+    def _reserve_channels(self):
+        pygame.mixer.set_num_channels(self.TOTAL_CHANNELS)
+        # Reserved channels are never handed out by Sound.play(), only by pick_channel
+        pygame.mixer.set_reserved(sum(self.CHANNEL_POOLS.values()))
+        index = 0
+        self.pools = {}
+        for category, count in self.CHANNEL_POOLS.items():
+            self.pools[category] = [(i, pygame.mixer.Channel(i)) for i in range(index, index + count)]
+            index += count
+        self.voices = {}
+
+    def pick_channel(self, category, priority):
+        """Return a channel for a new sound, or None if every voice outranks it.
+
+        A free channel in the category's pool is used first; otherwise the
+        lowest-priority, oldest voice in the pool is stolen.
+        """
+        pool = self.pools.get(category)
+        if not pool:
+            return pygame.mixer.find_channel()
+        now = time.perf_counter()
+        for index, channel in pool:
+            if not channel.get_busy():
+                self.voices[index] = (priority, now)
+                return channel
+        index, channel = min(pool, key=lambda entry: self.voices.get(entry[0], (0, 0.0)))
+        if self.voices.get(index, (0, 0.0))[0] > priority:
+            return None
+        self.voices[index] = (priority, now)
+        return channel
+
+    def record_trigger(self, seconds):
+        """Record how long a play call took to hand its sound to the mixer"""
+        self.trigger_seconds.append(seconds)
+
+    def latency_stats(self):
+        """Estimate trigger-to-output latency in milliseconds.
+
+        Output begins once the sound has been handed to the mixer and the
+        current device buffer has drained, so the estimate is the measured
+        trigger time plus one buffer.
+        """
+        buffer_ms = self.buffer_frames / self.sample_rate * 1000 if self.available else 0.0
+        samples = sorted(self.trigger_seconds)
+        if not samples:
+            return {"profile": self.profile, "buffer_ms": buffer_ms, "triggers": 0,
+                    "trigger_p50_ms": 0.0, "trigger_p95_ms": 0.0, "output_p95_ms": buffer_ms}
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000
+        return {
+            "profile": self.profile,
+            "buffer_ms": buffer_ms,
+            "triggers": len(samples),
+            "trigger_p50_ms": samples[len(samples) // 2] * 1000,
+            "trigger_p95_ms": p95,
+            "output_p95_ms": buffer_ms + p95,
+        }
+
+    def close(self):
+        """Release the device (e.g. before exiting); the next open() reopens it"""
+        with self.lock:
+            if self.available:
+                pygame.mixer.quit()
+            self.opened = False
+            self.available = False
+
+
+# One device for every SoundManager in the process
+audio_device = AudioDevice()
+
+
+class SoundManager:
+    # sound: (channel pool, priority). Higher priorities may steal lower ones' voices.
+    SOUND_VOICES = {
+        'eat': ("effects", 1),
+        'new_record': ("alerts", 2),
+        'game_over': ("alerts", 3),
+    }
+
+    # Eat sound variants: a semitone higher every 5 points (up to an octave)
+    # and shorter as the game speeds up
+    EAT_FREQUENCY = 800
+    POINTS_PER_SEMITONE = 5
+    MAX_SEMITONES = 12
+    VARIANT_CACHE_SIZE = 24
+    # Variants synthesized ahead of need: this many pitch steps up, at this and the next speed
+    PREWARM_STEPS = 2
+
+    def __init__(self, background=True, profile="low"):
+        """Initialize the sound system; with background, without blocking the caller"""
+        self.profile = profile
+        # Least recently used first; filled by the prewarm worker thread
+        self.variants = OrderedDict()
+        self.variants_lock = threading.Lock()
+        self.variant_hits = 0
+        self.variant_misses = 0
+        self.variant_evictions = 0
+        self.pending_variants = set()
+        self.variant_requests = None  # Queue for the prewarm worker, started on first use
+        # Sound calls are no-ops until the device is open and the sounds are loaded
+        self.sounds_enabled = False
+        self.sounds = {}
+        self.volume = None  # Set by set_volume(); None keeps pygame's default
+        self.created_at = time.perf_counter()
+        self.ready_seconds = None
+        self.skipped_plays = 0
+        self.dropped_plays = 0
+        self.closed = False
+        self.state_lock = threading.Lock()  # Guards closed and sounds_enabled
+        self.ready = threading.Event()
+        if background:
+            threading.Thread(target=self.start_audio, daemon=True).start()
+        else:
+            self.start_audio()
+
+    def start_audio(self):
+        """Open the shared device and load the sounds, then enable playback"""
         try:
-            pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=512)
-            self.sounds_enabled = True
-            self.sounds = {}
-            self.load_sounds()
-        except pygame.error:
-            print("Sound system not available - running without audio")
-            self.sounds_enabled = False
+            if audio_device.open(self.profile):
+                self.load_sounds()
+                self.ready_seconds = time.perf_counter() - self.created_at
+                # cleanup() may have run while the device was opening
+                with self.state_lock:
+                    if self.closed:
+                        self.sounds = {}
+                        return
+                    self.sounds_enabled = True
+                if self.volume is not None:
+                    self.set_volume(self.volume)  # Asked for before the sounds were loaded
+                print(f"Sound ready after {self.ready_seconds * 1000:.0f}ms "
+                      f"(device opened in {audio_device.open_seconds * 1000:.0f}ms)")
+        finally:
+            self.ready.set()
+
+    def status(self):
+        """Report audio readiness and start-up latency"""
+        return {
+            "ready": self.sounds_enabled,
+            "device_available": audio_device.available,
+            "device_open_ms": None if audio_device.open_seconds is None else audio_device.open_seconds * 1000,
+            "ready_ms": None if self.ready_seconds is None else self.ready_seconds * 1000,
+            "skipped_plays": self.skipped_plays,
+            "dropped_plays": self.dropped_plays,
+            "eat_variants": self.variant_stats(),
+            "latency": audio_device.latency_stats(),
+        }
     
     def load_sounds(self):
         """Load all game sound effects"""
-        if not self.sounds_enabled:
+        if not audio_device.available:
             return
         
         # Define sound files (we'll create simple beep sounds if files don't exist)
@@ -39,7 +237,7 @@ class SoundManager:
     
     def create_beep_sound(self, sound_type):
         """Create simple beep sounds programmatically"""
-        if not self.sounds_enabled:
+        if not audio_device.available:
             return None
         
         # Different frequencies for different sounds
@@ -52,34 +250,96 @@ class SoundManager:
         frequency = frequencies.get(sound_type, 400)
         duration = 0.1 if sound_type == 'eat' else 0.3
         
-        # Create a simple sine wave beep
-        sample_rate = 22050
-        frames = int(duration * sample_rate)
-        
-        # Create stereo array (2 channels)
-        arr = np.zeros((frames, 2), dtype=np.float32)  # Make it 2D for stereo
-        
-        for i in range(frames):
-            sample = np.sin(2 * np.pi * frequency * i / sample_rate)
-            
-            # Fade out to avoid clicks
-            fade_frames = int(0.01 * sample_rate)
-            if i >= frames - fade_frames:
-                fade_factor = (frames - i) / fade_frames
-                sample *= fade_factor
-            
-            # Apply same sample to both left and right channels
-            arr[i, 0] = sample  # Left channel
-            arr[i, 1] = sample  # Right channel
-        
-        # Convert to pygame sound
-        arr = (arr * 32767).astype(np.int16)
-        sound = pygame.sndarray.make_sound(arr)
-        return sound
+        return self.create_tone(frequency, duration)
+
+    def create_tone(self, frequency, duration):
+        """Build a Sound for a sine tone, synthesizing it only if no cache has it"""
+        # Synthesize at the rate and channel count the mixer actually opened
+        sample_rate, _, channels = pygame.mixer.get_init()
+        # Sine wave with a 10ms fade out to avoid clicks, cached across games
+        pcm = pcm_cache.get("sine", frequency, duration, sample_rate, ("fade_out", 0.01), channels)
+        return pygame.mixer.Sound(buffer=pcm)
+
+    def eat_variant_key(self, score, speed):
+        """Quantize score and tick length into a (semitones, duration in ms) variant"""
+        semitones = min(score // self.POINTS_PER_SEMITONE, self.MAX_SEMITONES)
+        # The beep lasts about one tick, between 50 and 100ms, in 10ms steps
+        duration_ms = max(50, min(100, int(round(speed * 100)) * 10))
+        return semitones, duration_ms
+
+    def prewarm_eat_variants(self, score, speed):
+        """Queue the variants the next few eats are likely to need for synthesis off-thread"""
+        keys = [self.eat_variant_key(score + step * self.POINTS_PER_SEMITONE, speed - faster * 0.01)
+                for step in range(self.PREWARM_STEPS + 1) for faster in (0, 1)]
+        with self.variants_lock:
+            keys = [key for key in dict.fromkeys(keys)
+                    if key not in self.variants and key not in self.pending_variants]
+            self.pending_variants.update(keys)
+        if not keys:
+            return
+        if self.variant_requests is None:
+            self.variant_requests = queue.SimpleQueue()
+            threading.Thread(target=self._variant_worker, args=(self.variant_requests,), daemon=True).start()
+        for key in keys:
+            self.variant_requests.put(key)
+
+    def _variant_worker(self, requests):
+        self.ready.wait()
+        if not audio_device.available:
+            return
+        while True:
+            key = requests.get()
+            if key is None or self.closed:
+                return
+            semitones, duration_ms = key
+            try:
+                sound = self.create_tone(self.EAT_FREQUENCY * 2 ** (semitones / 12), duration_ms / 1000)
+            except (pygame.error, TypeError):
+                sound = None  # No mixer: leave the variant to the plain eat sound
+            with self.variants_lock:
+                self.pending_variants.discard(key)
+                if sound is not None:
+                    if self.volume is not None:
+                        sound.set_volume(self.volume)
+                    self.variants[key] = sound
+                    if len(self.variants) > self.VARIANT_CACHE_SIZE:
+                        self.variants.popitem(last=False)
+                        self.variant_evictions += 1
+
+    def variant_stats(self):
+        """Report the eat variant cache's hit/miss counters"""
+        with self.variants_lock:
+            cached = len(self.variants)
+            pending = len(self.pending_variants)
+        return {
+            "hits": self.variant_hits,
+            "misses": self.variant_misses,
+            "evictions": self.variant_evictions,
+            "cached": cached,
+            "pending": pending,
+        }
     
-    def play_eat_sound(self):
-        """Play sound when snake eats food"""
-        self.play_sound('eat')
+    def play_eat_sound(self, score=None, speed=None):
+        """Play sound when snake eats food, pitched by score and speed if given.
+
+        Never synthesizes: a variant that is not cached yet falls back to the
+        plain eat sound and is synthesized in the background for next time.
+        """
+        if score is None or not self.sounds_enabled:
+            self.play_sound('eat')
+            return
+        key = self.eat_variant_key(score, speed)
+        with self.variants_lock:
+            sound = self.variants.get(key)
+            if sound is not None:
+                self.variants.move_to_end(key)
+        if sound is not None:
+            self.variant_hits += 1
+            self.play_voice('eat', sound)
+        else:
+            self.variant_misses += 1
+            self.play_sound('eat')
+        self.prewarm_eat_variants(score, speed)
     
     def play_game_over_sound(self):
         """Play sound when game ends"""
@@ -91,20 +351,43 @@ class SoundManager:
     
     def play_sound(self, sound_name):
         """Play a specific sound effect"""
-        if self.sounds_enabled and sound_name in self.sounds and self.sounds[sound_name]:
-            try:
-                self.sounds[sound_name].play()
-            except pygame.error:
-                pass  # Ignore sound errors gracefully
+        if not self.sounds_enabled:
+            self.skipped_plays += 1
+            return
+        self.play_voice(sound_name, self.sounds.get(sound_name))
+
+    def play_voice(self, sound_name, sound):
+        """Play a Sound on a channel from its category's pool"""
+        if not sound:
+            return
+        triggered = time.perf_counter()
+        pool, priority = self.SOUND_VOICES.get(sound_name, (None, 0))
+        try:
+            channel = audio_device.pick_channel(pool, priority)
+            if channel is None:
+                # Every voice in the pool is busy with a more important sound
+                self.dropped_plays += 1
+                return
+            channel.play(sound)
+        except pygame.error:
+            return  # Ignore sound errors gracefully
+        audio_device.record_trigger(time.perf_counter() - triggered)
     
     def set_volume(self, volume):
-        """Set volume for all sounds (0.0 to 1.0)"""
-        if self.sounds_enabled:
-            for sound in self.sounds.values():
+        """Set volume for all sounds (0.0 to 1.0), including eat variants synthesized later"""
+        with self.variants_lock:
+            self.volume = volume
+            if not self.sounds_enabled:
+                return
+            for sound in list(self.sounds.values()) + list(self.variants.values()):
                 if sound:
                     sound.set_volume(volume)
     
     def cleanup(self):
-        """Clean up sound resources"""
-        if self.sounds_enabled:
-            pygame.mixer.quit()
\ No newline at end of file
+        """Stop using this manager's sounds; the device stays open for the next game"""
+        with self.state_lock:
+            self.closed = True
+            self.sounds_enabled = False
+            self.sounds = {}
+        if self.variant_requests is not None:
+            self.variant_requests.put(None)
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""
+Procedural sound synthesis with memory and disk caches.
+Tones are synthesized with vectorized NumPy and stored as raw interleaved
+16-bit PCM, keyed by (waveform, frequency, duration, sample rate, envelope,
+channels). The memory cache lives for the whole process, so every game after
+the first gets its sounds for free. The disk cache lets new processes skip
+synthesis (and importing NumPy) too.
+"""
+import hashlib
+import os
+
+WAVEFORMS = ("sine", "square", "triangle", "sawtooth")
+
+
+def synthesize(waveform, frequency, duration, sample_rate, envelope=None, channels=2):
+    """Render a tone as interleaved signed 16-bit PCM bytes.
+
+    envelope is None or ("fade_out", seconds): a linear fade over the end of
+    the tone to avoid a click.
+    """
+    import numpy as np
+
+    frames = int(duration * sample_rate)
+    phase = frequency * np.arange(frames) / sample_rate
+    if waveform == "sine":
+        wave = np.sin(2 * np.pi * phase)
+    elif waveform == "square":
+        wave = np.where(phase % 1.0 < 0.5, 1.0, -1.0)
+    elif waveform == "triangle":
+        wave = 4 * np.abs(phase % 1.0 - 0.5) - 1
+    elif waveform == "sawtooth":
+        wave = 2 * (phase % 1.0) - 1
+    else:
+        raise ValueError(f"Unknown waveform {waveform!r}; expected one of {WAVEFORMS}")
+
+    if envelope is not None:
+        kind, seconds = envelope
+        if kind != "fade_out":
+            raise ValueError(f"Unknown envelope {kind!r}")
+        fade_frames = min(int(seconds * sample_rate), frames)
+        if fade_frames:
+            wave[frames - fade_frames:] *= np.arange(fade_frames, 0, -1) / fade_frames
+
+    samples = (wave.astype(np.float32) * 32767).astype(np.int16)
+    return np.repeat(samples[:, None], channels, axis=1).tobytes()
+
+
+class PcmCache:
+    def __init__(self, directory="sound_cache"):
+        self.directory = directory
+        self.memory = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _path(self, key):
+        waveform, frequency, duration, sample_rate, envelope, channels = key
+        digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:12]
+        return os.path.join(self.directory, f"{waveform}_{frequency:g}hz_{duration * 1000:g}ms_{sample_rate}_{digest}.pcm")
+
+    def get(self, waveform, frequency, duration, sample_rate, envelope=None, channels=2):
+        """Return PCM bytes for a tone, synthesizing it only if no cache has it"""
+        key = (waveform, frequency, duration, sample_rate, envelope, channels)
+        pcm = self.memory.get(key)
+        if pcm is not None:
+            self.hits += 1
+            return pcm
+
+        expected_size = int(duration * sample_rate) * channels * 2
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                pcm = f.read()
+            if len(pcm) != expected_size:
+                pcm = None  # Truncated or stale file; synthesize again
+        except OSError:
+            pcm = None
+
+        if pcm is None:
+            self.misses += 1
+            pcm = synthesize(waveform, frequency, duration, sample_rate, envelope, channels)
+            self._write(path, pcm)
+        else:
+            self.disk_hits += 1
+        self.memory[key] = pcm
+        return pcm
+
+    def _write(self, path, pcm):
+        """Save PCM atomically so a crash never leaves a half-written cache file"""
+        temp_path = f"{path}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                f.write(pcm)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Could not cache sound {path}: {e}")
+
+
+# Shared by every SoundManager in the process
+pcm_cache = PcmCache()
@@ -0,0 +1,116 @@
+"""
+Tests for the built-in autopilot
+"""
+import sys
+import os
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from autopilot import Autopilot
+from game_engine import GameEngine
+
+
+def play(engine, autopilot, max_ticks):
+    while not engine.game_over and engine.tick < max_ticks:
+        direction = autopilot.choose_direction()
+        assert direction in engine.snake.DIRECTION_STEPS
+        assert direction != engine.snake.OPPOSITE_DIRECTIONS[engine.snake.direction] or len(engine.snake) == 1
+        engine.change_direction(direction)
+        engine.step()
+    return engine
+
+
+def test_autopilot_grows_long_on_an_even_board():
+    # A 10x10 board has a Hamiltonian cycle to fall back on
+    engine = GameEngine(10, 10, seed=1)
+    play(engine, Autopilot(engine), 20000)
+    assert len(engine.snake) > 50
+
+
+def test_autopilot_scores_on_the_default_board():
+    engine = GameEngine(29, 29, seed=3)
+    autopilot = Autopilot(engine)
+    play(engine, autopilot, 5000)
+    assert engine.score >= 50
+    assert autopilot.plans > 0
+
+
+def test_search_resumes_across_ticks_when_out_of_time():
+    # A fake clock that jumps past the budget on every reading
+    now = [0.0]
+
+    def clock():
+        now[0] += 1.0
+        return now[0]
+
+    engine = GameEngine(60, 60, seed=5)
+    autopilot = Autopilot(engine, time_budget=0.5, clock=clock)
+    play(engine, autopilot, 400)
+    assert autopilot.budget_overruns > 0
+    assert engine.score > 0
+
+
+def grow_serpentine(engine, length):
+    """Grow the snake to length by sweeping it back and forth across the rows"""
+    engine.snake.grow_pending = length
+    engine.change_direction("west")
+    while len(engine.snake) < length:
+        x, y = engine.snake.head
+        at_edge = {"west": x == 0, "east": x == engine.width - 1}.get(engine.snake.direction, False)
+        if at_edge:
+            turn_back = "east" if engine.snake.direction == "west" else "west"
+            engine.change_direction("south")
+            engine.step()
+            engine.change_direction(turn_back)
+        engine.step()
+        assert not engine.game_over
+
+
+class CountingDeque(deque):
+    """A snake body that counts how often something walks all of it"""
+    walks = 0
+
+    def __iter__(self):
+        CountingDeque.walks += 1
+        return super().__iter__()
+
+
+def test_ticks_never_walk_the_whole_snake():
+    # Each tick's work has to fit the time budget however long the snake is
+    engine = GameEngine(120, 120, seed=4)
+    grow_serpentine(engine, 6000)
+    engine.snake.body = CountingDeque(engine.snake.body)
+    autopilot = Autopilot(engine)
+    for _ in range(300):
+        CountingDeque.walks = 0
+        direction = autopilot.choose_direction()
+        assert CountingDeque.walks == 0
+        engine.change_direction(direction)
+        engine.step()
+        assert not engine.game_over
+
+
+def test_long_snake_on_a_large_board_stays_within_the_tick_budget():
+    engine = GameEngine(300, 300, seed=4)
+    grow_serpentine(engine, 40000)
+    autopilot = Autopilot(engine, time_budget=0.005)
+    times = []
+    for _ in range(60):
+        start = time.perf_counter()
+        direction = autopilot.choose_direction()
+        times.append(time.perf_counter() - start)
+        engine.change_direction(direction)
+        engine.step()
+    times.sort()
+    assert times[len(times) // 2] < 0.005 * 1.5
+
+
+if __name__ == "__main__":
+    test_autopilot_grows_long_on_an_even_board()
+    test_autopilot_scores_on_the_default_board()
+    test_search_resumes_across_ticks_when_out_of_time()
+    test_ticks_never_walk_the_whole_snake()
+    test_long_snake_on_a_large_board_stays_within_the_tick_budget()
+    print("All autopilot tests passed")
@@ -0,0 +1,54 @@
+"""
+Check that the vectorized batch environment follows GameEngine's rules
+"""
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from batch_env import BatchSnakeEnv
+from game_engine import GameEngine
+
+
+def test_batch_matches_game_engine():
+    rng = random.Random(7)
+    width, height = 8, 6
+    env = BatchSnakeEnv(4, width, height, seed=3)
+    engines = [GameEngine(width, height) for _ in range(env.num_games)]
+    finished = 0
+
+    for _ in range(3000):
+        actions = np.array([rng.randrange(-1, 4) for _ in engines])
+        for engine, action in zip(engines, actions):
+            if action >= 0:
+                engine.change_direction(BatchSnakeEnv.DIRECTION_NAMES[action])
+        results = [engine.step() for engine in engines]
+        rewards, dones, final_scores = env.step(actions)
+
+        for game, (engine, result) in enumerate(zip(engines, results)):
+            assert dones[game] == engine.game_over
+            if engine.game_over:
+                assert final_scores[game] == engine.score
+                engines[game] = GameEngine(width, height)
+                finished += 1
+                continue
+            assert env.snake_cells(game) == list(engine.snake.body)
+            assert rewards[game] == (1 if result.ate else 0)
+            # Food placement is random; follow the batch's choice
+            engine.food.position = env.food_cell(game)
+    assert finished == env.episodes_finished > 0
+
+
+def test_reversal_is_ignored():
+    env = BatchSnakeEnv(2, 29, 29, seed=1)
+    env.step(np.array([BatchSnakeEnv.WEST, BatchSnakeEnv.NORTH]))
+    assert list(env.direction) == [BatchSnakeEnv.EAST, BatchSnakeEnv.NORTH]
+
+
+if __name__ == "__main__":
+    test_batch_matches_game_engine()
+    test_reversal_is_ignored()
+    print("All batch environment tests passed")
@@ -0,0 +1,57 @@
+"""
+Tests for board size presets and custom board sizes
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from snake_game import SnakeGame
+
+
+def test_classic_preset_matches_the_original_board():
+    game = SnakeGame()
+    game.apply_board_preset("classic")
+    assert (game.BOARD_WIDTH, game.BOARD_HEIGHT, game.CELL_SIZE) == (29, 29, 20)
+    assert not game.autopilot_enabled
+
+
+def test_stress_preset_shrinks_cells_to_fit():
+    game = SnakeGame()
+    game.apply_board_preset("stress")
+    assert (game.BOARD_WIDTH, game.BOARD_HEIGHT) == (500, 500)
+    assert game.BOARD_WIDTH * game.CELL_SIZE + game.WINDOW_MARGIN <= game.MAX_BOARD_PIXELS
+    assert game.autopilot_enabled
+    assert game.GAME_SPEED == game.MIN_SPEED
+
+
+def test_custom_board_size():
+    game = SnakeGame()
+    game.select_board("300x200", cell_size=3)
+    game.apply_board_preset(game.board_preset)
+    assert (game.BOARD_WIDTH, game.BOARD_HEIGHT, game.CELL_SIZE) == (300, 200, 3)
+    for bad in ("huge", "5x5", "2000x10"):
+        try:
+            game.select_board(bad)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"{bad} should be rejected")
+    # 29 * 33 + 20 = 977 pixels fits; 29 * 34 + 20 = 1006 does not
+    for board, cell_size in (("300x200", 4), ("stress", 2), ("classic", 34), ("classic", 0), ("classic", -5)):
+        try:
+            game.select_board(board, cell_size)
+        except ValueError:
+            pass
+        else:
+            raise AssertionError(f"cell size {cell_size} on {board} should be rejected")
+    game.select_board("classic", cell_size=33)
+    game.apply_board_preset(game.board_preset)
+    assert game.BOARD_WIDTH * game.CELL_SIZE + game.WINDOW_MARGIN <= game.MAX_BOARD_PIXELS
+
+
+if __name__ == "__main__":
+    test_classic_preset_matches_the_original_board()
+    test_stress_preset_shrinks_cells_to_fit()
+    test_custom_board_size()
+    print("All board preset tests passed")
@@ -0,0 +1,140 @@
+"""
+Tests for the headless game engine (no display required)
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import random
+
+from board import Board, hamiltonian_cycle, hamiltonian_successor
+from game_engine import GameEngine
+
+
+def test_snake_moves_one_cell_per_tick():
+    engine = GameEngine(29, 29)
+    start = engine.snake.head
+    engine.step()
+    assert engine.snake.head == (start[0] + 1, start[1])
+    assert len(engine.snake) == 1
+
+
+def test_reversal_is_ignored():
+    engine = GameEngine(29, 29)
+    engine.change_direction("west")
+    assert engine.snake.direction == "east"
+
+
+def test_wall_collision_ends_game():
+    engine = GameEngine(5, 5)
+    engine.food.position = (0, 0)
+    result = None
+    for _ in range(5):
+        result = engine.step()
+        if result.collision:
+            break
+    assert result.collision == "wall"
+    assert engine.game_over
+
+
+def test_eating_scores_and_grows():
+    engine = GameEngine(29, 29, points_per_food=2)
+    head_x, head_y = engine.snake.head
+    engine.food.position = (head_x + 1, head_y)
+    result = engine.step()
+    assert result.ate
+    assert engine.score == 2
+    # Growth happens on the following move: the tail is not retracted
+    result = engine.step()
+    assert result.vacated is None
+    assert len(engine.snake) == 2
+
+
+def test_self_collision():
+    engine = GameEngine(29, 29)
+    engine.food.position = (0, 0)
+    for _ in range(4):
+        engine.snake.add_segment()
+        engine.step()
+    for direction in ("north", "west", "south"):
+        engine.change_direction(direction)
+        result = engine.step()
+    assert result.collision == "self"
+
+
+def test_occupancy_tracks_body():
+    engine = GameEngine(29, 29)
+    engine.food.position = (0, 0)
+    for _ in range(3):
+        engine.snake.add_segment()
+    for direction in ("east", "east", "north", "north", "west", "north"):
+        engine.change_direction(direction)
+        engine.step()
+    assert sum(engine.board.occupied) == len(engine.snake)
+    assert all(engine.board.is_occupied(cell) for cell in engine.snake.body)
+
+
+def test_free_cell_index_matches_occupancy():
+    board = Board(7, 5)
+    rng = random.Random(1)
+    cells = [(x, y) for x in range(7) for y in range(5)]
+    for _ in range(500):
+        cell = rng.choice(cells)
+        if rng.random() < 0.6:
+            board.occupy(cell)
+        else:
+            board.vacate(cell)
+        free = {board.free_cells[i] for i in range(board.free_count)}
+        assert free == {board.index(c) for c in cells if not board.is_occupied(c)}
+
+
+def test_food_never_lands_on_snake():
+    board = Board(4, 4)
+    for x in range(4):
+        for y in range(4):
+            if (x, y) != (2, 3):
+                board.occupy((x, y))
+    rng = random.Random(5)
+    assert all(board.random_free_cell(rng) == (2, 3) for _ in range(20))
+    board.occupy((2, 3))
+    assert board.random_free_cell(rng) is None
+
+
+def test_hamiltonian_successor_follows_the_cycle():
+    for width, height in ((2, 2), (5, 4), (8, 6), (29, 30)):
+        cycle = hamiltonian_cycle(width, height)
+        for i, cell in enumerate(cycle):
+            assert hamiltonian_successor(width, height, cell) == cycle[(i + 1) % len(cycle)]
+
+
+def test_large_board_uses_one_byte_per_cell():
+    engine = GameEngine(500, 500, seed=2)
+    occupied = engine.board.occupied
+    assert isinstance(occupied, bytearray) and len(occupied) == 500 * 500
+    # One byte per cell plus the bytearray's fixed overhead, not a set of tuples
+    assert sys.getsizeof(occupied) - sys.getsizeof(bytearray()) <= 500 * 500 + 64
+    assert engine.board.free_count == 500 * 500 - 1
+    # Walk a long loop; occupancy stays in step with the body
+    for tick in range(1, 2000):
+        if tick % 100 == 0:
+            engine.change_direction(["north", "west", "south", "east"][(tick // 100 - 1) % 4])
+        engine.step()
+    assert not engine.game_over
+    assert engine.board.free_count == 500 * 500 - len(engine.snake)
+    assert all(engine.board.is_occupied(cell) for cell in engine.snake.body)
+    assert engine.board.occupied is occupied and len(occupied) == 500 * 500
+
+
+if __name__ == "__main__":
+    test_snake_moves_one_cell_per_tick()
+    test_reversal_is_ignored()
+    test_wall_collision_ends_game()
+    test_eating_scores_and_grows()
+    test_self_collision()
+    test_occupancy_tracks_body()
+    test_free_cell_index_matches_occupancy()
+    test_food_never_lands_on_snake()
+    test_hamiltonian_successor_follows_the_cycle()
+    test_large_board_uses_one_byte_per_cell()
+    print("All game engine tests passed")
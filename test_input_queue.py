@@ -0,0 +1,52 @@
+"""
+Tests for buffered, timestamped direction input
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from game_engine import GameEngine
+from input_queue import InputQueue
+
+
+def test_two_presses_in_one_tick_are_both_applied():
+    engine = GameEngine(29, 29)
+    queue = InputQueue()
+    queue.push("north", engine.snake.direction)
+    queue.push("west", engine.snake.direction)
+    start_x, start_y = engine.snake.head
+    for _ in range(2):
+        engine.change_direction(queue.pop())
+        engine.step()
+    assert engine.snake.head == (start_x - 1, start_y + 1)
+
+
+def test_reversal_checked_against_last_queued_direction():
+    queue = InputQueue()
+    assert queue.push("north", "east")
+    # South reverses the queued north even though the snake still faces east
+    assert not queue.push("south", "east")
+    assert not queue.push("north", "east")
+    assert len(queue.events) == 1
+
+
+def test_queue_is_bounded_and_reports_latency():
+    now = [0.0]
+    queue = InputQueue(max_size=2, clock=lambda: now[0])
+    queue.push("north", "east")
+    queue.push("east", "east")
+    assert not queue.push("south", "east")
+    assert queue.dropped == 1
+    now[0] = 0.05
+    queue.pop()
+    stats = queue.latency_stats()
+    assert stats["count"] == 1
+    assert abs(stats["max_ms"] - 50.0) < 1e-6
+
+
+if __name__ == "__main__":
+    test_two_presses_in_one_tick_are_both_applied()
+    test_reversal_checked_against_last_queued_direction()
+    test_queue_is_bounded_and_reports_latency()
+    print("All input queue tests passed")
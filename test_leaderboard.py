@@ -0,0 +1,207 @@
+"""
+Tests for the append-only leaderboard log and its rank index
+"""
+import sys
+import os
+import random
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from leaderboard import Leaderboard
+from score_manager import ScoreManager
+from write_behind import write_behind
+
+
+def test_ranks_top_games_and_player_bests():
+    with tempfile.TemporaryDirectory() as folder:
+        board = Leaderboard(os.path.join(folder, "leaderboard.log"))
+        board.add("ana", 5, 6, 12.0, timestamp=1)
+        board.add("bo", 9, 10, 20.0, timestamp=2)
+        board.add("ana", 7, 8, 15.0, timestamp=3)
+        board.add("cy", 7, 8, 14.0, timestamp=4)
+
+        assert [(entry.player, entry.score) for entry in board.top(3)] == [("bo", 9), ("ana", 7), ("cy", 7)]
+        assert board.rank(9) == 1
+        assert board.rank(7) == 2  # Ties share the best rank
+        assert board.rank(6) == 4
+        assert board.rank(100) == 1
+        assert board.player_best("ana").score == 7
+        assert board.player_best("nobody") is None
+        board.add("dee \ud83d", 1, 2, 3.0, timestamp=5)
+        assert board.player_best("dee \ud83d").player == "dee ?"
+        assert [entry.player for entry in board.top_players()] == ["bo", "ana", "cy", "dee ?"]
+
+        reloaded = Leaderboard(board.path)
+        assert reloaded.top(10) == board.top(10)
+        assert reloaded.bests == board.bests
+        write_behind.flush()
+
+
+def test_compaction_keeps_every_game_by_default():
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "leaderboard.log")
+        board = Leaderboard(path, compact_every=4)
+        for game in range(10):
+            board.add("ana", game % 4, 1, 1.0, timestamp=game)
+        assert len(board) == 10
+        assert board.rank(0) == 8
+        write_behind.flush()
+        assert len(Leaderboard(path)) == 10
+
+
+def test_capped_compaction_keeps_every_players_best_and_sorts_the_log():
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "leaderboard.log")
+        board = Leaderboard(path, max_entries=3, compact_every=5)
+        for score in range(9):
+            board.add("ana", 100 + score, 1, 1.0, timestamp=score)
+        assert board.appends_since_compaction == 4
+        board.add("bo", 1, 1, 1.0, timestamp=9)  # The fifth append since the last compaction
+        # Top three plus bo's only game, which is bo's best
+        assert [entry.score for entry in board.top(10)] == [108, 107, 106, 1]
+        assert board.appends_since_compaction == 0
+
+        write_behind.flush()
+        with open(path) as f:
+            scores = [int(line.split("\t")[0]) for line in f]
+        assert scores == [108, 107, 106, 1]
+        assert Leaderboard(path, max_entries=3).top(10) == board.top(10)
+
+
+def test_load_skips_malformed_lines_and_repairs_the_log():
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "leaderboard.log")
+        with open(path, 'w') as f:
+            f.write("3\t4\t1.000\t1.000\tana\n")
+            f.write("not a game\n")
+            f.write("8\t9\t2.000\t2.000\tbo\tand\ttabs\n")
+            f.write("5\t6\t3.0")  # Cut short by a crash mid-append
+        board = Leaderboard(path)
+        assert [(entry.player, entry.score) for entry in board.top(10)] == [("bo\tand\ttabs", 8), ("ana", 3)]
+        board.add("cy\twith\ttabs", 4, 5, 1.0)
+        assert Leaderboard(path).top(10)[0].player == "bo and tabs"
+        assert len(Leaderboard(path)) == 3
+        write_behind.flush()
+
+
+def test_loads_a_large_compacted_log_quickly():
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "leaderboard.log")
+        with open(path, 'w') as f:
+            f.write("".join(Leaderboard.format_entry(rng.randrange(1000), 5, 10.0, i, f"player{rng.randrange(500)}")
+                            for i in range(100000)))
+        unsorted = Leaderboard(path, compact_every=10 ** 6)
+        assert unsorted.appends_since_compaction > 0
+        scores = [entry.score for entry in unsorted.top(len(unsorted))]
+        assert scores == sorted(scores, reverse=True)
+        unsorted.compact()
+
+        start = time.perf_counter()
+        board = Leaderboard(path)
+        elapsed = time.perf_counter() - start
+        assert len(board) == 100000
+        assert board.neg_scores == unsorted.neg_scores and board.bests == unsorted.bests
+        assert elapsed < 1.0
+        write_behind.flush()
+
+
+def test_background_load_queues_games_until_it_finishes():
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "leaderboard.log")
+        with open(path, 'w') as f:
+            f.write(Leaderboard.format_entry(9, 10, 1.0, 1.0, "ana"))
+        gate = threading.Event()
+        original_load = Leaderboard._load
+        Leaderboard._load = lambda self: (gate.wait(), original_load(self))
+        try:
+            board = Leaderboard(path, background=True)
+            # Recording a game never waits for the load
+            assert board.add("bo", 4, 5, 2.0, timestamp=2) is None
+            assert ScoreManager(os.path.join(folder, "high_score.txt"), leaderboard=board).record_game(
+                "cy", 6, 7, 3.0) is None
+            gate.set()
+            assert board.loaded.wait(5)
+        finally:
+            Leaderboard._load = original_load
+        assert [(entry.player, entry.score) for entry in board.top(10)] == [("ana", 9), ("cy", 6), ("bo", 4)]
+        assert board.add("dee", 5, 6, 1.0).score == 5
+        assert len(Leaderboard(path)) == 4
+        write_behind.flush()
+
+
+def test_compaction_formats_the_log_on_the_writer_thread():
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "leaderboard.log")
+        board = Leaderboard(path)
+        for score in range(5):
+            board.add("ana", score, 1, 1.0, timestamp=score)
+        gate = threading.Event()
+        write_batch = write_behind._write_batch
+        write_behind._write_batch = lambda batch: (gate.wait(), write_batch(batch))
+        try:
+            board.add("bo", 2, 1, 1.0, timestamp=9)  # Might be taken by the writer before compacting
+            board.compact()
+            board.add("cy", 7, 1, 1.0, timestamp=10)  # Changes the index after the snapshot
+        finally:
+            write_behind._write_batch = write_batch
+            gate.set()
+        write_behind.flush()
+        with open(path) as f:
+            lines = f.read().splitlines()
+        assert [int(line.split("\t")[0]) for line in lines] == [4, 3, 2, 2, 1, 0, 7]
+        assert Leaderboard(path).top(10) == board.top(10)
+
+
+def test_score_manager_records_games_on_the_leaderboard():
+    with tempfile.TemporaryDirectory() as folder:
+        manager = ScoreManager(os.path.join(folder, "high_score.txt"),
+                               leaderboard_file=os.path.join(folder, "leaderboard.log"))
+        assert manager.leaderboard is None  # Not loaded until a game finishes
+        assert manager.record_game("ana", 4, 5, 9.5) == 1
+        assert manager.record_game("bo", 6, 7, 11.0) == 1
+        assert manager.record_game("ana", 5, 6, 10.0) == 2
+        shared = manager.get_leaderboard()
+        assert ScoreManager(manager.filename, leaderboard=shared).get_leaderboard() is shared
+        assert shared.player_best("ana").score == 5
+        write_behind.flush()
+
+
+def test_autopilot_games_set_no_high_score_or_rank():
+    from game_engine import GameEngine
+    from snake_game import SnakeGame
+    with tempfile.TemporaryDirectory() as folder:
+        game = SnakeGame()
+        game.player_name = "ana"
+        game.engine = GameEngine(12, 10, seed=1)
+        game.score_manager = ScoreManager(os.path.join(folder, "high_score.txt"),
+                                          leaderboard=Leaderboard(os.path.join(folder, "leaderboard.log")))
+        game.score = 40
+        game.autopilot_used = True
+        assert not game.record_high_score()
+        game.record_leaderboard(30.0)
+        assert game.score_manager.get_high_score() == 0
+        assert len(game.score_manager.get_leaderboard()) == 0
+
+        game.autopilot_used = False
+        assert game.record_high_score()
+        game.record_leaderboard(30.0)
+        assert game.score_manager.get_high_score() == 40
+        assert len(game.score_manager.get_leaderboard()) == 1
+        write_behind.flush()
+
+
+if __name__ == "__main__":
+    test_ranks_top_games_and_player_bests()
+    test_compaction_keeps_every_game_by_default()
+    test_capped_compaction_keeps_every_players_best_and_sorts_the_log()
+    test_load_skips_malformed_lines_and_repairs_the_log()
+    test_loads_a_large_compacted_log_quickly()
+    test_background_load_queues_games_until_it_finishes()
+    test_compaction_formats_the_log_on_the_writer_thread()
+    test_score_manager_records_games_on_the_leaderboard()
+    test_autopilot_games_set_no_high_score_or_rank()
+    print("All leaderboard tests passed")
@@ -0,0 +1,153 @@
+"""
+Check that overlay text is pooled: canvas item count must not grow across
+repeated pauses or game over screens. The headless check uses a fake canvas
+and always runs; the others need a display and are skipped without one.
+"""
+import sys
+import os
+import tkinter as tk
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from game_display import GameDisplay, TextLayer
+from game_engine import GameEngine
+
+
+def has_display():
+    try:
+        root = tk.Tk()
+        root.destroy()
+        return True
+    except tk.TclError:
+        return False
+
+
+requires_display = pytest.mark.skipif(not has_display(), reason="no display available")
+
+
+def start_display():
+    """Set up a game screen the way SnakeGame.run_game does"""
+    display = GameDisplay(render_mode="canvas")
+    display.setup_screen()
+    display.setup_board(29, 29)
+    display.create_score_display()
+    display.create_high_score_display()
+    display.update_score(0)
+    display.update_high_score_display(0)
+    display.render(GameEngine(29, 29).snapshot())
+    display.update()
+    return display
+
+
+def canvas_item_count(display):
+    return len(display.window.getcanvas().find_all())
+
+
+@requires_display
+def test_pause_resume_cycles_do_not_leak_items():
+    display = start_display()
+    display.show_pause_message()
+    display.hide_pause_message()
+    baseline = canvas_item_count(display)
+    for _ in range(1000):
+        display.show_pause_message()
+        display.hide_pause_message()
+    assert canvas_item_count(display) == baseline
+    display.window.clear()
+
+
+@requires_display
+def test_game_over_cycles_do_not_leak_items():
+    # One canvas for every game: a leaking overlay would pile up items here
+    display = start_display()
+    display.show_game_over(0, 100, is_new_record=True, wait_for_click=False)
+    display.hide_game_over()
+    baseline = canvas_item_count(display)
+    for game in range(100):
+        display.update_score(game)
+        display.update_high_score_display(max(game, 100))
+        display.show_pause_message()
+        display.show_game_over(game, 100, is_new_record=game % 2 == 0, wait_for_click=False)
+        display.hide_game_over()
+        assert canvas_item_count(display) == baseline, f"canvas grew after game {game}"
+    display.window.clear()
+
+
+class FakeCanvas:
+    """Counts the text items a TextLayer creates and deletes, without Tk"""
+    def __init__(self):
+        self.items = {}
+        self.created = 0
+        self.deleted = 0
+
+    def create_text(self, x, y, **options):
+        self.created += 1
+        self.items[self.created] = options
+        return self.created
+
+    def itemconfigure(self, item, **options):
+        self.items[item].update(options)
+
+    def tag_raise(self, item):
+        assert item in self.items
+
+    def delete(self, *items):
+        for item in items:
+            self.deleted += 1
+            del self.items[item]
+
+    def find_all(self):
+        return tuple(self.items)
+
+
+class FakeScreen:
+    def __init__(self, canvas):
+        self.canvas = canvas
+
+    def getcanvas(self):
+        return self.canvas
+
+    def update(self):
+        pass
+
+
+def fake_display(canvas):
+    """Build the overlay side of a game screen the way setup_screen does, on a fake canvas"""
+    display = GameDisplay(render_mode="canvas")
+    display.window = FakeScreen(canvas)
+    display.text_layer = TextLayer(canvas, display.WINDOW_WIDTH, display.WINDOW_HEIGHT)
+    return display
+
+
+def test_overlays_never_create_items_across_game_setups_headless():
+    # Runs everywhere: the canvas is never cleared, so every item ever created stays counted
+    canvas = FakeCanvas()
+    slots = len(TextLayer.SLOTS)
+    for game in range(100):
+        display = fake_display(canvas)
+        assert canvas.created == (game + 1) * slots
+        display.create_score_display()
+        display.create_high_score_display()
+        for score in range(20):
+            display.update_score(score)
+            display.show_pause_message()
+            display.hide_pause_message()
+            display.show_hud(f"tick {score}")
+        display.hide_hud()
+        display.update_high_score_display(game)
+        display.show_game_over(game, 100, is_new_record=game % 2 == 0, wait_for_click=False)
+        display.hide_game_over()
+        assert canvas.created == (game + 1) * slots, f"game {game} created overlay items"
+        assert len(canvas.find_all()) == (game + 1) * slots and canvas.deleted == 0
+
+
+if __name__ == "__main__":
+    test_overlays_never_create_items_across_game_setups_headless()
+    if has_display():
+        test_pause_resume_cycles_do_not_leak_items()
+        test_game_over_cycles_do_not_leak_items()
+        print("Overlay pool checks passed")
+    else:
+        print("No display available - overlay pool checks skipped")
@@ -0,0 +1,61 @@
+"""
+Tests for the performance HUD counters using a simulated clock
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from perf_hud import PerfHud
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_refresh_is_throttled_and_summarises_the_window():
+    clock = FakeClock()
+    hud = PerfHud(clock=clock)
+    hud.toggle()
+    counted = []
+
+    def count_items():
+        counted.append(True)
+        return 42
+
+    texts = []
+    # 8 ticks per second for one second, each 5ms late and taking 2ms to draw
+    for _ in range(8):
+        clock.now += 0.125
+        hud.add_tick(0.005)
+        hud.add_render_time(0.002)
+        hud.end_frame()
+        text = hud.refresh(0.125, count_items, 7)
+        if text:
+            texts.append(text)
+    assert len(texts) == 2
+    assert len(counted) == 2  # Items are only counted when the text is due
+    assert "TPS   8.0 / 8.0" in texts[0]
+    assert "Jitter avg  5.0ms" in texts[0]
+    assert "Render avg  2.00ms" in texts[0]
+    assert "Items 42  Length 7" in texts[0]
+
+
+def test_toggle_resets_the_window():
+    clock = FakeClock()
+    hud = PerfHud(clock=clock)
+    assert hud.toggle()
+    hud.add_tick(0.5)
+    assert not hud.toggle()
+    assert hud.toggle()
+    assert hud.ticks == 0 and hud.lateness_max == 0.0
+
+
+if __name__ == "__main__":
+    test_refresh_is_throttled_and_summarises_the_window()
+    test_toggle_resets_the_window()
+    print("All performance HUD tests passed")
@@ -0,0 +1,114 @@
+"""
+Tests for the per-phase frame timer using a simulated clock
+"""
+import sys
+import os
+import json
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from phase_timer import PhaseTimer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def run_frame(timer, clock, step_ms, render_ms):
+    timer.begin()
+    clock.now += step_ms / 1000
+    timer.lap("step")
+    clock.now += render_ms / 1000
+    timer.lap("render")
+    timer.end()
+
+
+def test_laps_are_charged_to_phases():
+    clock = FakeClock()
+    timer = PhaseTimer(("step", "render", "lateness"), clock=clock)
+    for frame in range(100):
+        timer.record("lateness", 0.002)
+        run_frame(timer, clock, step_ms=1 + frame % 10, render_ms=3)
+    stats = timer.stats()
+    assert abs(stats["render"]["p99_ms"] - 3) < 1e-6
+    assert abs(stats["lateness"]["p50_ms"] - 2) < 1e-6
+    assert abs(stats["step"]["max_ms"] - 10) < 1e-6
+    assert abs(stats["step"]["p50_ms"] - 6) < 1e-6
+
+
+def test_ring_buffer_keeps_only_recent_frames():
+    clock = FakeClock()
+    timer = PhaseTimer(("step", "render"), capacity=8, clock=clock)
+    for frame in range(20):
+        run_frame(timer, clock, step_ms=frame, render_ms=0)
+    assert timer.frames == 20
+    assert [round(s * 1000) for s in timer.recent("step")] == list(range(12, 20))
+
+
+def test_disabled_timer_records_nothing():
+    clock = FakeClock()
+    timer = PhaseTimer(("step", "render"), enabled=False, clock=clock)
+    run_frame(timer, clock, step_ms=5, render_ms=5)
+    assert timer.frames == 0
+    timer.set_enabled(True)
+    run_frame(timer, clock, step_ms=5, render_ms=5)
+    assert timer.frames == 1
+
+
+def test_dump_writes_stats_and_samples():
+    clock = FakeClock()
+    timer = PhaseTimer(("step", "render"), clock=clock)
+    for _ in range(5):
+        run_frame(timer, clock, step_ms=2, render_ms=1)
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "timings.json")
+        timer.dump(path)
+        with open(path) as f:
+            report = json.load(f)
+    assert report["frames"] == 5
+    assert report["samples_ms"]["step"] == [2.0] * 5
+    assert abs(report["stats"]["render"]["p95_ms"] - 1) < 1e-6
+
+
+def test_discarded_frames_leave_no_samples():
+    clock = FakeClock()
+    timer = PhaseTimer(("step", "render"), clock=clock)
+    run_frame(timer, clock, step_ms=4, render_ms=2)
+    for _ in range(50):  # Paused: only the redraw is timed, then thrown away
+        timer.begin()
+        clock.now += 0.001
+        timer.lap("render")
+        timer.discard()
+    run_frame(timer, clock, step_ms=4, render_ms=2)
+    assert timer.frames == 2 and timer.discarded == 50
+    assert [round(s * 1000, 6) for s in timer.recent("step")] == [4.0, 4.0]
+    assert abs(timer.stats()["render"]["p50_ms"] - 2) < 1e-6
+
+
+def test_profile_dump_survives_an_unwritable_folder():
+    from game_engine import GameEngine
+    from snake_game import SnakeGame
+    with tempfile.TemporaryDirectory() as folder:
+        blocker = os.path.join(folder, "not_a_directory")
+        with open(blocker, 'w') as f:
+            f.write("")
+        game = SnakeGame()
+        game.engine = GameEngine(12, 10, seed=1)
+        game.PROFILE_DIR = os.path.join(blocker, "profiles")
+        game.dump_phase_timings()  # Reports the failure instead of raising
+        assert os.listdir(folder) == ["not_a_directory"]
+
+
+if __name__ == "__main__":
+    test_laps_are_charged_to_phases()
+    test_ring_buffer_keeps_only_recent_frames()
+    test_disabled_timer_records_nothing()
+    test_dump_writes_stats_and_samples()
+    test_discarded_frames_leave_no_samples()
+    test_profile_dump_survives_an_unwritable_folder()
+    print("All phase timer tests passed")
@@ -0,0 +1,239 @@
+"""
+Tests for seeded game recordings and headless replays
+"""
+import sys
+import os
+import random
+import struct
+import tempfile
+import zlib
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from game_engine import GameEngine
+from replay import GameRecording, simulate, tick_limit, verify
+from replay_file import ReplayFormatError, ReplayReader, ReplayWriter, TAG_END, TAG_KEYFRAME, encode_header
+from verify_replays import verify_directory, verify_file
+
+
+def play_random_game(seed, width=12, height=10, points_per_food=1):
+    """Play a game with random but mostly safe inputs so the snake scores"""
+    engine = GameEngine(width, height, points_per_food, seed=seed)
+    rng = random.Random(seed + 1)
+    while not engine.game_over:
+        head_x, head_y = engine.snake.head
+        food_x, food_y = engine.food.get_position()
+        safe = []
+        for direction, (dx, dy) in engine.snake.DIRECTION_STEPS.items():
+            if direction == engine.snake.OPPOSITE_DIRECTIONS[engine.snake.direction]:
+                continue
+            cell = (head_x + dx, head_y + dy)
+            if engine.board.in_bounds(cell) and not engine.board.is_occupied(cell):
+                # Prefer moves towards the food
+                closer = abs(cell[0] - food_x) + abs(cell[1] - food_y) < abs(head_x - food_x) + abs(head_y - food_y)
+                safe.extend([direction] * (3 if closer else 1))
+        if safe:
+            engine.change_direction(rng.choice(safe))
+        engine.step()
+    return engine
+
+
+def test_replay_reproduces_final_score_and_length():
+    for seed in range(50):
+        engine = play_random_game(seed)
+        recording = GameRecording.from_engine(engine, "tester")
+        replayed = simulate(recording)
+        assert replayed.score == engine.score
+        assert list(replayed.snake.body) == list(engine.snake.body)
+        assert replayed.tick == engine.tick
+        assert verify(recording)
+
+
+def test_tampered_score_fails_verification():
+    recording = GameRecording.from_engine(play_random_game(3))
+    recording.final_score += 5
+    assert not verify(recording)
+
+
+def test_header_rules_the_client_cannot_choose_are_checked():
+    with tempfile.TemporaryDirectory() as folder:
+        # Inflated points per food with a score to match the simulation
+        engine = play_random_game(5, points_per_food=255)
+        assert engine.score > 0
+        GameRecording.from_engine(engine, "tester").save_replay_file(os.path.join(folder, "points.snkr"))
+        # Pramita really does earn double
+        engine = play_random_game(5, points_per_food=2)
+        GameRecording.from_engine(engine, "PRAMITA").save_replay_file(os.path.join(folder, "pramita.snkr"))
+        # Circles without eating and claims to run for a billion ticks
+        turns = [(tick, ["north", "west", "south", "east"][(tick // 4 - 1) % 4]) for tick in range(4, 4000, 4)]
+        endless = GameRecording(21, 12, 10, inputs=turns, final_tick=10 ** 9, player_name="tester")
+        endless.save_replay_file(os.path.join(folder, "endless.snkr"))
+
+        assert "points per food" in verify_file(os.path.join(folder, "points.snkr"))["error"]
+        assert verify_file(os.path.join(folder, "pramita.snkr"))["ok"]
+        assert "ticks" in verify_file(os.path.join(folder, "endless.snkr"))["error"]
+    replayed = simulate(endless)
+    assert not replayed.game_over and replayed.tick == tick_limit(endless) < 10 ** 9
+    assert not verify(endless)
+
+
+def test_save_and_load_round_trip():
+    recording = GameRecording.from_engine(play_random_game(8, points_per_food=2), "Pramita")
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "game.json")
+        recording.save(path)
+        loaded = GameRecording.load(path)
+    assert loaded.to_dict() == recording.to_dict()
+    assert verify(loaded)
+
+
+def test_streamed_replay_file_round_trip_and_seek():
+    engine = GameEngine(12, 10, seed=21)
+    rng = random.Random(4)
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "game.snkr")
+        writer = ReplayWriter(path, engine.seed, engine.width, engine.height, player_name="tester")
+        writer.KEYFRAME_INTERVAL = 8
+        # Keep the snake alive on a loop so the game spans many keyframes
+        for tick in range(1, 200):
+            if tick % 4 == 0:
+                engine.change_direction(["north", "west", "south", "east"][(tick // 4 - 1) % 4])
+            engine.step()
+            writer.on_tick(engine)
+        writer.close(engine)
+
+        reader = ReplayReader(path)
+        assert reader.verify_checksum()
+        assert reader.header["player_name"] == "tester"
+        assert len(reader.keyframes) > 10
+        # A couple of bytes per direction change, far below a byte per tick
+        assert os.path.getsize(path) < 200 + 3 * len(engine.inputs)
+
+        all_inputs = [record[1:] for record in reader.records() if record[0] == "input"]
+        assert all_inputs == engine.inputs
+        keyframe_tick = max(tick for tick, _ in reader.keyframes if tick <= 100)
+        from_tick = [record[1:] for record in reader.seek(100) if record[0] == "input"]
+        assert from_tick == [entry for entry in engine.inputs if entry[0] > keyframe_tick]
+        first_keyframe = reader.keyframes[0][0]
+        assert [record[1:] for record in reader.seek(first_keyframe - 1) if record[0] == "input"] == all_inputs
+        assert next(iter(reader.seek(first_keyframe)))[:2] == ("keyframe", first_keyframe)
+
+        loaded = GameRecording.load(path)
+        assert loaded.inputs == engine.inputs
+        assert loaded.final_score == engine.score
+
+        with open(path, 'r+b') as f:
+            f.seek(30)
+            byte = f.read(1)
+            f.seek(30)
+            f.write(bytes([byte[0] ^ 0xFF]))
+        try:
+            GameRecording.load(path)
+        except ReplayFormatError:
+            pass
+        else:
+            raise AssertionError("corrupted replay should fail its checksum")
+
+
+def test_parallel_verification_flags_tampered_replays():
+    with tempfile.TemporaryDirectory() as folder:
+        for seed in range(12):
+            recording = GameRecording.from_engine(play_random_game(seed), f"player{seed}")
+            if seed in (2, 7):
+                recording.final_score += 3
+            recording.save_replay_file(os.path.join(folder, f"{seed}.snkr"))
+        with open(os.path.join(folder, "broken.snkr"), 'wb') as f:
+            f.write(b"SNKR\x01")
+
+        summary = verify_directory(folder, workers=2)
+    assert summary["replays"] == 13
+    assert summary["verified"] == 10
+    assert sorted(os.path.basename(result["path"]) for result in summary["flagged"]) == ["2.snkr", "7.snkr"]
+    assert len(summary["errors"]) == 1
+    assert summary["ticks_per_sec"] > 0
+
+
+def write_raw_replay(path, header, records):
+    """Write header and record bytes with an empty index and a valid checksum"""
+    body = header + bytes(records) + b"\x00"  # No keyframes in the index
+    body += struct.pack("<I", len(header) + len(records))
+    with open(path, 'wb') as f:
+        f.write(body + struct.pack("<I", zlib.crc32(body)) + b"SNKE")
+
+
+def test_malformed_replays_with_valid_checksums_are_reported_per_file():
+    with tempfile.TemporaryDirectory() as folder:
+        GameRecording.from_engine(play_random_game(1), "fine").save_replay_file(os.path.join(folder, "ok.snkr"))
+        # Keyframe with direction code 7, then an end record
+        write_raw_replay(os.path.join(folder, "direction.snkr"), encode_header(1, 12, 10, 1),
+                         [TAG_KEYFRAME, 5, 7, 0, 1, TAG_END, 5, 0, 1])
+        write_raw_replay(os.path.join(folder, "empty_board.snkr"), encode_header(1, 0, 0, 1), [TAG_END, 0, 0, 1])
+        write_raw_replay(os.path.join(folder, "old_rules.snkr"), encode_header(1, 12, 10, 1, rules_version="0.1.0"),
+                         [TAG_END, 0, 0, 1])
+        # Decodes fine but names a direction the engine does not know
+        bad_json = GameRecording(1, 12, 10, inputs=[(1, "up")], final_tick=3)
+        bad_json.save(os.path.join(folder, "bad_input.json"))
+
+        for name in ("direction.snkr", "empty_board.snkr"):
+            try:
+                GameRecording.load(os.path.join(folder, name))
+            except ReplayFormatError:
+                pass
+            else:
+                raise AssertionError(f"{name} should be rejected by the decoder")
+        assert "0.1.0" in verify_file(os.path.join(folder, "old_rules.snkr"), rules_version="1.0.0")["error"]
+
+        summary = verify_directory(folder, workers=2)
+    assert summary["verified"] == 1
+    assert sorted(os.path.basename(result["path"]) for result in summary["errors"]) == [
+        "bad_input.json", "direction.snkr", "empty_board.snkr", "old_rules.snkr"]
+
+
+def test_bundled_exe_stamps_replays_with_its_own_version():
+    from replay_file import read_rules_version
+    working_directory = os.getcwd()
+    with tempfile.TemporaryDirectory() as bundle, tempfile.TemporaryDirectory() as elsewhere:
+        with open(os.path.join(bundle, "version.json"), 'w') as f:
+            f.write('{"version": "9.8.7"}')
+        # The exe runs from any folder and finds version.json only in its bundle
+        sys._MEIPASS = bundle
+        os.chdir(elsewhere)
+        try:
+            assert read_rules_version() == "9.8.7"
+            assert b"9.8.7" in encode_header(1, 12, 10, 1)
+        finally:
+            os.chdir(working_directory)
+            del sys._MEIPASS
+
+
+def test_game_plays_on_without_a_replay_when_it_cannot_write_one():
+    from snake_game import SnakeGame
+    with tempfile.TemporaryDirectory() as folder:
+        blocker = os.path.join(folder, "not_a_directory")
+        with open(blocker, 'w') as f:
+            f.write("")
+        try:
+            ReplayWriter(os.path.join(blocker, "game.snkr"), 1, 12, 10)
+        except OSError:
+            pass
+        else:
+            raise AssertionError("an unwritable replay path should raise OSError")
+
+        game = SnakeGame()
+        game.engine = GameEngine(12, 10, seed=1)
+        game.REPLAY_DIR = os.path.join(blocker, "replays")
+        game.start_replay()
+        assert game.replay_writer is None
+
+
+if __name__ == "__main__":
+    test_replay_reproduces_final_score_and_length()
+    test_tampered_score_fails_verification()
+    test_header_rules_the_client_cannot_choose_are_checked()
+    test_save_and_load_round_trip()
+    test_streamed_replay_file_round_trip_and_seek()
+    test_parallel_verification_flags_tampered_replays()
+    test_malformed_replays_with_valid_checksums_are_reported_per_file()
+    test_bundled_exe_stamps_replays_with_its_own_version()
+    test_game_plays_on_without_a_replay_when_it_cannot_write_one()
+    print("All replay tests passed")
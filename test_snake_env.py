@@ -0,0 +1,69 @@
+"""
+Tests for the reset/step environment and its in-place observation buffer
+"""
+import sys
+import os
+import random
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+
+from snake_env import SnakeEnv
+
+
+def expected_grid(env):
+    engine = env.engine
+    grid = np.zeros((engine.height, engine.width), dtype=np.uint8)
+    for x, y in engine.snake.body:
+        grid[y, x] = SnakeEnv.BODY
+    head_x, head_y = engine.snake.head
+    grid[head_y, head_x] = SnakeEnv.HEAD
+    food_x, food_y = engine.food.get_position()
+    grid[food_y, food_x] = SnakeEnv.FOOD
+    return grid
+
+
+def test_observation_updated_in_place():
+    env = SnakeEnv(10, 8)
+    rng = random.Random(2)
+    for episode in range(20):
+        observation = env.reset(seed=episode)
+        done = False
+        while not done:
+            action = rng.choice([None, 0, 1, 2, 3])
+            step_observation, reward, done, info = env.step(action)
+            assert step_observation is observation
+            if not done:
+                assert np.array_equal(observation, expected_grid(env))
+        assert reward == SnakeEnv.DEATH_REWARD or info["reason"] == "board_full"
+
+
+def test_same_seed_same_game():
+    def play(seed):
+        env = SnakeEnv(10, 8)
+        env.reset(seed)
+        rng = random.Random(0)
+        done = False
+        while not done:
+            _, _, done, info = env.step(rng.choice([None, 0, 1, 2, 3]))
+        return info
+
+    assert play(11) == play(11)
+
+
+def test_observation_is_read_only():
+    env = SnakeEnv()
+    observation = env.reset()
+    try:
+        observation[0, 0] = 1
+    except ValueError:
+        return
+    raise AssertionError("observation buffer should not be writable")
+
+
+if __name__ == "__main__":
+    test_observation_updated_in_place()
+    test_same_seed_same_game()
+    test_observation_is_read_only()
+    print("All environment tests passed")
@@ -0,0 +1,281 @@
+"""
+Tests for background audio start-up, using a fake mixer so no device is needed
+"""
+import sys
+import os
+import tempfile
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pygame
+
+import sound_manager
+from sound_manager import AudioDevice, SoundManager
+from sound_synth import PcmCache
+
+
+class FakeSound:
+    def __init__(self, buffer=b""):
+        self.buffer = buffer
+        self.plays = 0
+        self.volume = 1.0
+
+    def set_volume(self, volume):
+        self.volume = volume
+
+    def play(self):
+        self.plays += 1
+
+
+class FakeChannel:
+    def __init__(self, index):
+        self.index = index
+        self.busy = False
+        self.sound = None
+
+    def get_busy(self):
+        return self.busy
+
+    def play(self, sound):
+        self.busy = True
+        self.sound = sound
+        sound.play()
+
+
+class FakeSoundManager(SoundManager):
+    def load_sounds(self):
+        self.sounds = {name: FakeSound() for name in self.SOUND_VOICES}
+
+
+def with_fake_mixer(test, init=lambda **kwargs: None):
+    """Run test(calls) with a fresh shared device and a fake mixer"""
+    calls = {"init": 0, "quit": 0}
+
+    def fake_init(**kwargs):
+        calls["init"] += 1
+        init(**kwargs)
+
+    def fake_quit():
+        calls["quit"] += 1
+
+    channels = {}
+
+    def fake_channel(index):
+        return channels.setdefault(index, FakeChannel(index))
+
+    fakes = {
+        "init": fake_init,
+        "quit": fake_quit,
+        "set_num_channels": lambda count: None,
+        "set_reserved": lambda count: None,
+        "Channel": fake_channel,
+        "find_channel": lambda: fake_channel(99),
+        "get_init": lambda: (22050, -16, 2),
+        "Sound": FakeSound,
+    }
+    saved = (sound_manager.audio_device, sound_manager.pcm_cache)
+    saved_mixer = {name: getattr(pygame.mixer, name) for name in fakes}
+    sound_manager.audio_device = AudioDevice()
+    for name, fake in fakes.items():
+        setattr(pygame.mixer, name, fake)
+    try:
+        with tempfile.TemporaryDirectory() as folder:
+            sound_manager.pcm_cache = PcmCache(folder)
+            test(calls)
+    finally:
+        sound_manager.audio_device, sound_manager.pcm_cache = saved
+        for name, original in saved_mixer.items():
+            setattr(pygame.mixer, name, original)
+
+
+def test_sounds_are_skipped_until_the_device_is_ready():
+    release = threading.Event()
+
+    def test(calls):
+        manager = FakeSoundManager()
+        # The constructor returned while the device is still opening
+        manager.play_eat_sound()
+        assert manager.status()["skipped_plays"] == 1
+        release.set()
+        assert manager.ready.wait(5)
+        manager.play_eat_sound()
+        assert manager.sounds["eat"].plays == 1
+        assert manager.status()["ready"]
+        assert manager.status()["ready_ms"] is not None
+
+    with_fake_mixer(test, init=lambda **kwargs: release.wait(5))
+
+
+def test_device_is_opened_once_per_process():
+    def test(calls):
+        for _ in range(3):
+            manager = FakeSoundManager()
+            assert manager.ready.wait(5)
+            manager.cleanup()
+            assert not manager.sounds_enabled
+        assert calls == {"init": 1, "quit": 0}
+
+    with_fake_mixer(test)
+
+
+def test_cleanup_while_starting_keeps_sound_disabled():
+    release = threading.Event()
+
+    def test(calls):
+        manager = FakeSoundManager()
+        manager.cleanup()  # The game ended before the device finished opening
+        release.set()
+        assert manager.ready.wait(5)
+        assert not manager.sounds_enabled and manager.sounds == {}
+        manager.play_eat_sound()
+        assert manager.status()["skipped_plays"] == 1
+
+    with_fake_mixer(test, init=lambda **kwargs: release.wait(5))
+
+
+def test_missing_device_leaves_sound_disabled():
+    def fail(**kwargs):
+        raise pygame.error("no audio device")
+
+    def test(calls):
+        manager = FakeSoundManager()
+        assert manager.ready.wait(5)
+        manager.play_eat_sound()
+        status = manager.status()
+        assert not status["ready"] and not status["device_available"]
+        assert status["skipped_plays"] == 1
+
+    with_fake_mixer(test, init=fail)
+
+
+def test_eat_bursts_steal_the_oldest_effect_voice():
+    def test(calls):
+        manager = FakeSoundManager(background=False)
+        device = sound_manager.audio_device
+        pool = [channel for _, channel in device.pools["effects"]]
+        for _ in range(len(pool) + 2):
+            manager.play_eat_sound()
+        assert manager.sounds["eat"].plays == len(pool) + 2
+        assert manager.dropped_plays == 0
+        # Alert channels were never touched by the burst
+        assert not any(channel.busy for _, channel in device.pools["alerts"])
+        assert device.latency_stats()["triggers"] == len(pool) + 2
+
+    with_fake_mixer(test)
+
+
+def test_lower_priority_sounds_cannot_steal_game_over():
+    def test(calls):
+        manager = FakeSoundManager(background=False)
+        for _ in range(sound_manager.AudioDevice.CHANNEL_POOLS["alerts"]):
+            manager.play_game_over_sound()
+        manager.play_new_record_sound()
+        assert manager.sounds["new_record"].plays == 0
+        assert manager.dropped_plays == 1
+        manager.play_game_over_sound()
+        assert manager.sounds["game_over"].plays == 3
+
+    with_fake_mixer(test)
+
+
+def test_latency_profile_sets_the_device_buffer():
+    opened = []
+
+    def test(calls):
+        manager = FakeSoundManager(background=False, profile="balanced")
+        assert opened == [{"frequency": 22050, "size": -16, "channels": 2, "buffer": 512}]
+        assert manager.status()["latency"]["buffer_ms"] == 512 / 22050 * 1000
+
+    with_fake_mixer(test, init=lambda **kwargs: opened.append(kwargs))
+
+
+def wait_for_variants(manager):
+    for _ in range(500):
+        if not manager.variant_stats()["pending"]:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError("prewarm worker did not finish")
+
+
+def test_eat_variants_are_prewarmed_off_thread():
+    def test(calls):
+        manager = FakeSoundManager(background=False)
+        manager.prewarm_eat_variants(0, 0.1)
+        wait_for_variants(manager)
+
+        manager.play_eat_sound(3, 0.1)
+        assert manager.variant_stats()["hits"] == 1
+        played = manager.variants[(0, 100)]
+        assert played.plays == 1
+        # Higher scores are pitched up: 10 points is two semitones
+        wait_for_variants(manager)
+        manager.play_eat_sound(10, 0.09)
+        assert manager.variants[(2, 90)].plays == 1
+        assert manager.variant_stats()["misses"] == 0
+        manager.cleanup()
+
+    with_fake_mixer(test)
+
+
+def test_uncached_variant_falls_back_and_is_synthesized_later():
+    def test(calls):
+        manager = FakeSoundManager(background=False)
+        manager.play_eat_sound(40, 0.05)
+        assert manager.variant_stats()["misses"] == 1
+        assert manager.sounds["eat"].plays == 1
+        wait_for_variants(manager)
+        manager.play_eat_sound(40, 0.05)
+        assert manager.variant_stats()["hits"] == 1
+        manager.cleanup()
+
+    with_fake_mixer(test)
+
+
+def test_variant_cache_evicts_least_recently_used():
+    def test(calls):
+        manager = FakeSoundManager(background=False)
+        manager.VARIANT_CACHE_SIZE = 4
+        manager.PREWARM_STEPS = 0
+        for score in range(0, 40, 5):
+            manager.prewarm_eat_variants(score, 0.1)
+            wait_for_variants(manager)
+        stats = manager.variant_stats()
+        assert stats["cached"] == 4
+        assert stats["evictions"] > 0
+        assert (7, 100) in manager.variants and (0, 100) not in manager.variants
+        manager.cleanup()
+
+    with_fake_mixer(test)
+
+
+def test_volume_applies_to_cached_and_later_variants():
+    def test(calls):
+        manager = FakeSoundManager(background=False)
+        manager.PREWARM_STEPS = 0
+        manager.prewarm_eat_variants(0, 0.1)
+        wait_for_variants(manager)
+        manager.set_volume(0.25)
+        assert manager.sounds["eat"].volume == 0.25
+        assert manager.variants[(0, 100)].volume == 0.25
+        manager.prewarm_eat_variants(20, 0.1)
+        wait_for_variants(manager)
+        assert manager.variants[(4, 100)].volume == 0.25
+        manager.cleanup()
+
+    with_fake_mixer(test)
+
+
+if __name__ == "__main__":
+    test_sounds_are_skipped_until_the_device_is_ready()
+    test_device_is_opened_once_per_process()
+    test_cleanup_while_starting_keeps_sound_disabled()
+    test_missing_device_leaves_sound_disabled()
+    test_eat_bursts_steal_the_oldest_effect_voice()
+    test_lower_priority_sounds_cannot_steal_game_over()
+    test_latency_profile_sets_the_device_buffer()
+    test_eat_variants_are_prewarmed_off_thread()
+    test_uncached_variant_falls_back_and_is_synthesized_later()
+    test_variant_cache_evicts_least_recently_used()
+    test_volume_applies_to_cached_and_later_variants()
+    print("All sound manager tests passed")
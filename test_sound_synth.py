@@ -0,0 +1,78 @@
+"""
+Tests for vectorized tone synthesis and the PCM caches
+"""
+import sys
+import os
+import tempfile
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sound_synth import PcmCache, synthesize
+
+
+def reference_beep(frequency, duration, sample_rate=22050):
+    """The original per-sample loop from SoundManager.create_beep_sound"""
+    frames = int(duration * sample_rate)
+    arr = np.zeros((frames, 2), dtype=np.float32)
+    for i in range(frames):
+        sample = np.sin(2 * np.pi * frequency * i / sample_rate)
+        fade_frames = int(0.01 * sample_rate)
+        if i >= frames - fade_frames:
+            sample *= (frames - i) / fade_frames
+        arr[i, 0] = sample
+        arr[i, 1] = sample
+    return (arr * 32767).astype(np.int16)
+
+
+def test_vectorized_sine_matches_the_original_loop():
+    for frequency, duration in ((800, 0.1), (200, 0.3)):
+        pcm = synthesize("sine", frequency, duration, 22050, ("fade_out", 0.01))
+        samples = np.frombuffer(pcm, dtype=np.int16).reshape(-1, 2)
+        assert np.abs(samples.astype(int) - reference_beep(frequency, duration)).max() <= 1
+
+
+def test_other_waveforms_stay_in_range():
+    for waveform in ("square", "triangle", "sawtooth"):
+        samples = np.frombuffer(synthesize(waveform, 440, 0.05, 8000, channels=1), dtype=np.int16)
+        assert len(samples) == 400
+        assert samples.max() > 30000 and samples.min() < -30000
+
+
+def test_repeat_requests_are_served_from_the_caches():
+    with tempfile.TemporaryDirectory() as folder:
+        cache = PcmCache(folder)
+        first = cache.get("sine", 800, 0.1, 22050, ("fade_out", 0.01))
+        again = cache.get("sine", 800, 0.1, 22050, ("fade_out", 0.01))
+        assert again is first
+        assert (cache.misses, cache.hits) == (1, 1)
+
+        # A new process starts with an empty memory cache but finds the file
+        fresh = PcmCache(folder)
+        assert fresh.get("sine", 800, 0.1, 22050, ("fade_out", 0.01)) == first
+        assert (fresh.misses, fresh.disk_hits) == (0, 1)
+
+        # A different key is a different sound
+        assert fresh.get("sine", 800, 0.1, 44100, ("fade_out", 0.01)) != first
+        assert fresh.misses == 1
+
+
+def test_truncated_cache_file_is_rebuilt():
+    with tempfile.TemporaryDirectory() as folder:
+        cache = PcmCache(folder)
+        pcm = cache.get("sine", 200, 0.3, 22050)
+        path = os.path.join(folder, os.listdir(folder)[0])
+        with open(path, 'r+b') as f:
+            f.truncate(100)
+        fresh = PcmCache(folder)
+        assert fresh.get("sine", 200, 0.3, 22050) == pcm
+        assert fresh.misses == 1
+
+
+if __name__ == "__main__":
+    test_vectorized_sine_matches_the_original_loop()
+    test_other_waveforms_stay_in_range()
+    test_repeat_requests_are_served_from_the_caches()
+    test_truncated_cache_file_is_rebuilt()
+    print("All sound synthesis tests passed")
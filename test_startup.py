@@ -0,0 +1,21 @@
+"""
+Check that launching the game defers its heavy imports until they are needed
+"""
+import sys
+import os
+import subprocess
+
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_heavy_modules_are_not_imported_at_startup():
+    code = ("import sys, snake_game; "
+            "print(' '.join(m for m in ('pygame', 'numpy', 'update_system', 'sound_manager') if m in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", code], cwd=GAME_DIR, capture_output=True,
+                            text=True, check=True).stdout
+    assert output.strip() == ""
+
+
+if __name__ == "__main__":
+    test_heavy_modules_are_not_imported_at_startup()
+    print("Startup import check passed")
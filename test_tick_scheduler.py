@@ -0,0 +1,86 @@
+"""
+Tests for the fixed-timestep scheduler using a simulated clock
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from tick_scheduler import TickScheduler
+
+
+class FakeTimers:
+    """Stands in for Tk's timer queue and the monotonic clock"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.pending = None
+
+    def clock(self):
+        return self.now
+
+    def schedule(self, callback, delay_ms):
+        self.pending = (self.now + delay_ms / 1000, callback)
+
+    def run(self, until, work_time=0.0):
+        """Fire timers until the given time; each callback costs work_time"""
+        while self.pending and self.pending[0] <= until:
+            due, callback = self.pending
+            self.pending = None
+            self.now = max(self.now, due)
+            callback()
+            self.now += work_time
+
+
+def test_tick_rate_does_not_drift_with_work():
+    timers = FakeTimers()
+    ticks = []
+    scheduler = TickScheduler(timers.schedule, lambda: ticks.append(timers.now) and False,
+                              lambda: None, lambda: 0.03, clock=timers.clock)
+    scheduler.start()
+    # Each callback takes 10ms of simulated work; the period must still be 30ms
+    timers.run(until=3.0, work_time=0.01)
+    assert 99 <= scheduler.ticks_run <= 100
+    assert scheduler.ticks_skipped == 0
+
+
+def test_catch_up_then_skip_when_far_behind():
+    timers = FakeTimers()
+    scheduler = TickScheduler(timers.schedule, lambda: False, lambda: None,
+                              lambda: 0.1, max_catch_up=3, clock=timers.clock)
+    scheduler.start()
+    # Stall for a full second: 3 ticks are caught up, the rest are dropped
+    timers.now = 1.05
+    timers.run(until=1.05)
+    assert scheduler.ticks_run == 3
+    assert scheduler.ticks_skipped == 7
+    assert scheduler.next_tick_time > timers.now
+
+
+def test_stops_when_tick_reports_game_over():
+    timers = FakeTimers()
+    scheduler = TickScheduler(timers.schedule, lambda: True, lambda: None,
+                              lambda: 0.05, clock=timers.clock)
+    scheduler.start()
+    timers.run(until=1.0)
+    assert scheduler.ticks_run == 1
+    assert not scheduler.running
+
+
+def test_reports_lateness_of_each_tick():
+    timers = FakeTimers()
+    lateness = []
+    scheduler = TickScheduler(timers.schedule, lambda: False, lambda: None, lambda: 0.1,
+                              max_catch_up=3, clock=timers.clock, on_lateness=lateness.append)
+    scheduler.start()
+    timers.now = 0.35
+    timers.run(until=0.35)
+    assert [round(seconds, 2) for seconds in lateness] == [0.25, 0.15, 0.05]
+
+
+if __name__ == "__main__":
+    test_tick_rate_does_not_drift_with_work()
+    test_catch_up_then_skip_when_far_behind()
+    test_stops_when_tick_reports_game_over()
+    test_reports_lateness_of_each_tick()
+    print("All scheduler tests passed")
@@ -0,0 +1,179 @@
+"""
+Tests for the write-behind writer and atomic score persistence
+"""
+import sys
+import os
+import subprocess
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import write_behind as write_behind_module
+from score_manager import ScoreManager
+from write_behind import WriteBehind, write_behind
+
+
+def read(path):
+    with open(path) as f:
+        return f.read()
+
+
+def test_pending_writes_coalesce_while_the_disk_is_busy():
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "scores.txt")
+        writer = WriteBehind()
+        gate = threading.Event()
+        write_batch = writer._write_batch
+        writer._write_batch = lambda batch: (gate.wait(), write_batch(batch))
+
+        writer.replace(path, "1")
+        while writer.pending:  # Wait for the thread to take the first write
+            time.sleep(0.001)
+        for score in range(2, 50):
+            writer.replace(path, str(score))
+        writer.append(path, "\nlog line")
+        writer.append(path, "\nanother")
+        gate.set()
+        writer.flush()
+
+        assert read(path) == "49\nlog line\nanother"
+        assert writer.requests == 51
+        assert writer.batches == 2
+        writer.append(path, "!")
+        writer.close()
+        assert read(path) == "49\nlog line\nanother!"
+        assert not writer.thread.is_alive()
+        writer.append(path, "?")  # After close, writes go straight to disk
+        assert read(path) == "49\nlog line\nanother!?"
+
+
+def test_failed_replace_keeps_the_old_file():
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "high_score.txt")
+        with open(path, 'w') as f:
+            f.write("12")
+        writer = WriteBehind()
+
+        def crash(source, destination):
+            raise OSError("disk unplugged")
+        original_replace = write_behind_module.os.replace
+        write_behind_module.os.replace = crash
+        try:
+            writer.replace(path, "99")
+            writer.flush()
+        finally:
+            write_behind_module.os.replace = original_replace
+        writer.close()
+        assert read(path) == "12"
+        assert os.listdir(folder) == ["high_score.txt"]
+
+
+def test_unexpected_errors_do_not_stop_the_writer():
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "leaderboard.log")
+        writer = WriteBehind()
+
+        def broken_fsync(fd):
+            raise RuntimeError("driver bug")
+        original_fsync = write_behind_module.os.fsync
+        write_behind_module.os.fsync = broken_fsync
+        try:
+            writer.append(path, "lost\n")
+            assert writer.flush(timeout=5)
+        finally:
+            write_behind_module.os.fsync = original_fsync
+        assert not writer.busy and writer.thread.is_alive()
+
+        writer.append(path, "bad \ud83d name\n")  # A lone surrogate, as Tk gives for some emoji
+        assert writer.flush(timeout=5)
+        assert writer.close(timeout=5)
+        assert read(path).endswith("bad ? name\n")
+
+
+def test_flush_gives_up_after_its_timeout():
+    with tempfile.TemporaryDirectory() as folder:
+        writer = WriteBehind()
+        gate = threading.Event()
+        write_batch = writer._write_batch
+        writer._write_batch = lambda batch: (gate.wait(), write_batch(batch))
+        writer.replace(os.path.join(folder, "high_score.txt"), "3")
+        start = time.perf_counter()
+        assert not writer.flush(timeout=0.05)
+        assert not writer.close(timeout=0.05)
+        assert time.perf_counter() - start < 2
+        gate.set()
+        assert writer.flush(timeout=5)
+
+
+def test_score_manager_saves_without_waiting_for_the_disk():
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "high_score.txt")
+        manager = ScoreManager(path)
+        assert manager.get_high_score() == 0
+        assert manager.save_high_score(15)
+        assert not manager.save_high_score(10)
+        # A new manager sees the record even if it is still being written
+        assert ScoreManager(path).get_high_score() == 15
+        write_behind.flush()
+        assert read(path) == "15"
+
+        with open(path, 'w') as f:
+            f.write("")
+        assert ScoreManager(path).get_high_score() == 0
+        write_behind.flush()
+
+
+def test_score_manager_reads_a_queued_record_without_waiting_for_a_slow_disk():
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "high_score.txt")
+        gate = threading.Event()
+        write_batch = write_behind._write_batch
+        write_behind._write_batch = lambda batch: (gate.wait(), write_batch(batch))
+        try:
+            manager = ScoreManager(path)
+            manager.save_high_score(7)
+            while write_behind.pending:  # Stuck on the disk, as in the middle of a write
+                time.sleep(0.001)
+            manager.save_high_score(9)
+            start = time.perf_counter()
+            assert ScoreManager(path).get_high_score() == 9
+            assert time.perf_counter() - start < 0.5
+            assert write_behind.pending_text(path) == "9"
+            write_behind.append(path, "\n")
+            assert write_behind.pending_text(path) == "9\n"
+            assert write_behind.pending_text(os.path.join(folder, "other.txt")) is None
+        finally:
+            gate.set()
+            write_behind._write_batch = write_batch
+        assert write_behind.flush(timeout=5)
+        assert write_behind.pending_text(path) is None
+        assert read(path) == "9\n"
+
+
+def test_pending_writes_are_flushed_at_exit():
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "high_score.txt")
+        script = ("import sys, time\n"
+                  "sys.path.insert(0, sys.argv[1])\n"
+                  "from write_behind import write_behind\n"
+                  "write_batch = write_behind._write_batch\n"
+                  "write_behind._write_batch = lambda batch: (time.sleep(0.2), write_batch(batch))\n"
+                  "write_behind.replace(sys.argv[2], '42')\n"
+                  "write_behind.append(sys.argv[2] + '.log', 'bad \\ud83d name')\n")
+        subprocess.run([sys.executable, "-c", script, os.path.dirname(os.path.abspath(__file__)), path],
+                       check=True, timeout=30)
+        assert read(path) == "42"
+        assert read(path + ".log") == "bad ? name"
+
+
+if __name__ == "__main__":
+    test_pending_writes_coalesce_while_the_disk_is_busy()
+    test_failed_replace_keeps_the_old_file()
+    test_unexpected_errors_do_not_stop_the_writer()
+    test_flush_gives_up_after_its_timeout()
+    test_score_manager_saves_without_waiting_for_the_disk()
+    test_score_manager_reads_a_queued_record_without_waiting_for_a_slow_disk()
+    test_pending_writes_are_flushed_at_exit()
+    print("All write-behind tests passed")
@@ -0,0 +1,81 @@
+"""
+Fixed-timestep game scheduler.
+Runs simulation ticks against a monotonic clock and re-arms itself through a
+Tk timer (Screen.ontimer / widget.after) instead of blocking in time.sleep,
+so the tick rate does not drift with simulation or render cost.
+"""
+import time
+
+
+class TickScheduler:
+    CATCH_UP = "catch_up"   # Run missed ticks (up to max_catch_up) to keep game time exact
+    SKIP = "skip"           # Run one tick and drop the rest when falling behind
+
+    def __init__(self, schedule, tick, render, get_interval, policy=CATCH_UP,
+                 max_catch_up=5, clock=time.perf_counter, on_lateness=None):
+        """
+        schedule(callback, delay_ms) arms a timer, e.g. turtle's Screen.ontimer.
+        tick() advances the simulation and returns True once the game is over.
+        render() draws the current state after one or more ticks.
+        get_interval() returns the current tick period in seconds.
+        on_lateness(seconds), if given, is told how late each tick started.
+        """
+        self.schedule = schedule
+        self.tick = tick
+        self.render = render
+        self.get_interval = get_interval
+        self.policy = policy
+        self.max_catch_up = max_catch_up if policy == self.CATCH_UP else 1
+        self.clock = clock
+        self.on_lateness = on_lateness
+
+        self.running = False
+        self.next_tick_time = 0.0
+        self.ticks_run = 0
+        self.ticks_skipped = 0
+        self.max_lateness = 0.0
+
+    def start(self):
+        """Start ticking; the first tick is due one interval from now"""
+        self.running = True
+        self.next_tick_time = self.clock() + self.get_interval()
+        self._arm()
+
+    def stop(self):
+        """Stop ticking; a pending timer callback becomes a no-op"""
+        self.running = False
+
+    def _arm(self):
+        delay = self.next_tick_time - self.clock()
+        # Timers have millisecond resolution; waking slightly early just re-arms
+        self.schedule(self._on_timer, max(0, int(delay * 1000)))
+
+    def _on_timer(self):
+        if not self.running:
+            return
+
+        now = self.clock()
+        ticks = 0
+        while self.running and now >= self.next_tick_time and ticks < self.max_catch_up:
+            lateness = now - self.next_tick_time
+            self.max_lateness = max(self.max_lateness, lateness)
+            if self.on_lateness:
+                self.on_lateness(lateness)
+            if self.tick():
+                self.running = False
+            # Advance from the previous deadline, not from now, to avoid drift
+            self.next_tick_time += self.get_interval()
+            self.ticks_run += 1
+            ticks += 1
+
+        if now >= self.next_tick_time:
+            # Too far behind to catch up: drop the backlog and resynchronise
+            interval = self.get_interval()
+            missed = int((now - self.next_tick_time) // interval) + 1
+            self.ticks_skipped += missed
+            self.next_tick_time += missed * interval
+
+        if ticks:
+            self.render()
+        if self.running:
+            self._arm()
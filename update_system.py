@@ -11,6 +11,7 @@ import tkinter as tk
 from tkinter import messagebox
 import urllib.request
 import urllib.error
+from version_info import find_version_file
 
 class UpdateChecker:
     def __init__(self):
@@ -21,23 +22,13 @@ class UpdateChecker:
     def get_current_version(self):
         """Get current game version from local version.json (works in exe and dev)"""
         try:
-            # Try multiple locations for version.json
-            possible_paths = [
-                self.VERSION_FILE,  # Current directory (development)
-                os.path.join(os.path.dirname(sys.executable), self.VERSION_FILE),  # Next to exe
-                os.path.join(sys._MEIPASS, self.VERSION_FILE) if hasattr(sys, '_MEIPASS') else None,  # Inside PyInstaller bundle
-            ]
-            
-            # Filter out None values
-            possible_paths = [path for path in possible_paths if path is not None]
-            
-            for path in possible_paths:
-                if os.path.exists(path):
-                    with open(path, 'r') as f:
-                        data = json.load(f)
-                        version = data.get('version', '1.0.0')
-                        print(f"[UPDATE] Found version {version} in {path}")
-                        return version
+            path = find_version_file(self.VERSION_FILE)
+            if path is not None:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+                    version = data.get('version', '1.0.0')
+                    print(f"[UPDATE] Found version {version} in {path}")
+                    return version
             
             # If no version file found, return default
             print("[UPDATE] No version.json found, using default version 1.0.0")
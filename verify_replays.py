@@ -0,0 +1,122 @@
+"""
+Parallel replay verification for leaderboard anti-cheat.
+Re-simulates every replay in a directory across all CPU cores and flags any
+game whose claimed score or length does not match the simulation.
+
+Run directly: python verify_replays.py replays/ [--workers N] [--json summary.json]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from replay import GameRecording, rules_error, simulate, verify
+from replay_file import ReplayFormatError, read_rules_version
+
+REPLAY_EXTENSIONS = (".snkr", ".json")
+
+
+def verify_file(path, rules_version=None):
+    """Re-simulate one replay and compare it with what the client claimed.
+
+    Problems with a single file are reported in its result, never raised, so
+    one bad replay cannot stop a whole run.
+    """
+    try:
+        recording = GameRecording.load(path)
+    except (OSError, ValueError, TypeError, KeyError, ReplayFormatError) as e:
+        return {"path": path, "ok": False, "error": str(e), "ticks": 0}
+
+    rules_version = rules_version or read_rules_version()
+    if recording.rules_version not in (None, rules_version):
+        return {"path": path, "ok": False, "ticks": 0,
+                "error": f"Recorded under rules {recording.rules_version}, verifier has {rules_version}"}
+    error = rules_error(recording)
+    if error:
+        return {"path": path, "ok": False, "ticks": 0, "error": error}
+
+    try:
+        engine = simulate(recording)
+        ok = verify(recording, engine)
+    except Exception as e:
+        return {"path": path, "ok": False, "error": f"Simulation failed: {e!r}", "ticks": 0}
+    return {
+        "path": path,
+        "ok": ok,
+        "player": recording.player_name,
+        "claimed_score": recording.final_score,
+        "simulated_score": engine.score,
+        "claimed_length": recording.final_length,
+        "simulated_length": len(engine.snake),
+        "ticks": engine.tick,
+    }
+
+
+def find_replays(directory):
+    """List replay files in a directory (recursively), in a stable order"""
+    paths = []
+    for root, _, files in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in files if name.endswith(REPLAY_EXTENSIONS))
+    return sorted(paths)
+
+
+def verify_directory(directory, workers=None, rules_version=None):
+    """Verify every replay under a directory against the given rules
+    (default: this game's version); returns a summary dict"""
+    paths = find_replays(directory)
+    workers = workers or os.cpu_count() or 1
+    check = partial(verify_file, rules_version=rules_version or read_rules_version())
+    start = time.perf_counter()
+    if workers == 1 or len(paths) < 2:
+        results = [check(path) for path in paths]
+    else:
+        # Large chunks keep inter-process overhead small for short replays
+        chunksize = max(1, len(paths) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(check, paths, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    ticks = sum(result["ticks"] for result in results)
+    return {
+        "replays": len(results),
+        "verified": sum(1 for result in results if result["ok"]),
+        "flagged": [result for result in results if not result["ok"] and "error" not in result],
+        "errors": [result for result in results if "error" in result],
+        "workers": workers,
+        "seconds": elapsed,
+        "replays_per_sec": len(results) / elapsed if elapsed else 0.0,
+        "ticks_per_sec": ticks / elapsed if elapsed else 0.0,
+    }
+
+
+def print_summary(summary):
+    print("=== Replay Verification ===")
+    print(f"Replays checked: {summary['replays']} on {summary['workers']} workers "
+          f"in {summary['seconds']:.2f}s")
+    print(f"Throughput: {summary['replays_per_sec']:.0f} replays/sec, "
+          f"{summary['ticks_per_sec']:.0f} ticks/sec")
+    print(f"Verified: {summary['verified']}")
+    for result in summary["flagged"]:
+        print(f"  FLAGGED {result['path']} ({result['player']}): claimed score {result['claimed_score']}"
+              f" length {result['claimed_length']}, simulated score {result['simulated_score']}"
+              f" length {result['simulated_length']}")
+    for result in summary["errors"]:
+        print(f"  ERROR {result['path']}: {result['error']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-simulate replays and flag mismatched scores")
+    parser.add_argument("directory", nargs="?", default="replays", help="Directory of replay files")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--json", dest="json_path", help="Also write the summary to this JSON file")
+    args = parser.parse_args()
+
+    summary = verify_directory(args.directory, args.workers)
+    print_summary(summary)
+    if args.json_path:
+        with open(args.json_path, 'w') as f:
+            json.dump(summary, f, indent=2)
+    sys.exit(1 if summary["flagged"] or summary["errors"] else 0)
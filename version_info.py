@@ -0,0 +1,43 @@
+"""
+Locating the game's version.json.
+The file sits in the working directory during development, next to the exe
+in an install, and inside the PyInstaller bundle (sys._MEIPASS) when the exe
+runs, so every reader searches the same places in the same order.
+"""
+import json
+import os
+import sys
+
+VERSION_FILE = "version.json"
+DEFAULT_VERSION = "1.0.0"
+
+
+def version_file_paths(name=VERSION_FILE):
+    """Places version.json may be, most specific first"""
+    paths = [
+        name,  # Current directory (development)
+        os.path.join(os.path.dirname(sys.executable), name),  # Next to exe
+    ]
+    if hasattr(sys, '_MEIPASS'):
+        paths.append(os.path.join(sys._MEIPASS, name))  # Inside PyInstaller bundle
+    return paths
+
+
+def find_version_file(name=VERSION_FILE):
+    """Return the path of the first version.json found, or None"""
+    for path in version_file_paths(name):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def read_version(default=DEFAULT_VERSION, name=VERSION_FILE):
+    """Return the game version from version.json, or default if it cannot be read"""
+    path = find_version_file(name)
+    if path is None:
+        return default
+    try:
+        with open(path, 'r') as f:
+            return json.load(f).get('version', default)
+    except (OSError, ValueError, AttributeError):
+        return default
@@ -0,0 +1,149 @@
+"""
+Write-behind file persistence.
+Callers hand writes to a background thread and carry on, so game code never
+waits for the disk. Pending writes to the same file coalesce: a full rewrite
+supersedes everything queued for that file before it, and appends are joined
+into a single write. Rewrites are atomic (temp file, fsync, os.replace), so a
+crash leaves either the old contents or the new ones, never a partial file.
+Everything still pending is flushed when the interpreter exits.
+"""
+import atexit
+import os
+import threading
+
+
+class WriteBehind:
+    # Longest flush() and close() wait for the disk, so a stuck drive cannot hang the game or its exit
+    FLUSH_TIMEOUT = 5.0  # seconds
+
+    def __init__(self):
+        self.pending = {}  # path: [new full contents or None, [chunks to append]]
+        self.writing = {}  # The batch on its way to disk, in the same form
+        self.condition = threading.Condition()
+        self.busy = False
+        self.closed = False
+        self.thread = None
+        self.requests = 0  # Writes asked for
+        self.batches = 0   # Trips to the disk they were coalesced into
+
+    def replace(self, path, data):
+        """Atomically replace a file's contents, superseding its pending writes.
+
+        data may be a function returning the text, so expensive formatting
+        also happens on the writer thread; it is called only if not superseded.
+        """
+        with self.condition:
+            self.pending[path] = [data, []]
+            self._wake()
+
+    def append(self, path, data):
+        """Append text to a file after its pending writes"""
+        with self.condition:
+            self.pending.setdefault(path, [None, []])[1].append(data)
+            self._wake()
+
+    def _wake(self):
+        self.requests += 1
+        if self.closed:
+            # Written after the exit flush: nothing will drain the queue, so
+            # write now, once the thread's last batch is out of the way
+            self.condition.wait_for(lambda: not self.busy, self.FLUSH_TIMEOUT)
+            batch, self.pending = self.pending, {}
+            self._write_batch(batch)
+            return
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._write_loop, daemon=True)
+            self.thread.start()
+        self.condition.notify_all()
+
+    def pending_text(self, path):
+        """Return what a file will contain once its queued writes land, without
+        waiting for the disk; None if that is not known yet (nothing queued,
+        appends only, or contents still to be computed)"""
+        with self.condition:
+            text = None
+            for batch in (self.writing, self.pending):  # Oldest first
+                contents, chunks = batch.get(path, (None, ()))
+                if contents is not None:
+                    text = None if callable(contents) else contents
+                if text is None:
+                    if chunks:
+                        return None  # Appends to whatever is on disk
+                    continue
+                text += "".join(chunks)
+            return text
+
+    def flush(self, timeout=None):
+        """Wait until every write requested so far is on disk, for at most
+        timeout seconds (default FLUSH_TIMEOUT); returns False if it timed out"""
+        timeout = self.FLUSH_TIMEOUT if timeout is None else timeout
+        with self.condition:
+            return self.condition.wait_for(lambda: not self.pending and not self.busy, timeout)
+
+    def close(self, timeout=None):
+        """Flush and stop the writer thread; later writes happen synchronously"""
+        timeout = self.FLUSH_TIMEOUT if timeout is None else timeout
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout)
+            if self.thread.is_alive():
+                print(f"Gave up waiting for {len(self.pending)} pending file writes")
+                return False
+        return self.flush(timeout)
+
+    def _write_loop(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                batch, self.pending = self.pending, {}
+                self.writing = batch
+                self.busy = True
+            try:
+                self._write_batch(batch)
+            finally:
+                with self.condition:
+                    self.writing = {}
+                    self.busy = False
+                    self.condition.notify_all()
+
+    def _write_batch(self, batch):
+        self.batches += 1
+        for path, (contents, chunks) in batch.items():
+            try:
+                if contents is not None:
+                    if callable(contents):
+                        contents = contents()
+                    self._replace_file(path, contents + "".join(chunks))
+                elif chunks:
+                    with open(path, 'a', encoding="utf-8", errors="replace") as f:
+                        f.write("".join(chunks))
+                        f.flush()
+                        os.fsync(f.fileno())
+            except Exception as e:
+                # One bad file must not take the thread, or the other files, down with it
+                print(f"Could not write {path}: {e!r}")
+
+    def _replace_file(self, path, contents):
+        temp_path = f"{path}.tmp"
+        try:
+            with open(temp_path, 'w', encoding="utf-8", errors="replace") as f:
+                f.write(contents)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except Exception:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+
+
+# Shared by every module that persists game data
+write_behind = WriteBehind()
+atexit.register(write_behind.close)